@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Booking Latency Benchmark
+Drives the full login -> search -> select -> fill -> pay pipeline of IRCTCBot
+against the local stand-in site and reports wall-clock time per phase and
+total time-to-book over N runs
+"""
+
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+import config
+from standin_site import StandInServer
+from snapshots import SnapshotWriter
+from session_recorder import ReplayServer
+
+# (report name, IRCTCBot method, runs after the Tatkal window opens) in booking order
+PHASES = [
+    ("login", "login", False),
+    ("search", "search_trains", True),
+    ("select", "select_train_and_book", True),
+    ("fill", "fill_passenger_details", True),
+    ("pay", "make_payment", True),
+]
+
+# With pre-staging the search form is filled before T-0 and only Search is clicked after it
+PRESTAGE_PHASES = [
+    ("login", "login", False),
+    ("prestage", "prestage_booking", False),
+    ("search", "submit_search", True),
+    ("select", "select_train_and_book", True),
+    ("fill", "fill_passenger_details", True),
+    ("pay", "make_payment", True),
+]
+
+BENCHMARK_PASSENGERS = [
+    {
+        "name": "ASHA VERMA",
+        "age": 34,
+        "gender": "F",
+        "berth_preference": "LB",
+        "food_choice": "V",
+        "id_card_type": "Aadhar",
+        "id_card_number": "123412341234"
+    },
+    {
+        "name": "RAVI VERMA",
+        "age": 38,
+        "gender": "M",
+        "berth_preference": "UB",
+        "food_choice": "N",
+        "id_card_type": "PAN Card",
+        "id_card_number": "ABCDE1234F"
+    }
+]
+
+
+class BenchmarkError(Exception):
+    """Raised when a booking phase fails during a benchmark run"""
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def configure_for_standin(server, headless=True):
+    """Point config at the stand-in and fill in a fixed benchmark journey"""
+    config.IRCTC_URL = server.url
+    config.INTERACTIVE = False
+    config.HEADLESS_MODE = headless
+    config.IRCTC_USERNAME = "benchmark"
+    config.IRCTC_PASSWORD = "benchmark"
+    config.FROM_STATION = "NDLS"
+    config.TO_STATION = "BCT"
+    config.JOURNEY_DATE = (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
+    config.JOURNEY_CLASS = "3A"
+    config.TRAIN_PREFERENCE = ""
+    config.PASSENGERS = BENCHMARK_PASSENGERS
+    config.PAYMENT_METHOD = "UPI"
+    config.UPI_ID = "benchmark@upi"
+    config.SNAPSHOT_DIR = None
+
+
+def run_once(bot, phases=PHASES):
+    """Run every booking phase once and return the wall-clock seconds of each
+
+    "critical" is the time-to-book from the Tatkal opening (the phases that
+    cannot run before it); "total" also includes login and pre-staging.
+    """
+    timings = {}
+    commands = {}
+    bot.tracer.new_run()
+    for phase, method, _ in phases:
+        start = time.perf_counter()
+        start_commands = bot.commands
+        ok = getattr(bot, method)()
+        timings[phase] = time.perf_counter() - start
+        commands[phase] = bot.commands - start_commands
+        if not ok:
+            raise BenchmarkError(f"Phase '{phase}' failed")
+    timings["critical"] = sum(timings[phase] for phase, _, critical in phases if critical)
+    timings["total"] = sum(timings[phase] for phase, _, _ in phases)
+    timings["commands"] = commands
+    return timings
+
+
+def run_retries(bot, server, count):
+    """Seconds per retry (re-search until the new train list is read) on an all-sold-out route"""
+    server.sold_out_searches = server.searches + count + 1
+    bot.tracer.new_run()
+    if not (bot.login() and bot.search_trains()):
+        raise BenchmarkError("Login or first search failed")
+    bot.select_train_and_book()
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        if not bot.retry_search():
+            raise BenchmarkError("Re-search failed")
+        # Sold out, so this only reads the fresh list and finds nothing to book
+        bot.select_train_and_book()
+        # ...and snapshots the failure, as the attempt loop does before re-searching
+        bot.snapshot("select_train", reason="benchmark retry")
+        timings.append(time.perf_counter() - start)
+    server.sold_out_searches = 0
+    return timings
+
+
+def summarize(runs, phases=PHASES):
+    """Aggregate per-run timings into p50/p95/p99/mean per phase"""
+    summary = {}
+    for phase in [name for name, _, _ in phases] + ["critical", "total"]:
+        samples = [run[phase] for run in runs]
+        summary[phase] = {
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "mean": sum(samples) / len(samples),
+        }
+        if phase in runs[0]["commands"]:
+            summary[phase]["commands"] = runs[-1]["commands"][phase]
+    return summary
+
+
+def print_report(summary, completed, failures, startup, waits=None, pages=None):
+    print("\n" + "=" * 60)
+    print("📊 BOOKING LATENCY BENCHMARK (seconds)")
+    print("=" * 60)
+    print(f"Driver startup: {startup:.3f}s | Runs: {completed} ok, {failures} failed")
+    print(f"{'phase':10} {'p50':>10} {'p95':>10} {'p99':>10} {'mean':>10} {'cmds':>6}")
+    for phase, stats in summary.items():
+        commands = stats.get("commands", "")
+        print(f"{phase:10} {stats['p50']:10.3f} {stats['p95']:10.3f} {stats['p99']:10.3f} {stats['mean']:10.3f} "
+              f"{commands:>6}")
+    if waits:
+        print("-" * 60)
+        print(f"{'wait step':20} {'count':>6} {'avg ms':>10} {'max ms':>10} {'missed':>7}")
+        for step, entry in waits.items():
+            avg = entry["total"] / entry["count"] * 1000
+            print(f"{step:20} {entry['count']:6d} {avg:10.1f} {entry['max'] * 1000:10.1f} {entry['missed']:7d}")
+    if pages:
+        print("-" * 60)
+        print(f"{'page':20} {'visits':>6} {'requests':>10} {'KB':>10}")
+        for page, entry in pages.items():
+            print(f"{page:20} {entry['visits']:6d} {entry['requests']:10d} {entry['bytes'] / 1024:10.1f}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IRCTCBot against the local stand-in site")
+    parser.add_argument("--runs", type=int, default=5, help="Number of booking runs")
+    parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a visible window")
+    parser.add_argument("--api-latency-ms", type=int, default=50, help="Stand-in server latency per API call")
+    parser.add_argument("--render-delay-ms", type=int, default=100, help="Stand-in simulated render delay")
+    parser.add_argument("--prestage", action="store_true",
+                        help="Pre-stage the search form before T-0 and click only Search after it")
+    parser.add_argument("--train-source", choices=["dom", "network"], default="dom",
+                        help="Read the train list from the rendered page or the intercepted API response")
+    parser.add_argument("--backend", choices=["webdriver", "cdp"], default="webdriver",
+                        help="DRIVER_BACKEND for the run")
+    parser.add_argument("--profile", choices=["minimal", "balanced", "full"], default="balanced",
+                        help="BROWSER_PROFILE for the run")
+    parser.add_argument("--page-assets", action="store_true",
+                        help="Serve fonts, banner images and an analytics script like the real site")
+    parser.add_argument("--page-weight", action="store_true",
+                        help="REPORT_PAGE_WEIGHT: requests and bytes per page (adds a round trip per page change)")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Also time this many retries (re-search + read the new list) on a sold-out route")
+    parser.add_argument("--retry-mode", choices=["incremental", "replay"], default="incremental",
+                        help="RETRY_MODE for --retries")
+    parser.add_argument("--retry-interval-ms", type=int, default=0,
+                        help="RETRY_MIN_INTERVAL_MS for --retries (0 times the retry path itself)")
+    parser.add_argument("--snapshots", choices=["off", "background", "inline"], default="off",
+                        help="Failure snapshot per --retries retry: written by the background writer or inline")
+    parser.add_argument("--master-list", action="store_true",
+                        help="Pick the passengers from the stand-in's saved master list instead of typing them")
+    parser.add_argument("--record", metavar="DIR", help="Record the session into a replay archive under DIR")
+    parser.add_argument("--replay", metavar="ARCHIVE",
+                        help="Run against a recorded session (session_recorder.py) instead of the stand-in")
+    parser.add_argument("--json", metavar="PATH", help="Also write raw timings and summary to a JSON file")
+    args = parser.parse_args()
+    if args.replay and args.retries:
+        parser.error("--retries needs the stand-in's sold-out searches; it cannot run on a replay")
+
+    if args.replay:
+        server = ReplayServer(args.replay).start()
+    else:
+        server = StandInServer(api_latency_ms=args.api_latency_ms, render_delay_ms=args.render_delay_ms,
+                               page_assets=args.page_assets).start()
+    configure_for_standin(server, headless=not args.show_browser)
+    config.RECORD_DIR = args.record
+    if args.master_list:
+        config.PASSENGERS = [{"master": passenger["name"]} for passenger in BENCHMARK_PASSENGERS]
+    config.TRAIN_LIST_SOURCE = args.train_source
+    config.DRIVER_BACKEND = args.backend
+    config.BROWSER_PROFILE = args.profile
+    config.REPORT_PAGE_WEIGHT = args.page_weight
+    config.RETRY_MODE = args.retry_mode
+    config.RETRY_MIN_INTERVAL_MS = args.retry_interval_ms
+
+    # Import after config is patched so the bot picks up the stand-in settings
+    from irctc_bot import IRCTCBot
+
+    start = time.perf_counter()
+    bot = IRCTCBot()
+    startup = time.perf_counter() - start
+    snapshot_dir = None
+    if args.snapshots != "off":
+        snapshot_dir = tempfile.mkdtemp(prefix="irctc-snapshots-")
+        bot.snapshots = SnapshotWriter(snapshot_dir, config.SNAPSHOT_QUEUE, config.SNAPSHOT_KEEP,
+                                       background=args.snapshots == "background")
+
+    phases = PRESTAGE_PHASES if args.prestage else PHASES
+    runs, failures, retries = [], 0, []
+    try:
+        for i in range(args.runs):
+            try:
+                timings = run_once(bot, phases)
+                runs.append(timings)
+                print(f"Run {i + 1}/{args.runs}: time-to-book {timings['critical']:.3f}s after T-0, "
+                      f"{timings['total']:.3f}s overall")
+            except BenchmarkError as e:
+                failures += 1
+                print(f"Run {i + 1}/{args.runs}: ❌ {e}")
+        if args.retries:
+            try:
+                retries = run_retries(bot, server, args.retries)
+                print(f"Retries ({args.retry_mode}, min interval {config.RETRY_MIN_INTERVAL_MS} ms, "
+                      f"snapshots {args.snapshots}): "
+                      f"p50 {percentile(retries, 50):.3f}s, p95 {percentile(retries, 95):.3f}s, "
+                      f"mean {sum(retries) / len(retries):.3f}s")
+                snapshots = [span.duration for span in bot.tracer.finished if span.name == "snapshot"]
+                if snapshots:
+                    print(f"Snapshot time on the retry path: p50 {percentile(snapshots, 50) * 1000:.1f} ms, "
+                          f"p95 {percentile(snapshots, 95) * 1000:.1f} ms")
+            except BenchmarkError as e:
+                print(f"Retries: ❌ {e}")
+    finally:
+        bot.close()
+        server.stop()
+        if snapshot_dir:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    if not runs:
+        print("❌ No successful runs to report")
+        sys.exit(1)
+
+    summary = summarize(runs, phases)
+    waits = bot.ready.summary()
+    pages = bot.page_weight.summary() if bot.page_weight else None
+    print_report(summary, len(runs), failures, startup, waits, pages)
+    for phase, used, budget in bot.command_stats.over_budget():
+        print(f"⚠️  {phase}: {used} round trips, budget {budget} ({bot.command_stats.describe_last(phase)})")
+    if args.replay:
+        print(f"Replayed {server.served} recorded responses, {len(server.misses)} requests not in the recording")
+    else:
+        print(f"Bookings confirmed by stand-in: {len(server.bookings)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"startup": startup, "runs": runs, "failures": failures, "summary": summary,
+                       "waits": waits, "pages": pages, "retries": retries,
+                       "commands": bot.command_stats.summary()}, f, indent=2)
+        print(f"Raw timings written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Browser Profiles
+Named Chrome setups trading page completeness for speed: the page-load
+strategy, URL patterns blocked through CDP Network.setBlockedURLs (fonts,
+images, media, analytics and ads) and disk cache behaviour, plus a meter
+reporting requests and bytes transferred per page visit
+
+Usage: python browser_profiles.py [--runs 3] [--show-browser]   # page weight and booking check per profile
+"""
+
+import logging
+from collections import namedtuple
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# URL patterns for Network.setBlockedURLs ("*" matches any run of characters)
+TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*adservice.google.*", "*facebook.net*", "*hotjar.com*", "*clarity.ms*", "*/analytics*.js*",
+]
+FONTS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+IMAGES = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.svg*", "*.webp*", "*.ico*"]
+MEDIA = ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"]
+
+# page_load_strategy: "none" (driver.get returns at once; the readiness waits take over),
+#                     "eager" (DOMContentLoaded) or "normal" (every subresource loaded)
+# block_images:       also switch images off in Chrome content settings
+# disk_cache:         "large" (keep up to DISK_CACHE_MB between pages), "default", or "off" (cold reference)
+BrowserProfile = namedtuple("BrowserProfile",
+                            ["name", "page_load_strategy", "blocked_urls", "block_images", "disk_cache"])
+
+DISK_CACHE_MB = 256
+
+PROFILES = {
+    "minimal": BrowserProfile("minimal", "none", TRACKERS + FONTS + IMAGES + MEDIA, True, "large"),
+    "balanced": BrowserProfile("balanced", "eager", TRACKERS + MEDIA, True, "default"),
+    "full": BrowserProfile("full", "normal", [], False, "off"),
+}
+
+# Totals for the current document from the Resource Timing API
+PAGE_WEIGHT_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize; }
+return {origin: performance.timeOrigin, requests: resources.length + (nav ? 1 : 0), bytes: bytes};
+"""
+
+PageVisit = namedtuple("PageVisit", ["page", "requests", "bytes"])
+
+
+def get_profile(name):
+    """Profile by name; unknown names fall back to balanced with a warning"""
+    if name not in PROFILES:
+        logger.warning(f"Unknown BROWSER_PROFILE '{name}', using 'balanced'")
+        return PROFILES["balanced"]
+    return PROFILES[name]
+
+
+def configure_options(chrome_options, profile, prefs):
+    """Apply the launch-time parts of a profile to Chrome options and content-setting prefs"""
+    chrome_options.page_load_strategy = profile.page_load_strategy
+    if profile.block_images:
+        prefs["profile.managed_default_content_settings.images"] = 2
+    if profile.disk_cache == "large":
+        chrome_options.add_argument(f"--disk-cache-size={DISK_CACHE_MB * 1024 * 1024}")
+
+
+def apply_profile(driver, profile):
+    """Apply the runtime parts of a profile over CDP; returns False if Chrome refused them"""
+    try:
+        if profile.blocked_urls or profile.disk_cache == "off":
+            driver.execute_cdp_cmd("Network.enable", {})
+        if profile.blocked_urls:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blocked_urls})
+        if profile.disk_cache == "off":
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        logger.info(f"Browser profile '{profile.name}': {profile.page_load_strategy} page loads, "
+                    f"{len(profile.blocked_urls)} blocked URL patterns, {profile.disk_cache} disk cache")
+        return True
+    except WebDriverException as e:
+        logger.warning(f"Could not apply browser profile '{profile.name}': {str(e).splitlines()[0]}")
+        return False
+
+
+class PageWeightMeter:
+    """Requests and bytes transferred per page visit
+
+    Traffic between two visits on the same document belongs to the page
+    being left; a new document's own load belongs to the page being entered.
+    """
+
+    def __init__(self, scripts):
+        # Anything with execute_script: the WebDriver or the CDP backend
+        self.scripts = scripts
+        self.visits = []
+        self.current = None
+        self.pending = [0, 0]
+        self.last = None
+
+    def read(self):
+        try:
+            return self.scripts.execute_script(PAGE_WEIGHT_SCRIPT)
+        except (JavascriptException, WebDriverException) as e:
+            logger.debug(f"Page weight unavailable: {str(e)}")
+            return None
+
+    def visit(self, page):
+        """Close the page being left and start counting `page`"""
+        reading = self.read()
+        if not reading:
+            return
+        same_document = self.last is not None and reading["origin"] == self.last["origin"]
+        if same_document:
+            self.pending[0] += reading["requests"] - self.last["requests"]
+            self.pending[1] += reading["bytes"] - self.last["bytes"]
+        self._flush()
+        self.current = page
+        self.pending = [0, 0] if same_document else [reading["requests"], reading["bytes"]]
+        self.last = reading
+
+    def finish(self):
+        """Close the last page visit"""
+        if self.current:
+            self.visit(None)
+        self.current = None
+
+    def _flush(self):
+        if self.current is None:
+            return
+        visit = PageVisit(self.current, *self.pending)
+        self.visits.append(visit)
+        logger.info(f"Page '{visit.page}': {visit.requests} requests, {visit.bytes / 1024:.1f} KB transferred")
+
+    def summary(self):
+        """Per-page totals: visits, requests and bytes"""
+        stats = {}
+        for visit in self.visits:
+            entry = stats.setdefault(visit.page, {"visits": 0, "requests": 0, "bytes": 0})
+            entry["visits"] += 1
+            entry["requests"] += visit.requests
+            entry["bytes"] += visit.bytes
+        return stats
+
+
+def main():
+    import time
+    import argparse
+    import config
+    from benchmark import configure_for_standin, run_once, BenchmarkError
+    from locators import LOCATORS
+    from standin_site import StandInServer
+
+    parser = argparse.ArgumentParser(description="Page weight and booking check for every browser profile")
+    parser.add_argument("--runs", type=int, default=3, help="Bookings per profile")
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server = StandInServer(api_latency_ms=50, render_delay_ms=100, page_assets=True).start()
+    configure_for_standin(server, headless=not args.show_browser)
+
+    from irctc_bot import IRCTCBot
+    rows = []
+    try:
+        for name in PROFILES:
+            config.BROWSER_PROFILE = name
+            bot = IRCTCBot()
+            try:
+                start = time.perf_counter()
+                bot.driver.get(config.IRCTC_URL)
+                bot.ready.first_of("page_ready", {"popup": LOCATORS["advisory_close"], "login": LOCATORS["login_link"]})
+                load_ms = (time.perf_counter() - start) * 1000
+                # Weigh the page once everything the profile lets through has loaded
+                bot.ready.until("page_complete", "return document.readyState === 'complete';", timeout=10,
+                                required=False)
+                weight = PageWeightMeter(bot.scripts).read() or {"requests": 0, "bytes": 0}
+                booked, critical = 0, []
+                for _ in range(args.runs):
+                    try:
+                        critical.append(run_once(bot)["critical"])
+                        booked += 1
+                    except BenchmarkError as e:
+                        logger.warning(f"{name}: {e}")
+                rows.append((name, load_ms, weight["requests"], weight["bytes"], booked,
+                             sum(critical) / len(critical) if critical else None))
+            finally:
+                bot.close()
+    finally:
+        server.stop()
+
+    print("\n" + "=" * 72)
+    print("🧱 BROWSER PROFILES on the stand-in (fonts, banners and analytics served)")
+    print("=" * 72)
+    print(f"{'profile':10} {'first load ms':>14} {'requests':>9} {'KB':>9} {'booked':>8} {'time-to-book s':>15}")
+    for name, load_ms, requests, size, booked, critical in rows:
+        critical_text = f"{critical:.3f}" if critical is not None else "-"
+        print(f"{name:10} {load_ms:14.0f} {requests:9d} {size / 1024:9.1f} {booked:>5}/{args.runs} {critical_text:>15}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+CDP Driver Backend
+Asyncio client for the Chrome DevTools Protocol websocket of the browser that
+Selenium started. Commands share one connection and can be pipelined (several
+in flight at once, answered in order) and page events are pushed to
+subscribers instead of polled. CDPDriver is a synchronous facade running the
+event loop on a background thread, so IRCTCBot can send its data-only page
+scripts through it while element handles stay with WebDriver
+
+Usage: python cdp_driver.py [--runs 200] [--show-browser]   # round-trip latency vs classic WebDriver
+"""
+
+import json
+import time
+import asyncio
+import logging
+import itertools
+import threading
+import concurrent.futures
+from urllib.request import urlopen
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Seconds a command may take when no script timeout has been set
+DEFAULT_TIMEOUT = 30
+
+
+class CDPError(WebDriverException):
+    """A CDP command came back with an error"""
+
+
+def script_expression(script, args, async_script=False):
+    """Wrap a WebDriver-style script body (arguments[], return / callback) as a Runtime.evaluate expression"""
+    args_json = json.dumps(list(args))
+    if not async_script:
+        return f"(function () {{\n{script}\n}}).apply(null, {args_json})"
+    return ("new Promise(function (resolve, reject) {\n"
+            f"  try {{ (function () {{\n{script}\n}}).apply(null, {args_json}.concat([resolve])); }}\n"
+            "  catch (e) { reject(e); }\n"
+            "})")
+
+
+def page_websocket_url(debugger_address, target_id=None):
+    """webSocketDebuggerUrl of the page target `target_id` (default: the first page)"""
+    with urlopen(f"http://{debugger_address}/json/list", timeout=5) as response:
+        targets = json.loads(response.read())
+    pages = [target for target in targets if target.get("type") == "page"]
+    for target in pages:
+        if target_id is None or target.get("id") == target_id:
+            return target["webSocketDebuggerUrl"]
+    raise CDPError(f"No page target {target_id or ''} at {debugger_address}")
+
+
+class CDPSession:
+    """One websocket to a page target; every method runs on the session's event loop"""
+
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.ws = None
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.subscribers = {}
+        self.reader = None
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self.reader = asyncio.ensure_future(self._read())
+        return self
+
+    async def _read(self):
+        try:
+            async for message in self.ws:
+                data = json.loads(message)
+                if "id" in data:
+                    future = self.pending.pop(data["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in data:
+                        future.set_exception(CDPError(data["error"].get("message", str(data["error"]))))
+                    else:
+                        future.set_result(data.get("result", {}))
+                else:
+                    for queue in self.subscribers.get(data.get("method"), ()):
+                        queue.put_nowait(data.get("params", {}))
+        except Exception as e:
+            logger.debug(f"CDP connection closed: {str(e)}")
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("CDP connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, **params):
+        """Send one command and wait for its result; concurrent sends are pipelined"""
+        command_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[command_id] = future
+        try:
+            await self.ws.send(json.dumps({"id": command_id, "method": method, "params": params}))
+            return await future
+        finally:
+            self.pending.pop(command_id, None)
+
+    async def pipeline(self, commands):
+        """Send every (method, params) at once, then collect the results in order"""
+        return await asyncio.gather(*(self.send(method, **params) for method, params in commands))
+
+    def subscribe(self, method):
+        """Queue receiving the params of every `method` event (e.g. "Network.responseReceived")"""
+        queue = asyncio.Queue()
+        self.subscribers.setdefault(method, []).append(queue)
+        return queue
+
+    def unsubscribe(self, method, queue):
+        queues = self.subscribers.get(method, [])
+        if queue in queues:
+            queues.remove(queue)
+
+    async def close(self):
+        if self.ws:
+            await self.ws.close()
+        if self.reader:
+            await self.reader
+
+
+def evaluation_value(result):
+    """Value of a Runtime.evaluate result, raising JavascriptException for a thrown error"""
+    details = result.get("exceptionDetails")
+    if details:
+        exception = details.get("exception", {})
+        raise JavascriptException(f"javascript error: {exception.get('description') or details.get('text')}")
+    return result.get("result", {}).get("value")
+
+
+class CDPDriver:
+    """Synchronous facade over a CDPSession attached to a Selenium-started Chrome tab
+
+    Scripts must take and return plain JSON values: DOM elements cannot
+    cross the CDP boundary by value, so element work stays on WebDriver.
+    """
+
+    def __init__(self, driver, stats=None):
+        address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not address:
+            raise CDPError("Browser does not expose a DevTools debugger address")
+        # ChromeDriver window handles are the DevTools target ids
+        ws_url = page_websocket_url(address, driver.current_window_handle)
+        self.script_timeout = DEFAULT_TIMEOUT
+        # Optional CommandStats counting and timing every round trip
+        self.stats = stats
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="cdp-loop", daemon=True)
+        self.thread.start()
+        try:
+            self.session = self._run(CDPSession(ws_url).connect(), timeout=10)
+        except Exception:
+            self._stop_loop()
+            raise
+        logger.info(f"CDP backend connected to {address}")
+
+    def _run(self, coro, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(self.script_timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutException("CDP command timed out")
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def _account(self, command, start, count=1):
+        if self.stats:
+            self.stats.record(f"cdp:{command}", time.perf_counter() - start, count)
+
+    def send(self, method, **params):
+        """Run one raw CDP command and return its result"""
+        start = time.perf_counter()
+        try:
+            return self._run(self.session.send(method, **params))
+        finally:
+            self._account(method, start)
+
+    def _evaluate(self, coro, command="executeScript", count=1):
+        # A script cut off by navigation fails like it does over WebDriver
+        start = time.perf_counter()
+        try:
+            return self._run(coro)
+        except CDPError as e:
+            raise JavascriptException(f"javascript error: {e.msg}")
+        finally:
+            self._account(command, start, count)
+
+    def execute_script(self, script, *args):
+        result = self._evaluate(self.session.send("Runtime.evaluate", expression=script_expression(script, args),
+                                                  returnByValue=True))
+        return evaluation_value(result)
+
+    def execute_async_script(self, script, *args):
+        result = self._evaluate(self.session.send("Runtime.evaluate", returnByValue=True, awaitPromise=True,
+                                                  expression=script_expression(script, args, async_script=True)),
+                                "executeAsyncScript")
+        return evaluation_value(result)
+
+    def pipeline(self, scripts):
+        """Run several (script, args) in one burst; results come back in order
+
+        The page evaluates them one after another, so a later script sees the
+        effects of an earlier one, but no call waits for the previous reply.
+        """
+        results = self._evaluate(self.session.pipeline(
+            [("Runtime.evaluate", {"expression": script_expression(script, args), "returnByValue": True})
+             for script, args in scripts]), "pipelinedScript", len(scripts))
+        return [evaluation_value(result) for result in results]
+
+    def subscribe(self, method):
+        """Start collecting `method` events; read them with next_event"""
+        return self._run(self._subscribe(method), timeout=5)
+
+    async def _subscribe(self, method):
+        return self.session.subscribe(method)
+
+    def next_event(self, queue, timeout):
+        """Params of the next event on a subscribed queue, or None after `timeout` seconds"""
+        async def get():
+            try:
+                return await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._run(get(), timeout=timeout + 1)
+
+    def drain(self, queue):
+        """Empty a subscribed queue, returning the params of the events collected so far"""
+        async def empty():
+            events = []
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            return events
+        return self._run(empty(), timeout=5)
+
+    def _stop_loop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+    def close(self):
+        try:
+            self._run(self.session.close(), timeout=5)
+        except Exception as e:
+            logger.debug(f"Closing CDP session: {str(e)}")
+        self._stop_loop()
+
+
+def time_calls(call, runs):
+    """Per-call latencies in ms"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def describe(samples):
+    samples = sorted(samples)
+    return (sum(samples) / len(samples), samples[len(samples) // 2],
+            samples[min(len(samples) - 1, int(len(samples) * 0.95))])
+
+
+def main():
+    import argparse
+    import config
+    import page_scripts
+    from benchmark import configure_for_standin
+    from payloads import search_fields, to_script_args
+    from standin_site import StandInServer
+
+    parser = argparse.ArgumentParser(description="Compare command round trips: classic WebDriver vs CDP websocket")
+    parser.add_argument("--runs", type=int, default=200, help="Calls per measurement")
+    parser.add_argument("--batch", type=int, default=10, help="Commands per pipelined burst")
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server = StandInServer().start()
+    configure_for_standin(server, headless=not args.show_browser)
+    config.DRIVER_BACKEND = "cdp"
+
+    from irctc_bot import IRCTCBot
+    bot = IRCTCBot()
+    try:
+        if not bot.cdp:
+            print("❌ CDP backend unavailable (see log)")
+            return
+        bot.driver.get(config.IRCTC_URL)
+        read_args = to_script_args(search_fields())
+        noop = "return 1;"
+        rows = [
+            ("noop script", "WebDriver", time_calls(lambda: bot.driver.execute_script(noop), args.runs)),
+            ("noop script", "CDP", time_calls(lambda: bot.cdp.execute_script(noop), args.runs)),
+            ("read search form", "WebDriver",
+             time_calls(lambda: bot.driver.execute_script(page_scripts.READ_FIELDS, read_args), args.runs)),
+            ("read search form", "CDP",
+             time_calls(lambda: bot.cdp.execute_script(page_scripts.READ_FIELDS, read_args), args.runs)),
+            (f"{args.batch} scripts", "WebDriver",
+             time_calls(lambda: [bot.driver.execute_script(noop) for _ in range(args.batch)], args.runs // args.batch or 1)),
+            (f"{args.batch} scripts", "CDP pipelined",
+             time_calls(lambda: bot.cdp.pipeline([(noop, [])] * args.batch), args.runs // args.batch or 1)),
+        ]
+
+        print("\n" + "=" * 66)
+        print("🔌 COMMAND ROUND TRIP: classic WebDriver vs CDP websocket (stand-in)")
+        print("=" * 66)
+        print(f"{'command':18} {'backend':15} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for command, backend, samples in rows:
+            mean, p50, p95 = describe(samples)
+            print(f"{command:18} {backend:15} {mean:9.2f} {p50:9.2f} {p95:9.2f}")
+        print("=" * 66)
+    finally:
+        bot.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Command Accounting
+Counts and times every round trip the bot makes to the browser - WebDriver
+commands (findElement, sendKeysToElement, executeScript, ...) and CDP backend
+calls - broken down by command and by the trace spans open at the time, and
+checks bot phases against the round-trip budgets in COMMAND_BUDGETS
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CommandStats:
+    """Round-trip counts and latency per command, overall and per phase (trace span name)
+
+    A command counts toward every span open when it runs, so a phase
+    includes the commands of its nested spans. Each open span also gets a
+    running `commands` attribute, exported with the trace.
+    """
+
+    def __init__(self, tracer=None, budgets=None):
+        self.tracer = tracer
+        self.budgets = dict(budgets or {})
+        self.total = 0
+        self.by_command = {}
+        self.by_phase = {}
+        self.last = {}
+        # Per-command counts of each open span (by span id) and of each phase's last finished span
+        self.open = {}
+        self.last_commands = {}
+
+    def record(self, command, seconds, count=1):
+        self.total += count
+        self._add(self.by_command, command, seconds, count)
+        if self.tracer is None:
+            return
+        for span in self.tracer.open_spans():
+            span.attributes["commands"] = span.attributes.get("commands", 0) + count
+            self._add(self.by_phase.setdefault(span.name, {}), command, seconds, count)
+            counts = self.open.setdefault(span.span_id, {})
+            counts[command] = counts.get(command, 0) + count
+
+    @staticmethod
+    def _add(table, command, seconds, count):
+        entry = table.get(command)
+        if entry is None:
+            entry = table[command] = [0, 0.0, 0.0]
+        entry[0] += count
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def wrap(self, driver):
+        """Route every command of a WebDriver (and its elements) through the accounting"""
+        execute = driver.execute
+
+        def accounted_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(driver_command, time.perf_counter() - start)
+
+        driver.execute = accounted_execute
+
+    def on_span(self, span):
+        """Tracer listener: remember each phase's command count and warn when it is over budget"""
+        used = span.attributes.get("commands", 0)
+        self.last[span.name] = used
+        self.last_commands[span.name] = self.open.pop(span.span_id, {})
+        budget = self.budgets.get(span.name)
+        if budget is not None and used > budget:
+            logger.warning(f"Phase '{span.name}' used {used} browser round trips (budget {budget}): "
+                           f"{self.describe_last(span.name)}")
+
+    @staticmethod
+    def _format(counts):
+        return ", ".join(f"{command} x{count}" for command, count in sorted(counts.items(), key=lambda item: -item[1]))
+
+    def describe(self, phase=None):
+        """'command xN, ...' for a phase over all its runs (all phases when None), most frequent first"""
+        table = self.by_command if phase is None else self.by_phase.get(phase, {})
+        return self._format({command: entry[0] for command, entry in table.items()})
+
+    def describe_last(self, phase):
+        """'command xN, ...' for the last finished run of a phase only"""
+        return self._format(self.last_commands.get(phase, {}))
+
+    def summary(self):
+        """{phase: {command: {"count", "total_ms", "max_ms"}}}, with all commands under "all" """
+        def rows(table):
+            return {command: {"count": count, "total_ms": round(total * 1000, 2), "max_ms": round(worst * 1000, 2)}
+                    for command, (count, total, worst) in table.items()}
+        summary = {"all": rows(self.by_command)}
+        summary.update((phase, rows(table)) for phase, table in self.by_phase.items())
+        return summary
+
+    def over_budget(self):
+        """(phase, commands, budget) for each budgeted phase whose last run went over"""
+        return [(phase, self.last[phase], budget) for phase, budget in self.budgets.items()
+                if phase in self.last and self.last[phase] > budget]
@@ -12,9 +12,20 @@ FROM_STATION = "FROM_CODE"  # Example: NDLS
 TO_STATION = "TO_CODE"      # Example: BCT
 JOURNEY_DATE = "DD/MM/YYYY"  # Use DD/MM/YYYY format
 JOURNEY_CLASS = "3A"         # Options: SL, 3A, 2A, 1A
+JOURNEY_QUOTA = "TQ"         # GN (General), TQ (Tatkal), PT (Premium Tatkal); "" leaves the site default
 TRAIN_PREFERENCE = ""        # Optional: Specific train number preference
 
+# Optional ranked alternatives, all checked against one train list; the first listed
+# candidate with a bookable seat wins (within it: available > RAC > shortest waitlist).
+# Empty uses TRAIN_PREFERENCE + JOURNEY_CLASS. quota must match JOURNEY_QUOTA (one search).
+BOOKING_CANDIDATES = [
+    # {"train": "12951", "class": "3A", "quota": "TQ", "max_waitlist": 0},
+    # {"train": "", "class": "SL", "max_waitlist": 20},
+]
+
 # Passenger Details (List of passengers)
+# A passenger saved in the IRCTC master list can be given as {"master": "SAVED NAME"}; any other
+# keys override the saved details. With USE_MASTER_LIST off the full details are typed instead
 PASSENGERS = [
     {
         "name": "PASSENGER NAME",
@@ -45,7 +56,66 @@ BANK_NAME = ""
 HEADLESS_MODE = False  # Set to True to run browser in background
 IMPLICIT_WAIT = 10     # Wait time in seconds
 BOOKING_ATTEMPTS = 3   # Number of retry attempts
+RETRY_MODE = "incremental"  # "incremental" clicks Search again on the filled form; "replay" refreshes and refills it
+RETRY_MIN_INTERVAL_MS = 1000  # Minimum time between two availability searches
 TATKAL_TIME = "10:00"  # Time to start booking (HH:MM format)
+PRESTAGE = True        # Fill the search form before the window opens; only Search is clicked at T-0
+STATION_DIRECT_ENTRY = True  # Set From/To to the exact "NAME - CODE" label; False always picks it from the dropdown
+BATCHED_FORM_FILL = True  # Fill all passengers in one execute_script; falls back to field-by-field
+USE_MASTER_LIST = True  # Pick "master" passengers from the saved master list; others are typed
+# Browser round trips (WebDriver + CDP commands) allowed per phase; a phase over budget logs a warning
+# and fails test_command_budget.py
+COMMAND_BUDGETS = {
+    "fill_search_form": 24,   # Runs before T-0 with PRESTAGE, inside search_trains without it
+    "submit_search": 6,
+    "select_train_and_book": 8,
+    "fill_passenger_details": 10,
+}
+TRAIN_LIST_SOURCE = "dom"  # "network" decides from the intercepted train-list JSON before the list renders
+TRAIN_LIST_API = "/api/trains"  # URL fragment of the train-list JSON response
+
+# Tatkal Scheduler
+CLOCK_SYNC_URL = None    # Page whose HTTP Date header is the server clock; None uses IRCTC_URL
+CLOCK_SYNC_SAMPLES = 12  # Date/RTT samples per clock-offset estimate
+TATKAL_LEAD_MS = 0       # Fire this many ms before the estimated server Tatkal time
+CLOCK_SKEW_MARGIN_S = 60  # Largest local vs server clock skew expected; no clock sync further past Tatkal time
+SPIN_WINDOW_MS = 20      # Busy-wait the last few ms instead of trusting sleep()
+
+# Readiness wait budgets in seconds per step (steps not listed use IMPLICIT_WAIT)
+WAIT_BUDGETS = {
+    "page_ready": 15,          # Train-search page shows the login link or advisory popup
+    "popup_closed": 3,         # Advisory popup dismissed
+    "login_form": 10,          # Login modal rendered
+    "login_result": 30,        # Greeting shown after SIGN IN
+    "search_form": 10,         # From/To inputs ready
+    "station_suggestion": 5,   # Autocomplete suggestion for the typed station
+    "station_settle": 0.5,     # Quiet time a directly entered station label must survive to count as accepted
+    "train_list": 20,          # Train list rendered after Search
+    "passenger_form": 15,      # Passenger page after BOOK NOW
+    "master_passenger": 3,     # Master-list suggestion for each saved passenger (per row)
+    "payment_form": 15,        # Payment page after Continue
+}
 
 # Browser Settings
 CHROME_DRIVER_PATH = None  # Leave None to auto-download driver
+DRIVER_CACHE_FILE = ".driver_cache.json"  # Resolved driver + browser version; valid cache means no network at startup
+CHROME_USER_DATA_DIR = None  # e.g. "chrome_profile" to keep disk cache and site storage between runs
+BROWSER_PROFILE = "balanced"  # minimal, balanced or full: page-load strategy, blocked resources, disk cache
+REPORT_PAGE_WEIGHT = False    # Log requests and bytes per page visit (one extra round trip per page change)
+DRIVER_BACKEND = "webdriver"  # "cdp" sends form scripts over a pipelined DevTools websocket (needs websockets)
+
+# Warm daemon (python daemon.py serve)
+DAEMON_PORT = 8765            # Localhost port accepting booking jobs
+DAEMON_HEALTH_INTERVAL = 60   # Seconds between session health checks while idle
+
+# Tracing and logging
+TRACE_FILE = "booking_trace.jsonl"  # Per-phase spans as JSON lines; None to disable
+LOG_FORMAT = "text"  # "json": one object per line with run_id, phase (open span) and attempt
+SNAPSHOT_DIR = "snapshots"  # Screenshot, DOM and URL of each failed step, written in the background; None to disable
+SNAPSHOT_QUEUE = 4          # Snapshots waiting to be written; the oldest is dropped when full
+SNAPSHOT_KEEP = 50          # Snapshot directories kept on disk; older ones are deleted
+RECORD_DIR = None  # e.g. "recordings": zip of each session's per-phase DOM and network responses for replay
+
+# Site Settings
+IRCTC_URL = "https://www.irctc.co.in/nget/train-search"  # Point at the local stand-in for benchmarks
+INTERACTIVE = True     # Pause for captcha/payment/close prompts; set False for unattended stand-in runs
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Warm Booking Daemon
+Keeps an IRCTCBot with a started, logged-in browser session alive and accepts
+booking jobs over localhost HTTP, so a booking starts on the hot session in
+milliseconds instead of paying imports, Chrome launch, page load and login
+
+Usage:
+    python daemon.py serve                  # start the browser, log in, wait for jobs
+    python daemon.py submit job.json        # queue a booking job and follow it
+    python daemon.py status                 # session health and recent jobs
+
+A job is a JSON object overriding the journey, passenger and payment settings
+of config.py, e.g.
+    {"from_station": "NDLS", "to_station": "BCT", "journey_date": "25/12/2026",
+     "journey_class": "3A", "passengers": [...], "payment_method": "UPI", "upi_id": "me@upi"}
+"""
+
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+import itertools
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+import config
+
+logger = logging.getLogger(__name__)
+
+# Job keys and the config settings they override for the duration of the job
+JOB_FIELDS = {
+    "from_station": "FROM_STATION",
+    "to_station": "TO_STATION",
+    "journey_date": "JOURNEY_DATE",
+    "journey_class": "JOURNEY_CLASS",
+    "journey_quota": "JOURNEY_QUOTA",
+    "train_preference": "TRAIN_PREFERENCE",
+    "booking_candidates": "BOOKING_CANDIDATES",
+    "tatkal_time": "TATKAL_TIME",
+    "passengers": "PASSENGERS",
+    "payment_method": "PAYMENT_METHOD",
+    "upi_id": "UPI_ID",
+    "card_number": "CARD_NUMBER",
+    "card_expiry_month": "CARD_EXPIRY_MONTH",
+    "card_expiry_year": "CARD_EXPIRY_YEAR",
+    "card_cvv": "CARD_CVV",
+    "card_holder_name": "CARD_HOLDER_NAME",
+    "bank_name": "BANK_NAME",
+}
+
+# Finished jobs kept for GET /jobs/<id>
+KEEP_JOBS = 100
+
+
+def check_job(job):
+    """Return a list of problems with a submitted job (empty when it looks valid)"""
+    if not isinstance(job, dict):
+        return ["job must be a JSON object"]
+    problems = [f"unknown field '{key}'" for key in job if key not in JOB_FIELDS]
+    passengers = job.get("passengers")
+    if passengers is not None and (not isinstance(passengers, list) or
+                                   not all(isinstance(p, dict) for p in passengers)):
+        problems.append("passengers must be a list of objects")
+    return problems
+
+
+class BookingDaemon:
+    """Owns the warm browser session; every WebDriver call happens on its worker thread"""
+
+    def __init__(self, host="127.0.0.1", port=None, health_interval=None):
+        self.host = host
+        self.port = config.DAEMON_PORT if port is None else port
+        self.health_interval = config.DAEMON_HEALTH_INTERVAL if health_interval is None else health_interval
+        self.interactive = config.INTERACTIVE
+        self.bot = None
+        self.state = "starting"
+        self.logged_in = False
+        self.last_check = None
+        self.jobs = {}
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.stopping = threading.Event()
+        self.httpd = None
+
+    # ------------------------------------------------------------------ jobs
+
+    def submit(self, job):
+        """Queue a job and return its record"""
+        with self.lock:
+            job_id = str(next(self.ids))
+            record = {"id": job_id, "state": "queued", "submitted": time.time(), "started": None,
+                      "finished": None, "result": None, "error": None}
+            self.jobs[job_id] = record
+            for old_id in list(self.jobs)[:-KEEP_JOBS]:
+                if self.jobs[old_id]["state"] in ("done", "failed"):
+                    del self.jobs[old_id]
+        self.queue.put((job_id, job))
+        return dict(record)
+
+    def job(self, job_id):
+        with self.lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record else None
+
+    def _update(self, job_id, **changes):
+        with self.lock:
+            self.jobs[job_id].update(changes)
+
+    def health(self):
+        with self.lock:
+            queued = sum(1 for record in self.jobs.values() if record["state"] == "queued")
+        return {"state": self.state, "logged_in": self.logged_in, "last_check": self.last_check,
+                "queued": queued}
+
+    # --------------------------------------------------------------- session
+
+    def _login(self):
+        # Captcha needs a human at the daemon's terminal; jobs themselves never prompt
+        config.INTERACTIVE = self.interactive
+        try:
+            self.logged_in = self.bot.login()
+        finally:
+            config.INTERACTIVE = False
+        return self.logged_in
+
+    def start_session(self):
+        """Start the browser and log in"""
+        from irctc_bot import IRCTCBot
+        self.state = "starting"
+        if self.bot:
+            self.bot.close()
+        self.bot = IRCTCBot()
+        if not self._login():
+            logger.error("Daemon login failed; will retry on the next health check")
+        self.last_check = time.time()
+        self.state = "ready" if self.logged_in else "logged_out"
+
+    def health_check(self, reset=False):
+        """Lightweight check between jobs; re-logs in or restarts the browser when needed
+
+        reset: reload the train-search page even if the session looks alive
+        (after a job the browser is left on the payment or confirmation page)
+        """
+        from selenium.common.exceptions import WebDriverException
+        try:
+            alive = (not reset and self.bot.session_alive()) or self.bot.reset_session()
+        except WebDriverException as e:
+            logger.warning(f"Browser session lost ({str(e).splitlines()[0]}), restarting...")
+            self.start_session()
+            return
+        if not alive:
+            logger.info("Session logged out, logging in again...")
+            self._login()
+        self.last_check = time.time()
+        self.state = "ready" if self.logged_in else "logged_out"
+
+    def run_job(self, job_id, job):
+        """Apply the job's settings over config and book on the hot session"""
+        overrides = {JOB_FIELDS[key]: value for key, value in job.items()}
+        saved = {name: getattr(config, name, None) for name in overrides}
+        self.state = "busy"
+        self._update(job_id, state="running", started=time.time())
+        logger.info(f"Running booking job {job_id}")
+        try:
+            for name, value in overrides.items():
+                setattr(config, name, value)
+
+            from main import validate_config
+            if not validate_config():
+                self._update(job_id, state="failed", finished=time.time(),
+                             error="invalid configuration (see daemon log)")
+                return
+
+            if not self.logged_in and not self._login():
+                self._update(job_id, state="failed", finished=time.time(), error="not logged in")
+                return
+
+            self.bot.tracer.new_run()
+            ok = self.bot.book_on_session()
+            self._update(job_id, state="done" if ok else "failed", finished=time.time(), result=ok,
+                         error=None if ok else "booking failed (see daemon log)")
+
+        except Exception as e:
+            logger.error(f"Booking job {job_id} failed: {str(e)}")
+            self._update(job_id, state="failed", finished=time.time(), error=str(e))
+
+        finally:
+            for name, value in saved.items():
+                setattr(config, name, value)
+            # Leave the session on the train-search page for the next job
+            self.health_check(reset=True)
+
+    # ---------------------------------------------------------------- server
+
+    def serve(self):
+        """Start the HTTP endpoint, warm the session, then run jobs until stopped"""
+        handler = type("BoundDaemonHandler", (DaemonHandler,), {"daemon": self})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name="daemon-http", daemon=True).start()
+        logger.info(f"Booking daemon listening on http://{self.host}:{self.httpd.server_address[1]}")
+
+        try:
+            self.start_session()
+            while not self.stopping.is_set():
+                try:
+                    job_id, job = self.queue.get(timeout=self.health_interval)
+                except queue.Empty:
+                    self.health_check()
+                    continue
+                if job_id is None:
+                    break
+                self.run_job(job_id, job)
+        finally:
+            self.state = "stopped"
+            self.httpd.shutdown()
+            if self.bot:
+                if self.bot.ready:
+                    self.bot.ready.log_summary()
+                self.bot.close()
+
+    def stop(self):
+        self.stopping.set()
+        self.queue.put((None, None))
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """GET /health, POST /jobs, GET /jobs/<id>, POST /shutdown"""
+
+    daemon = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(self.daemon.health())
+        elif path.startswith("/jobs/"):
+            record = self.daemon.job(path[len("/jobs/"):])
+            self._send_json(record or {"error": "unknown job"}, 200 if record else 404)
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == "/jobs":
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                job = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json({"error": "body is not valid JSON"}, 400)
+                return
+            problems = check_job(job)
+            if problems:
+                self._send_json({"error": "; ".join(problems)}, 400)
+                return
+            self._send_json(self.daemon.submit(job), 202)
+        elif path == "/shutdown":
+            self._send_json({"state": "stopping"})
+            self.daemon.stop()
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+
+def request(method, path, payload=None, port=None):
+    """Call the local daemon and return (status, decoded JSON)"""
+    port = config.DAEMON_PORT if port is None else port
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = Request(f"http://127.0.0.1:{port}{path}", data=data, method=method,
+                  headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(req, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm IRCTC booking daemon")
+    parser.add_argument("--port", type=int, default=None, help="Localhost port (default DAEMON_PORT)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="Start the browser, log in and accept jobs")
+    submit = commands.add_parser("submit", help="Queue a booking job from a JSON file ('-' for stdin)")
+    submit.add_argument("job")
+    submit.add_argument("--no-follow", action="store_true", help="Return right after queueing")
+    commands.add_parser("status", help="Show session health")
+    commands.add_parser("shutdown", help="Stop the daemon and close the browser")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from log_setup import setup_logging
+        setup_logging(logging.INFO)
+        daemon = BookingDaemon(port=args.port)
+        try:
+            daemon.serve()
+        except KeyboardInterrupt:
+            print("\n⚠️ Daemon interrupted.")
+        return
+
+    try:
+        if args.command == "submit":
+            with (sys.stdin if args.job == "-" else open(args.job, "r", encoding="utf-8")) as f:
+                job = json.load(f)
+            status, record = request("POST", "/jobs", job, port=args.port)
+            if status != 202:
+                print(f"❌ Job rejected: {record.get('error')}")
+                sys.exit(1)
+            print(f"📨 Job {record['id']} queued")
+            while not args.no_follow and record["state"] in ("queued", "running"):
+                time.sleep(0.5)
+                _, record = request("GET", f"/jobs/{record['id']}", port=args.port)
+            if not args.no_follow:
+                took = (record["finished"] or time.time()) - (record["started"] or record["submitted"])
+                icon = "✅" if record["state"] == "done" else "❌"
+                print(f"{icon} Job {record['id']} {record['state']} in {took:.2f}s"
+                      + (f": {record['error']}" if record["error"] else ""))
+                sys.exit(0 if record["state"] == "done" else 1)
+        elif args.command == "status":
+            _, health = request("GET", "/health", port=args.port)
+            print(json.dumps(health, indent=2))
+        elif args.command == "shutdown":
+            request("POST", "/shutdown", port=args.port)
+            print("🛑 Daemon stopping")
+    except URLError as e:
+        print(f"❌ Daemon not reachable: {e.reason}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Driver Cache
+Remembers the chromedriver binary resolved by webdriver_manager together with
+the Chrome build it was resolved for, so later runs start the browser without
+the network version check (or download) that ChromeDriverManager().install()
+does every time
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import config
+
+logger = logging.getLogger(__name__)
+
+CHROME_BINARY_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+CHROME_BINARY_PATHS = (
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+)
+
+
+def find_chrome_binary():
+    """Path of the installed Chrome/Chromium binary, or None if it cannot be found locally"""
+    for name in CHROME_BINARY_NAMES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    for path in CHROME_BINARY_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def binary_fingerprint(path):
+    """Size and mtime of a binary: changes whenever the browser is updated in place"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+class DriverCache:
+    """On-disk manifest of the resolved chromedriver and the browser it matches"""
+
+    def __init__(self, path=None):
+        self.path = path or config.DRIVER_CACHE_FILE
+        self.manifest = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            return manifest if isinstance(manifest, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def cached_driver(self):
+        """Cached driver path if it still exists and Chrome has not changed since, else None"""
+        driver_path = self.manifest.get("driver_path")
+        if not driver_path or not os.access(driver_path, os.X_OK):
+            return None
+        chrome = find_chrome_binary()
+        if chrome != self.manifest.get("chrome_binary"):
+            return None
+        if binary_fingerprint(chrome) != self.manifest.get("chrome_fingerprint"):
+            return None
+        return driver_path
+
+    def resolve(self):
+        """Return (driver path, cache hit); only a cache miss touches the network"""
+        driver_path = self.cached_driver()
+        if driver_path:
+            return driver_path, True
+        from webdriver_manager.chrome import ChromeDriverManager
+        logger.info("No valid driver cache, resolving chromedriver with webdriver_manager...")
+        return ChromeDriverManager().install(), False
+
+    def store(self, driver_path, capabilities):
+        """Record a driver that just started a session successfully"""
+        chrome = find_chrome_binary()
+        self.manifest = {
+            "driver_path": driver_path,
+            "browser_version": capabilities.get("browserVersion"),
+            "driver_version": capabilities.get("chrome", {}).get("chromedriverVersion", "").split(" ")[0],
+            "chrome_binary": chrome,
+            "chrome_fingerprint": binary_fingerprint(chrome),
+            "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write driver cache {self.path}: {str(e)}")
+
+    def invalidate(self):
+        """Forget the cached driver, e.g. after it failed to start the installed Chrome"""
+        self.manifest = {}
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -3,6 +3,7 @@ IRCTC Tatkal Booking Bot
 Automates the process of logging in, searching trains, booking tickets, and making payments
 """
 
+import os
 import time
 import json
 import logging
@@ -10,23 +11,51 @@ from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, JavascriptException, SessionNotCreatedException, WebDriverException
+from driver_cache import DriverCache
+from browser_profiles import PageWeightMeter, apply_profile, configure_options, get_profile
+from wait_engine import WaitEngine
+from tracing import Tracer, traced
+from snapshots import SnapshotWriter, capture
+from command_stats import CommandStats
+from log_setup import bind_tracer, flush_logs, setup_logging
+from tatkal_scheduler import RESYNC_BEFORE, TatkalScheduler
+from locators import LOCATORS, Locator, LocatorRegistry, locator
+from payloads import Field, build_booking_payload, changed_fields, master_script_args, to_script_args
+from train_selection import candidates_from_config, choose_candidate, parse_train_list
+import page_scripts
 import config
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Set up logging (formatted and written on a background thread)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 class IRCTCBot:
     def __init__(self):
         self.driver = None
         self.wait = None
+        self.ready = None
+        self.locators = None
+        self.cdp = None
+        self.capture = None
+        self.recorder = None
+        self.performance_log = None
+        self.page_weight = None
+        self.last_search = None
+        self.payload = None
+        self.prestaged_commands = 0
+        self.tracer = Tracer(config.TRACE_FILE)
+        bind_tracer(self.tracer)
+        self.command_stats = CommandStats(self.tracer, config.COMMAND_BUDGETS)
+        self.tracer.listeners.append(self.command_stats.on_span)
+        self.snapshots = None
+        if config.SNAPSHOT_DIR:
+            self.snapshots = SnapshotWriter(config.SNAPSHOT_DIR, config.SNAPSHOT_QUEUE, config.SNAPSHOT_KEEP)
         self.setup_driver()
         
+    @traced("driver_ready")
     def setup_driver(self):
         """Initialize the Chrome driver with appropriate options"""
         try:
@@ -41,21 +70,43 @@ class IRCTCBot:
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            # Disable images and CSS for faster loading
+            # Page-load strategy, images and disk cache come from the browser profile
+            profile = get_profile(config.BROWSER_PROFILE)
             prefs = {
-                "profile.managed_default_content_settings.images": 2,
                 "profile.default_content_setting_values.notifications": 2
             }
+            configure_options(chrome_options, profile, prefs)
             chrome_options.add_experimental_option("prefs", prefs)
             
+            # Network events for reading the train list from its API response (or recording the
+            # session) without the CDP backend
+            if config.TRAIN_LIST_SOURCE == "network" or config.RECORD_DIR:
+                chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
+            # Persistent profile: the HTTP disk cache and site storage survive between runs
+            if config.CHROME_USER_DATA_DIR:
+                chrome_options.add_argument(f"--user-data-dir={os.path.abspath(config.CHROME_USER_DATA_DIR)}")
+            
             if config.CHROME_DRIVER_PATH:
                 self.driver = webdriver.Chrome(service=webdriver.chrome.service.Service(config.CHROME_DRIVER_PATH), options=chrome_options)
             else:
-                self.driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()), options=chrome_options)
+                self.driver = self._start_cached_driver(chrome_options)
             
+            self.command_stats.wrap(self.driver)
+            apply_profile(self.driver, profile)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.driver.maximize_window()
             self.wait = WebDriverWait(self.driver, config.IMPLICIT_WAIT)
+            self.ready = WaitEngine(self.driver, tracer=self.tracer)
+            self.locators = LocatorRegistry(self.driver)
+            if config.DRIVER_BACKEND == "cdp":
+                self._connect_cdp()
+            if config.TRAIN_LIST_SOURCE == "network":
+                self._start_capture()
+            if config.REPORT_PAGE_WEIGHT:
+                self.page_weight = PageWeightMeter(self.scripts)
+            if config.RECORD_DIR:
+                self._start_recorder()
             
             logger.info("Chrome driver initialized successfully")
             
@@ -63,52 +114,50 @@ class IRCTCBot:
             logger.error(f"Failed to initialize driver: {str(e)}")
             raise
 
+    @traced("login")
     def login(self):
         """Login to IRCTC website"""
         try:
             logger.info("Opening IRCTC website...")
-            self.driver.get("https://www.irctc.co.in/nget/train-search")
+            self.driver.get(config.IRCTC_URL)
+            self._enter_page("search", reload=True)
             
-            # Wait for page to load and click login
-            time.sleep(3)
+            # Wait until either the advisory popup or a clickable login link shows up
+            first = self.ready.first_of("page_ready", {"popup": LOCATORS["advisory_close"],
+                                                       "login": LOCATORS["login_link"]})
             
             # Handle popup if exists
-            try:
-                popup_close = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "modalClose")))
-                popup_close.click()
-                time.sleep(1)
-            except TimeoutException:
-                pass
+            if first == "popup":
+                self.locators.click("advisory_close")
+                self.ready.gone("popup_closed", LOCATORS["advisory_close"])
             
             # Click on login button
-            login_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(),'LOGIN')]")))
+            login_btn = self.ready.element("page_ready", LOCATORS["login_link"])
             login_btn.click()
             
             logger.info("Entering login credentials...")
             
             # Enter username
-            username_field = self.wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='User Name']")))
+            username_field = self.ready.element("login_form", LOCATORS["username"], clickable=False)
             username_field.clear()
             username_field.send_keys(config.IRCTC_USERNAME)
             
             # Enter password
-            password_field = self.driver.find_element(By.XPATH, "//input[@placeholder='Password']")
+            password_field = self.locators.find("password")
             password_field.clear()
             password_field.send_keys(config.IRCTC_PASSWORD)
             
             # Handle captcha (manual intervention required)
-            input("Please solve the captcha manually and press Enter to continue...")
+            if config.INTERACTIVE:
+                flush_logs()
+                input("Please solve the captcha manually and press Enter to continue...")
             
             # Click sign in
-            signin_btn = self.driver.find_element(By.XPATH, "//button[contains(text(),'SIGN IN')]")
-            signin_btn.click()
-            
-            # Wait for successful login
-            time.sleep(5)
+            self.locators.click("sign_in")
             
             # Check if login was successful
             try:
-                self.wait.until(EC.presence_of_element_located((By.XPATH, "//span[contains(text(),'Hi')]")))
+                self.ready.element("login_result", LOCATORS["greeting"], clickable=False)
                 logger.info("Login successful!")
                 return True
             except TimeoutException:
@@ -119,184 +168,411 @@ class IRCTCBot:
             logger.error(f"Login failed: {str(e)}")
             return False
 
+    def _start_cached_driver(self, chrome_options):
+        """Start Chrome with the cached chromedriver, resolving it again only when stale"""
+        cache = DriverCache()
+        driver_path, cached = cache.resolve()
+        try:
+            driver = webdriver.Chrome(service=webdriver.chrome.service.Service(driver_path), options=chrome_options)
+        except SessionNotCreatedException:
+            if not cached:
+                raise
+            logger.warning("Cached chromedriver does not match the installed Chrome, resolving it again...")
+            cache.invalidate()
+            driver_path, cached = cache.resolve()
+            driver = webdriver.Chrome(service=webdriver.chrome.service.Service(driver_path), options=chrome_options)
+        
+        if not cached:
+            cache.store(driver_path, driver.capabilities)
+        self.tracer.annotate(driver_cache="hit" if cached else "miss",
+                             browser_version=driver.capabilities.get("browserVersion"))
+        return driver
+
+    def _enter_page(self, page, reload=False):
+        """Switch the locator cache to `page` and report the weight of the page being left"""
+        self.locators.enter_page(page, reload=reload)
+        if self.page_weight:
+            self.page_weight.visit(page)
+
+    def _connect_cdp(self):
+        """Attach the CDP backend; WebDriver keeps working alone if it cannot connect"""
+        try:
+            from cdp_driver import CDPDriver
+            self.cdp = CDPDriver(self.driver, stats=self.command_stats)
+        except Exception as e:
+            logger.warning(f"CDP backend unavailable, using WebDriver only: {str(e)}")
+            self.cdp = None
+
+    def _start_capture(self):
+        """Listen for the train-list API response; the list is scraped from the page if this fails"""
+        try:
+            from network_capture import start_capture
+            self.capture = start_capture(self.driver, self.cdp,
+                                         log=None if self.cdp else self._shared_performance_log())
+        except Exception as e:
+            logger.warning(f"Network capture unavailable, reading the train list from the page: {str(e)}")
+            self.capture = None
+
+    def _shared_performance_log(self):
+        """One reader of Chrome's performance log for the capture and the recorder (a read empties it)"""
+        if self.performance_log is None:
+            from network_capture import PerformanceLog
+            self.performance_log = PerformanceLog(self.driver)
+        return self.performance_log
+
+    def _start_recorder(self):
+        """Record per-phase DOM and network responses of this browser session (saved on close)"""
+        try:
+            from session_recorder import SessionRecorder
+            self.recorder = SessionRecorder(config.RECORD_DIR, self.driver, self.scripts, self.tracer,
+                                            cdp=self.cdp, start_url=config.IRCTC_URL,
+                                            log=None if self.cdp else self._shared_performance_log())
+            self.tracer.listeners.append(self.recorder.on_span)
+        except Exception as e:
+            logger.warning(f"Session recording unavailable: {str(e)}")
+            self.recorder = None
+
+    @property
+    def scripts(self):
+        """Where data-only page scripts run: the CDP backend when connected, else WebDriver"""
+        return self.cdp or self.driver
+
+    @property
+    def commands(self):
+        """Browser round trips (WebDriver and CDP) made so far"""
+        return self.command_stats.total
+
+    def _payload(self):
+        """Booking payload, compiled from config on first use"""
+        if self.payload is None:
+            self.payload = build_booking_payload()
+        return self.payload
+
+    def _apply_fields(self, fields):
+        """Fill form fields one WebDriver call at a time, writing only those that differ from the page
+
+        The current values are read in one round trip first, so a refill after
+        a re-render or partial failure retypes only what was lost.
+        """
+        try:
+            values = self.scripts.execute_script(page_scripts.READ_FIELDS, to_script_args(fields)) or []
+            pending = changed_fields(fields, values)
+            # "type" appends to what is there: clear leftovers of an earlier attempt first
+            current = dict(zip((field.name for field in fields), values))
+            pending = [field._replace(kind="text") if field.kind == "type" and current.get(field.name) else field
+                       for field in pending]
+        except JavascriptException as e:
+            logger.debug(f"Form read failed, writing every field: {str(e)}")
+            pending = fields
+        for field in pending:
+            self.locators.act(field.locator, lambda element: self._apply_field(element, field))
+        self._report_fill([field.name for field in pending], len(fields))
+
+    def _report_fill(self, changed, total):
+        self.tracer.annotate(fields_changed=len(changed))
+        if changed and len(changed) < total:
+            logger.info(f"Form fill wrote {len(changed)} of {total} fields: {', '.join(changed)}")
+
+    @staticmethod
+    def _apply_field(element, field):
+        if field.kind == "text":
+            element.clear()
+            element.send_keys(field.value)
+        elif field.kind == "type":
+            element.send_keys(field.value)
+        elif field.kind == "select_value":
+            Select(element).select_by_value(field.value)
+        elif field.kind == "select_text":
+            Select(element).select_by_visible_text(field.value)
+        elif field.kind == "check":
+            if element.is_selected() != field.value:
+                element.click()
+        elif field.kind == "click":
+            element.click()
+        elif field.kind == "present":
+            raise ValueError(f"{field.name} is empty and has no configured value")
+
+    def _apply_fields_batched(self, fields):
+        """Fill form fields in one execute_script and verify them in one read-back
+
+        The page writes only the fields whose current value differs; when none
+        did, the read-back is skipped. Returns False (leaving the caller to fall
+        back to _apply_fields) when a field cannot be set or does not read back
+        as expected.
+        """
+        args = to_script_args(fields)
+        try:
+            if self.cdp:
+                # Fill and read-back go out together; the page still runs them in order
+                result, values = self.cdp.pipeline([(page_scripts.APPLY_FIELDS, [args]),
+                                                    (page_scripts.READ_FIELDS, [args])])
+            else:
+                result = self.driver.execute_script(page_scripts.APPLY_FIELDS, args)
+                values = None
+        except JavascriptException as e:
+            logger.warning(f"Batched fill script failed: {str(e)}")
+            return False
+        if result["failed"]:
+            logger.warning(f"Batched fill could not set: {', '.join(result['failed'])}")
+            return False
+        
+        self._report_fill(result["changed"], len(fields))
+        if not result["changed"]:
+            return True
+        if values is None:
+            values = self.driver.execute_script(page_scripts.READ_FIELDS, args)
+        mismatched = [field.name for field in changed_fields(fields, values)]
+        if mismatched:
+            logger.warning(f"Batched fill did not stick for: {', '.join(mismatched)}")
+            return False
+        return True
+
+    @traced("search_trains")
     def search_trains(self):
         """Search for trains between source and destination"""
+        if not self.fill_search_form():
+            return False
+        return self.submit_search()
+
+    @traced("fill_search_form")
+    def fill_search_form(self):
+        """Fill stations, journey date, class and quota without submitting"""
         try:
             logger.info(f"Searching trains from {config.FROM_STATION} to {config.TO_STATION}")
+            self.tracer.annotate(from_station=config.FROM_STATION, to_station=config.TO_STATION,
+                                 journey_date=config.JOURNEY_DATE, journey_class=config.JOURNEY_CLASS)
             
-            # Enter FROM station
-            from_station = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//input[@placeholder='From*']")))
-            from_station.clear()
-            from_station.send_keys(config.FROM_STATION)
-            time.sleep(2)
-            
-            # Select first suggestion
-            first_suggestion = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//span[@class='ng-star-inserted'][1]")))
-            first_suggestion.click()
-            
-            # Enter TO station
-            to_station = self.driver.find_element(By.XPATH, "//input[@placeholder='To*']")
-            to_station.clear()
-            to_station.send_keys(config.TO_STATION)
-            time.sleep(2)
+            # From/To stations
+            self.ready.element("search_form", LOCATORS["from_station"])
+            for choice in self._payload().stations:
+                self._enter_station(choice)
             
-            # Select first suggestion for destination
-            dest_suggestion = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//span[@class='ng-star-inserted'][1]")))
-            dest_suggestion.click()
-            
-            # Select journey date
-            date_field = self.driver.find_element(By.XPATH, "//input[@placeholder='Journey Date(DD/MM/YYYY)']")
-            date_field.clear()
-            date_field.send_keys(config.JOURNEY_DATE)
-            
-            # Select journey class
-            class_dropdown = self.driver.find_element(By.XPATH, "//select[@formcontrolname='journeyClass']")
-            select_class = Select(class_dropdown)
-            select_class.select_by_value(config.JOURNEY_CLASS)
+            # Journey date, class and quota
+            self._apply_fields(self._payload().search)
+            return True
             
-            # Click search
-            search_btn = self.driver.find_element(By.XPATH, "//button[contains(text(),'Search')]")
-            search_btn.click()
+        except Exception as e:
+            logger.error(f"Train search failed: {str(e)}")
+            return False
+
+    def _enter_station(self, choice):
+        """Fill a From/To autocomplete with exactly the configured station
+
+        The station index gives the label the site shows ("NEW DELHI - NDLS"):
+        it is set directly when the control still holds it once settled
+        (WAIT_BUDGETS["station_settle"] without changes), otherwise the code is
+        typed and that exact option clicked. Stations missing from the index
+        fall back to the first suggestion matching the configured text.
+        """
+        if choice.label and config.STATION_DIRECT_ENTRY:
+            field = Field(choice.name, locator(choice.name), "text", choice.label)
+            if self.scripts.execute_async_script(page_scripts.SET_STATION, to_script_args([field])[0], choice.label,
+                                                 int(self.ready.budget("station_settle") * 1000)):
+                self.tracer.annotate(**{choice.name: choice.label})
+                return
+            logger.info(f"Direct entry of '{choice.label}' not accepted, picking it from the suggestions")
+        
+        typed = Field(choice.name, locator(choice.name), "text", choice.code or choice.query)
+        self.locators.act(typed.locator, lambda element: self._apply_field(element, typed))
+        if choice.label:
+            option = locator("station_option", label=choice.label)
+        else:
+            logger.warning(f"Station '{choice.query}' not in the station index, taking the first suggestion")
+            option = locator("station_suggestion", query=choice.query.strip().upper())
+        self.ready.element("station_suggestion", option).click()
+        self.tracer.annotate(**{choice.name: choice.label or choice.query})
+
+    @traced("submit_search")
+    def submit_search(self):
+        """Click Search on an already filled search form"""
+        try:
+            if self.capture:
+                self.capture.arm()
+            self.locators.click("search_button")
+            self.last_search = time.monotonic()
             
             logger.info("Train search initiated...")
-            time.sleep(5)
-            
             return True
             
         except Exception as e:
             logger.error(f"Train search failed: {str(e)}")
             return False
 
+    @traced("prestage_booking")
+    def prestage_booking(self):
+        """Do everything possible before the Tatkal window opens
+
+        Compiles the passenger and payment payloads and fills the whole search
+        form, leaving only the Search click and the availability pick for T-0.
+        """
+        start = self.commands
+        self.payload = build_booking_payload()
+        if not self.fill_search_form():
+            return False
+        self.prestaged_commands = self.commands - start
+        logger.info(f"Pre-staged search form with {self.prestaged_commands} browser commands")
+        return True
+
+    @traced("select_train_and_book")
     def select_train_and_book(self):
         """Select available train and proceed to booking"""
         try:
-            # Wait for train list to load
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "train-list")))
-            
-            # Look for Tatkal available trains
-            trains = self.driver.find_elements(By.XPATH, "//div[@class='train-list']//div[@class='row']")
-            
-            for train in trains:
+            trains = self._trains_from_network() if self.capture else None
+            if trains is None:
+                # Wait for train list to load
+                self.ready.element("train_list", LOCATORS["train_list"], clickable=False)
+                
+                # Read the whole train list in one round trip and decide in Python
                 try:
-                    # Check if train has the preferred number (if specified)
-                    if config.TRAIN_PREFERENCE:
-                        train_number = train.find_element(By.XPATH, ".//div[@class='train-number']").text
-                        if config.TRAIN_PREFERENCE not in train_number:
-                            continue
-                    
-                    # Look for available Tatkal quota
-                    tatkal_btn = train.find_element(By.XPATH, f".//td[contains(@class, '{config.JOURNEY_CLASS}')]//button[contains(text(),'BOOK NOW')]")
-                    
-                    if tatkal_btn.is_enabled():
-                        logger.info("Found available Tatkal seat, clicking book now...")
-                        tatkal_btn.click()
-                        time.sleep(3)
-                        return True
-                        
-                except NoSuchElementException:
-                    continue
-            
-            logger.warning("No Tatkal seats available in the preferred class")
+                    trains = self.driver.execute_script(page_scripts.EXTRACT_TRAINS) or []
+                except JavascriptException as e:
+                    logger.warning(f"Train list extraction failed, scanning rows instead: {str(e)}")
+                    return self._scan_train_rows()
+            
+            self.tracer.annotate(trains_listed=len(trains), journey_class=config.JOURNEY_CLASS)
+            
+            choice, rejected = choose_candidate(trains, candidates_from_config(), config.JOURNEY_QUOTA or None)
+            for reason in rejected:
+                logger.info(f"Candidate rejected: {reason}")
+            if choice:
+                train, cell, candidate = choice
+                logger.info(f"Found available Tatkal seat on {train['number']} {cell['code']} ({cell['status']}), "
+                            f"clicking book now...")
+                self.tracer.annotate(train_number=train["number"], availability=cell["status"],
+                                     booked_class=cell["code"], candidates_rejected=len(rejected))
+                button = cell["button"]
+                if isinstance(button, Locator):
+                    # Chosen from the API response: wait for just this button, not the whole list
+                    button = self.ready.element("train_list", button)
+                button.click()
+                self._enter_page("passengers")
+                self.ready.element("passenger_form", locator("passenger_name", i=1), clickable=False)
+                return True
+            
+            logger.warning("No Tatkal seats available for any booking candidate")
             return False
             
         except Exception as e:
             logger.error(f"Train selection failed: {str(e)}")
             return False
 
-    def fill_passenger_details(self):
-        """Fill passenger details for booking"""
+    def _trains_from_network(self):
+        """Train list parsed from the intercepted API response, or None to read it from the page"""
         try:
-            logger.info("Filling passenger details...")
-            
-            for i, passenger in enumerate(config.PASSENGERS):
-                # Fill passenger name
-                name_field = self.driver.find_element(By.XPATH, f"//input[@placeholder='Passenger Name {i+1}']")
-                name_field.clear()
-                name_field.send_keys(passenger['name'])
-                
-                # Select age
-                age_field = self.driver.find_element(By.XPATH, f"//input[@placeholder='Age {i+1}']")
-                age_field.clear()
-                age_field.send_keys(str(passenger['age']))
-                
-                # Select gender
-                gender_dropdown = Select(self.driver.find_element(By.XPATH, f"//select[@formcontrolname='passengerGender{i+1}']"))
-                gender_dropdown.select_by_value(passenger['gender'])
-                
-                # Select berth preference
-                berth_dropdown = Select(self.driver.find_element(By.XPATH, f"//select[@formcontrolname='berthChoice{i+1}']"))
-                berth_dropdown.select_by_value(passenger['berth_preference'])
+            payload = self.capture.wait(self.ready.budget("train_list"))
+        except Exception as e:
+            logger.warning(f"Train list capture failed, reading the page instead: {str(e)}")
+            return None
+        trains = parse_train_list(payload)
+        if trains is None:
+            logger.warning("No train-list response captured, reading the page instead")
+            return None
+        self.tracer.annotate(train_source="network")
+        return trains
+
+    def _scan_train_rows(self):
+        """Row-by-row train scan, used when the one-shot extraction is unavailable"""
+        trains = self.driver.find_elements(By.XPATH, LOCATORS["train_rows"].xpath)
+        
+        for train in trains:
+            try:
+                train_number = None
                 
-                # Select food choice
-                food_dropdown = Select(self.driver.find_element(By.XPATH, f"//select[@formcontrolname='foodChoice{i+1}']"))
-                food_dropdown.select_by_value(passenger['food_choice'])
+                # Check if train has the preferred number (if specified)
+                if config.TRAIN_PREFERENCE:
+                    train_number = train.find_element(By.XPATH, ".//div[@class='train-number']").text
+                    if config.TRAIN_PREFERENCE not in train_number:
+                        continue
                 
-                # Fill ID details
-                id_type_dropdown = Select(self.driver.find_element(By.XPATH, f"//select[@formcontrolname='idType{i+1}']"))
-                id_type_dropdown.select_by_visible_text(passenger['id_card_type'])
+                # Look for available Tatkal quota
+                tatkal_btn = train.find_element(By.XPATH, f".//td[contains(@class, '{config.JOURNEY_CLASS}')]//button[contains(text(),'BOOK NOW')]")
                 
-                id_number_field = self.driver.find_element(By.XPATH, f"//input[@placeholder='ID Number {i+1}']")
-                id_number_field.clear()
-                id_number_field.send_keys(passenger['id_card_number'])
-            
-            # Accept terms and conditions
-            terms_checkbox = self.driver.find_element(By.XPATH, "//input[@type='checkbox']")
-            if not terms_checkbox.is_selected():
-                terms_checkbox.click()
+                if tatkal_btn.is_enabled():
+                    logger.info("Found available Tatkal seat, clicking book now...")
+                    self.tracer.annotate(train_number=train_number)
+                    tatkal_btn.click()
+                    self._enter_page("passengers")
+                    self.ready.element("passenger_form", locator("passenger_name", i=1), clickable=False)
+                    return True
+                    
+            except NoSuchElementException:
+                continue
+        
+        logger.warning("No Tatkal seats available in the preferred class")
+        return False
+
+    @traced("fill_passenger_details")
+    def fill_passenger_details(self):
+        """Fill passenger details for booking"""
+        try:
+            logger.info("Filling passenger details...")
+            self.tracer.annotate(passengers=len(config.PASSENGERS))
+            
+            # Saved passengers are picked from the master list first; the fill below then
+            # only verifies their rows and types whatever the list did not provide
+            fields = self._payload().passengers
+            if config.USE_MASTER_LIST and self._payload().masters:
+                missing = self._select_master_passengers(self._payload().masters)
+                untyped = [master.name for master in missing
+                           if any(field.kind == "present" and field.name.startswith(f"passenger{master.row}.")
+                                  for field in fields)]
+                if untyped:
+                    logger.error(f"Not on the master passenger list and no details in config: {', '.join(untyped)}")
+                    return False
+            
+            # Passenger rows and the terms checkbox: one batched round trip, else field by field
+            batched = config.BATCHED_FORM_FILL and self._apply_fields_batched(fields)
+            if not batched:
+                self._apply_fields(fields)
+            self.tracer.annotate(batched=batched)
             
             # Click continue
-            continue_btn = self.driver.find_element(By.XPATH, "//button[contains(text(),'Continue')]")
-            continue_btn.click()
+            self.locators.click("continue_button")
+            self._enter_page("payment")
             
             logger.info("Passenger details filled successfully")
-            time.sleep(3)
+            self.ready.element("payment_form", locator("payment_mode", method=config.PAYMENT_METHOD), clickable=False)
             return True
             
         except Exception as e:
             logger.error(f"Failed to fill passenger details: {str(e)}")
             return False
 
+    def _select_master_passengers(self, masters):
+        """Pick passengers from the IRCTC master list in one async script; returns the MasterChoices not found"""
+        try:
+            names = self.scripts.execute_async_script(page_scripts.SELECT_MASTER_PASSENGERS,
+                                                      master_script_args(masters),
+                                                      int(self.ready.budget("master_passenger") * 1000))
+            missing = [master for master in masters if master.name in (names or [])]
+        except (JavascriptException, TimeoutException) as e:
+            logger.warning(f"Master list selection failed, typing passenger details: {str(e)}")
+            missing = list(masters)
+        self.tracer.annotate(master_selected=len(masters) - len(missing))
+        if missing:
+            logger.warning(f"Not on the master passenger list, typing instead: "
+                           f"{', '.join(master.name for master in missing)}")
+        return missing
+
+    @traced("make_payment")
     def make_payment(self):
         """Handle payment process"""
         try:
             logger.info("Processing payment...")
+            self.tracer.annotate(payment_method=config.PAYMENT_METHOD)
             
-            # Select payment method
-            if config.PAYMENT_METHOD == "UPI":
-                upi_radio = self.driver.find_element(By.XPATH, "//input[@value='UPI']")
-                upi_radio.click()
-                
-                upi_id_field = self.driver.find_element(By.XPATH, "//input[@placeholder='Enter UPI ID']")
-                upi_id_field.send_keys(config.UPI_ID)
-                
-            elif config.PAYMENT_METHOD == "DEBIT_CARD":
-                card_radio = self.driver.find_element(By.XPATH, "//input[@value='DEBIT_CARD']")
-                card_radio.click()
-                
-                # Fill card details
-                card_number_field = self.driver.find_element(By.XPATH, "//input[@placeholder='Card Number']")
-                card_number_field.send_keys(config.CARD_NUMBER)
-                
-                expiry_month = Select(self.driver.find_element(By.XPATH, "//select[@name='expiryMonth']"))
-                expiry_month.select_by_value(config.CARD_EXPIRY_MONTH)
-                
-                expiry_year = Select(self.driver.find_element(By.XPATH, "//select[@name='expiryYear']"))
-                expiry_year.select_by_value(config.CARD_EXPIRY_YEAR)
-                
-                cvv_field = self.driver.find_element(By.XPATH, "//input[@placeholder='CVV']")
-                cvv_field.send_keys(config.CARD_CVV)
-                
-                cardholder_name = self.driver.find_element(By.XPATH, "//input[@placeholder='Cardholder Name']")
-                cardholder_name.send_keys(config.CARD_HOLDER_NAME)
+            # Select payment method and fill its details
+            self._apply_fields(self._payload().payment)
             
             # Click make payment
-            pay_btn = self.driver.find_element(By.XPATH, "//button[contains(text(),'Make Payment')]")
-            pay_btn.click()
+            self.locators.click("pay_button")
             
             logger.info("Payment initiated. Please complete the payment process manually if required.")
             
             # Wait for payment completion (manual intervention may be required)
-            input("Please complete the payment process and press Enter when done...")
+            if config.INTERACTIVE:
+                flush_logs()
+                input("Please complete the payment process and press Enter when done...")
             
             return True
             
@@ -304,79 +580,235 @@ class IRCTCBot:
             logger.error(f"Payment process failed: {str(e)}")
             return False
 
+    @traced("wait_for_tatkal_time")
     def wait_for_tatkal_time(self):
-        """Wait until Tatkal booking time (10:00 AM or 11:00 AM)"""
-        current_time = datetime.now()
+        """Wait until Tatkal booking time (10:00 AM or 11:00 AM) on the server clock
+
+        The clock is only synced near T-0 (within CLOCK_SKEW_MARGIN_S of the
+        local clock); well past Tatkal time the booking goes ahead at once.
+        """
+        local_now = time.time()
         tatkal_time = datetime.strptime(config.TATKAL_TIME, "%H:%M").time()
-        tatkal_datetime = datetime.combine(current_time.date(), tatkal_time)
+        tatkal_datetime = datetime.combine(datetime.fromtimestamp(local_now).date(), tatkal_time)
+        margin = config.CLOCK_SKEW_MARGIN_S
+        if local_now > tatkal_datetime.timestamp() + margin:
+            return
         
-        if current_time.time() < tatkal_time:
-            wait_seconds = (tatkal_datetime - current_time).total_seconds()
-            logger.info(f"Waiting {wait_seconds:.0f} seconds until Tatkal time ({config.TATKAL_TIME})")
-            time.sleep(wait_seconds)
+        # Decide on the server clock: a local clock running ahead must not skip the wait. Far from
+        # T-0 there is nothing to sync yet, fire_at resyncs shortly before the target
+        scheduler = TatkalScheduler()
+        if tatkal_datetime.timestamp() - local_now < RESYNC_BEFORE + margin:
+            scheduler.sync()
+        server_now = scheduler.server_now()
+        
+        if server_now < tatkal_datetime.timestamp():
+            wait_seconds = tatkal_datetime.timestamp() - server_now
+            logger.info(f"Waiting {wait_seconds:.0f} seconds until Tatkal time ({config.TATKAL_TIME}) "
+                        f"on the server clock, lead {config.TATKAL_LEAD_MS} ms")
+            fire_error = scheduler.fire_at(tatkal_datetime.timestamp())
+            self.tracer.annotate(clock_offset_ms=round(scheduler.clock.offset * 1000, 2),
+                                 fire_error_ms=round(fire_error * 1000, 3))
         
         logger.info("Tatkal booking time reached!")
 
     def run_booking_process(self):
         """Main method to run the complete booking process"""
         try:
-            logger.info("Starting IRCTC Tatkal booking process...")
+            return self._run_booking_steps()
             
-            # Step 1: Login
-            if not self.login():
-                logger.error("Login failed. Exiting...")
-                return False
-            
-            # Step 2: Wait for Tatkal time (if needed)
-            self.wait_for_tatkal_time()
+        except Exception as e:
+            logger.error(f"Booking process failed: {str(e)}")
+            return False
+        
+        finally:
+            if self.ready:
+                self.ready.log_summary()
             
-            # Step 3: Search trains
-            if not self.search_trains():
-                logger.error("Train search failed. Exiting...")
-                return False
+            # Keep browser open for manual verification
+            if config.INTERACTIVE:
+                flush_logs()
+                input("Press Enter to close the browser...")
+            self.close()
+
+    @traced("booking_run")
+    def _run_booking_steps(self):
+        """Login, wait for Tatkal time, search and book with retries"""
+        logger.info("Starting IRCTC Tatkal booking process...")
+        self.payload = None
+        
+        # Step 1: Login
+        if not self.login():
+            logger.error("Login failed. Exiting...")
+            self.snapshot("login", reason="Login failed")
+            return False
+        
+        return self._book_after_login()
+
+    def book_on_session(self):
+        """Run a booking on the already logged-in session, keeping the browser open
+
+        Used by the warm daemon: login and browser startup are already paid for.
+        """
+        try:
+            return self._book_on_session()
+        
+        except Exception as e:
+            logger.error(f"Booking job failed: {str(e)}")
+            return False
+
+    @traced("booking_run", session="warm")
+    def _book_on_session(self):
+        logger.info("Starting IRCTC Tatkal booking on the warm session...")
+        self.payload = None
+        return self._book_after_login()
+
+    def _book_after_login(self):
+        """Pre-stage, wait for Tatkal time, search and book with retries"""
+        # Step 2: Pre-stage the search form and payloads while the window is still closed
+        prestaged = config.PRESTAGE and self.prestage_booking()
+        
+        # Step 3: Wait for Tatkal time (if needed)
+        self.wait_for_tatkal_time()
+        
+        # Step 4: Search trains (only the Search click is left if pre-staged)
+        if prestaged:
+            start = self.commands
+            searched = self.submit_search()
+            logger.info(f"Pre-stage moved {self.prestaged_commands} browser commands off the critical path "
+                        f"({self.commands - start} left at T-0)")
+        else:
+            searched = self.search_trains()
+        if not searched:
+            logger.error("Train search failed. Exiting...")
+            self.snapshot("search", reason="Train search failed")
+            return False
+        
+        # Step 5: Select train and book
+        attempt = 1
+        while attempt <= config.BOOKING_ATTEMPTS:
+            logger.info(f"Booking attempt {attempt}/{config.BOOKING_ATTEMPTS}")
             
-            # Step 4: Select train and book
-            attempt = 1
-            while attempt <= config.BOOKING_ATTEMPTS:
-                logger.info(f"Booking attempt {attempt}/{config.BOOKING_ATTEMPTS}")
-                
+            with self.tracer.span("booking_attempt", attempt=attempt) as attempt_span:
                 if self.select_train_and_book():
-                    # Step 5: Fill passenger details
+                    # Step 6: Fill passenger details
                     if self.fill_passenger_details():
-                        # Step 6: Make payment
+                        # Step 7: Make payment
                         if self.make_payment():
                             logger.info("Booking completed successfully!")
                             return True
                         else:
                             logger.error("Payment failed")
+                            self.snapshot("payment", attempt, "Payment failed")
+                            attempt_span.set_outcome("failed")
                             return False
                     else:
                         logger.error("Failed to fill passenger details")
+                        self.snapshot("passenger_details", attempt, "Failed to fill passenger details")
+                        attempt_span.set_outcome("failed")
                         return False
                 else:
                     logger.warning(f"Booking attempt {attempt} failed. Retrying...")
+                    self.snapshot("select_train", attempt, "No bookable train or class")
+                    attempt_span.set_outcome("failed")
                     attempt += 1
-                    time.sleep(2)
                     
-                    # Refresh the page and search again
-                    self.driver.refresh()
-                    time.sleep(3)
-                    self.search_trains()
-            
-            logger.error("All booking attempts failed")
-            return False
+                    if attempt <= config.BOOKING_ATTEMPTS:
+                        start = time.perf_counter()
+                        self.retry_search()
+                        logger.info(f"Re-searched for attempt {attempt} in "
+                                    f"{(time.perf_counter() - start) * 1000:.0f} ms")
+        
+        logger.error("All booking attempts failed")
+        return False
+
+    def snapshot(self, step, attempt=None, reason=None):
+        """Capture the page at a failed step; compression and disk writes happen on the snapshot writer"""
+        if not self.snapshots or not self.driver:
+            return
+        with self.tracer.span("snapshot", step=step):
+            self.snapshots.submit(capture(self.driver, self.scripts, step, self.tracer.run_id, attempt, reason))
+
+    @traced("retry_search")
+    def retry_search(self):
+        """Search again for the next attempt, no sooner than RETRY_MIN_INTERVAL_MS after the last search
+
+        Re-runs only the availability query on the still-filled form; refreshes
+        and replays the whole search when RETRY_MODE is "replay" or the form is gone.
+        """
+        if self.last_search is not None:
+            remaining = config.RETRY_MIN_INTERVAL_MS / 1000 - (time.monotonic() - self.last_search)
+            if remaining > 0:
+                time.sleep(remaining)
+        
+        if config.RETRY_MODE == "incremental":
+            try:
+                form = [{"css": LOCATORS[name].css, "xpath": LOCATORS[name].xpath}
+                        for name in ("search_button", "from_station")]
+                if self.scripts.execute_script(page_scripts.MARK_TRAIN_LIST_STALE, *form):
+                    self.tracer.annotate(mode="incremental")
+                    return self.submit_search()
+                logger.info("Search form not on the page, refreshing and searching again")
+            except Exception as e:
+                logger.warning(f"Incremental re-search failed, refreshing instead: {str(e)}")
+        
+        self.tracer.annotate(mode="replay")
+        self.driver.refresh()
+        self._enter_page("search", reload=True)
+        return self.search_trains()
+
+    @traced("reset_session")
+    def reset_session(self):
+        """Reload the train-search page; returns True if the session is still logged in
+
+        Raises WebDriverException when the browser itself no longer responds.
+        """
+        try:
+            self.driver.get(config.IRCTC_URL)
+            self._enter_page("search", reload=True)
+            
+            targets = {"popup": LOCATORS["advisory_close"], "greeting": LOCATORS["greeting"],
+                       "login": LOCATORS["login_link"]}
+            first = self.ready.first_of("page_ready", targets)
+            if first == "popup":
+                self.locators.click("advisory_close")
+                self.ready.gone("popup_closed", LOCATORS["advisory_close"])
+                del targets["popup"]
+                first = self.ready.first_of("page_ready", targets)
+            return first == "greeting"
             
         except Exception as e:
-            logger.error(f"Booking process failed: {str(e)}")
+            if not self.browser_responding():
+                # A dead browser is not a logged-out session: the caller has to restart it
+                raise WebDriverException(f"Browser not responding: {str(e)}") from e
+            logger.error(f"Session reset failed: {str(e)}")
             return False
-        
-        finally:
-            # Keep browser open for manual verification
-            input("Press Enter to close the browser...")
-            self.close()
+
+    def browser_responding(self):
+        """Whether the WebDriver session still answers a command (False once Chrome or chromedriver died)"""
+        try:
+            return self.driver.title is not None
+        except Exception:
+            return False
+
+    def session_alive(self):
+        """Cheap health check: one round trip confirming the page still shows the login greeting"""
+        return bool(self.ready.element("session_check", LOCATORS["greeting"], clickable=False,
+                                       timeout=2, required=False))
 
     def close(self):
         """Close the browser driver"""
+        if self.page_weight:
+            self.page_weight.finish()
+        if self.recorder:
+            self.tracer.listeners.remove(self.recorder.on_span)
+            self.recorder.save()
+            self.recorder = None
+        if self.cdp:
+            self.cdp.close()
+            self.cdp = None
         if self.driver:
             self.driver.quit()
             logger.info("Browser closed")
+        if self.snapshots:
+            self.snapshots.close()
+        self.tracer.close()
@@ -0,0 +1,263 @@
+"""
+Locator Registry
+Every page element the bot touches, defined once with a fast CSS selector and
+an XPath fallback, plus a per-page cache of resolved element handles that
+re-resolves automatically on StaleElementReferenceException
+
+Usage: python locators.py   # compare CSS vs XPath lookup cost on the stand-in
+"""
+
+import time
+import logging
+import argparse
+from collections import namedtuple
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+logger = logging.getLogger(__name__)
+
+
+def xpath_literal(value):
+    """`value` as an XPath string literal, using concat() when it holds both quote characters"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+class Locator(namedtuple("Locator", ["name", "page", "css", "xpath"])):
+    """A page element: preferred CSS selector (may be None) and XPath fallback
+
+    Selectors may contain {placeholders} filled in by format(), e.g. {i} for
+    the passenger row. A placeholder that is a whole quoted XPath literal
+    ('{label}') is replaced by a properly quoted literal of the value.
+    """
+
+    __slots__ = ()
+
+    def format(self, **params):
+        if not params:
+            return self
+        xpath = self.xpath
+        for key, value in params.items():
+            literal = xpath_literal(str(value)).replace("{", "{{").replace("}", "}}")
+            xpath = xpath.replace(f"'{{{key}}}'", literal)
+        return Locator(
+            f"{self.name}[{','.join(str(value) for value in params.values())}]",
+            self.page,
+            self.css.format(**params) if self.css else None,
+            xpath.format(**params),
+        )
+
+
+def _locators(*entries):
+    return {entry[0]: Locator(*entry) for entry in entries}
+
+
+LOCATORS = _locators(
+    # Train-search page and login modal
+    ("advisory_close", "search", ".modalClose", "//*[contains(concat(' ', @class, ' '), ' modalClose ')]"),
+    ("login_link", "search", "a.loginText", "//a[contains(text(),'LOGIN')]"),
+    ("username", "login", "input[placeholder='User Name']", "//input[@placeholder='User Name']"),
+    ("password", "login", "input[placeholder='Password']", "//input[@placeholder='Password']"),
+    ("sign_in", "login", ".login-modal button[type='submit']", "//button[contains(text(),'SIGN IN')]"),
+    ("greeting", "search", "span.user-greeting", "//span[contains(text(),'Hi')]"),
+    ("from_station", "search", "input[placeholder='From*']", "//input[@placeholder='From*']"),
+    ("to_station", "search", "input[placeholder='To*']", "//input[@placeholder='To*']"),
+    ("station_suggestion", "search", None,
+     "(//span[@class='ng-star-inserted'])[1][contains(translate(., 'abcdefghijklmnopqrstuvwxyz', "
+     "'ABCDEFGHIJKLMNOPQRSTUVWXYZ'), '{query}')]"),
+    ("station_option", "search", None, "//span[@class='ng-star-inserted'][normalize-space(.)='{label}']"),
+    ("journey_date", "search", "input[placeholder='Journey Date(DD/MM/YYYY)']",
+     "//input[@placeholder='Journey Date(DD/MM/YYYY)']"),
+    ("journey_class", "search", "select[formcontrolname='journeyClass']", "//select[@formcontrolname='journeyClass']"),
+    ("journey_quota", "search", "select[formcontrolname='journeyQuota']", "//select[@formcontrolname='journeyQuota']"),
+    ("search_button", "search", "form.search-form button[type='submit']", "//button[contains(text(),'Search')]"),
+
+    # Train list
+    ("train_list", "train_list", "div.train-list:not([data-stale])", "//div[@class='train-list'][not(@data-stale)]"),
+    ("train_rows", "train_list", "div.train-list:not([data-stale]) div.row",
+     "//div[@class='train-list'][not(@data-stale)]//div[@class='row']"),
+    ("book_now", "train_list", "div.train-list:not([data-stale]) div.row[data-train-number='{train}'] td[data-class='{cls}'] button",
+     "//div[@class='train-list'][not(@data-stale)]//div[@class='row'][.//div[@class='train-number'][normalize-space(.)='{train}']]"
+     "//td[contains(concat(' ', normalize-space(@class), ' '), concat(' ', '{cls}', ' '))]//button[contains(text(),'BOOK NOW')]"),
+
+    # Passenger page ({i} is the 1-based passenger row)
+    ("passenger_name", "passengers", "input[placeholder='Passenger Name {i}']", "//input[@placeholder='Passenger Name {i}']"),
+    ("passenger_age", "passengers", "input[placeholder='Age {i}']", "//input[@placeholder='Age {i}']"),
+    ("passenger_gender", "passengers", "select[formcontrolname='passengerGender{i}']",
+     "//select[@formcontrolname='passengerGender{i}']"),
+    ("berth_choice", "passengers", "select[formcontrolname='berthChoice{i}']", "//select[@formcontrolname='berthChoice{i}']"),
+    ("food_choice", "passengers", "select[formcontrolname='foodChoice{i}']", "//select[@formcontrolname='foodChoice{i}']"),
+    ("id_type", "passengers", "select[formcontrolname='idType{i}']", "//select[@formcontrolname='idType{i}']"),
+    ("id_number", "passengers", "input[placeholder='ID Number {i}']", "//input[@placeholder='ID Number {i}']"),
+    ("terms_checkbox", "passengers", "input[type='checkbox']", "//input[@type='checkbox']"),
+    ("continue_button", "passengers", ".psgn-form button.train_Search", "//button[contains(text(),'Continue')]"),
+
+    # Payment page ({method} is the payment method value, e.g. UPI)
+    ("payment_mode", "payment", "input[value='{method}']", "//input[@value='{method}']"),
+    ("upi_id", "payment", "input[placeholder='Enter UPI ID']", "//input[@placeholder='Enter UPI ID']"),
+    ("card_number", "payment", "input[placeholder='Card Number']", "//input[@placeholder='Card Number']"),
+    ("expiry_month", "payment", "select[name='expiryMonth']", "//select[@name='expiryMonth']"),
+    ("expiry_year", "payment", "select[name='expiryYear']", "//select[@name='expiryYear']"),
+    ("cvv", "payment", "input[placeholder='CVV']", "//input[@placeholder='CVV']"),
+    ("card_holder", "payment", "input[placeholder='Cardholder Name']", "//input[@placeholder='Cardholder Name']"),
+    ("pay_button", "payment", ".payment-form button.pay-btn", "//button[contains(text(),'Make Payment')]"),
+)
+
+
+def locator(name, **params):
+    """Registry entry `name` with its placeholders filled in"""
+    return LOCATORS[name].format(**params)
+
+
+class LocatorRegistry:
+    """Resolves locators against a driver and caches handles for the current page"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.current_page = None
+        self._cache = {}
+        # Strategy that last worked per locator, so a CSS miss is only paid once
+        self._strategy = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def enter_page(self, page, reload=False):
+        """Note that the browser moved to `page`; drops handles cached for another page
+
+        reload: the document was replaced (get/refresh), so even handles for the
+        same page are gone
+        """
+        if reload or page != self.current_page:
+            self._cache.clear()
+            self.current_page = page
+
+    def invalidate(self):
+        """Drop every cached handle (after a refresh or re-render)"""
+        self._cache.clear()
+
+    def resolve(self, loc):
+        """Find `loc` without the cache, preferring CSS and falling back to XPath"""
+        self.lookups += 1
+        strategies = [(By.CSS_SELECTOR, loc.css), (By.XPATH, loc.xpath)] if loc.css else [(By.XPATH, loc.xpath)]
+        if self._strategy.get(loc.name) == By.XPATH:
+            strategies.reverse()
+        error = None
+        for by, selector in strategies:
+            try:
+                element = self.driver.find_element(by, selector)
+                self._strategy[loc.name] = by
+                return element
+            except NoSuchElementException as e:
+                error = e
+        raise error
+
+    def find(self, name, **params):
+        """Cached handle for registry entry `name` (or a Locator)"""
+        loc = name if isinstance(name, Locator) else locator(name, **params)
+        element = self._cache.get(loc.name)
+        if element is not None:
+            self.hits += 1
+            return element
+        element = self.resolve(loc)
+        self._cache[loc.name] = element
+        return element
+
+    def act(self, name, action, **params):
+        """Run action(element) on a cached handle, re-resolving once if it went stale"""
+        loc = name if isinstance(name, Locator) else locator(name, **params)
+        try:
+            return action(self.find(loc))
+        except StaleElementReferenceException:
+            logger.debug(f"Handle for '{loc.name}' went stale, re-resolving")
+            self._cache.pop(loc.name, None)
+            return action(self.find(loc))
+
+    def click(self, name, **params):
+        return self.act(name, lambda element: element.click(), **params)
+
+
+def time_lookup(driver, by, selector, repeats):
+    """Mean milliseconds per find_element call, or None when it does not match"""
+    try:
+        driver.find_element(by, selector)
+    except NoSuchElementException:
+        return None
+    start = time.perf_counter()
+    for _ in range(repeats):
+        driver.find_element(by, selector)
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def benchmark_page(driver, page, repeats, results):
+    """Time CSS and XPath lookups of every locator defined for `page`"""
+    for loc in LOCATORS.values():
+        if loc.page != page:
+            continue
+        try:
+            loc = loc.format(i=1, method="UPI") if "{" in loc.xpath else loc
+        except KeyError:
+            # Needs a runtime value (typed query, station label, train number)
+            continue
+        css_ms = time_lookup(driver, By.CSS_SELECTOR, loc.css, repeats) if loc.css else None
+        xpath_ms = time_lookup(driver, By.XPATH, loc.xpath, repeats)
+        results.append((page, loc.name, css_ms, xpath_ms))
+
+
+def main():
+    import config
+    from benchmark import configure_for_standin
+    from standin_site import StandInServer
+
+    parser = argparse.ArgumentParser(description="Compare CSS and XPath lookup cost per locator on the stand-in")
+    parser.add_argument("--repeats", type=int, default=50, help="Lookups per locator and strategy")
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+
+    server = StandInServer().start()
+    configure_for_standin(server, headless=not args.show_browser)
+    config.PRESTAGE = False
+
+    from irctc_bot import IRCTCBot
+    bot = IRCTCBot()
+    results = []
+    try:
+        bot.driver.get(config.IRCTC_URL)
+        bot.locators.click("advisory_close")
+        bot.locators.click("login_link")
+        bot.ready.element("login_form", LOCATORS["username"], clickable=False)
+        benchmark_page(bot.driver, "login", args.repeats, results)
+        if not bot.login():
+            raise RuntimeError("Login on the stand-in failed")
+        benchmark_page(bot.driver, "search", args.repeats, results)
+        if not bot.search_trains():
+            raise RuntimeError("Search on the stand-in failed")
+        bot.ready.element("train_list", LOCATORS["train_list"], clickable=False)
+        benchmark_page(bot.driver, "train_list", args.repeats, results)
+        if not bot.select_train_and_book():
+            raise RuntimeError("Train selection on the stand-in failed")
+        benchmark_page(bot.driver, "passengers", args.repeats, results)
+        if not bot.fill_passenger_details():
+            raise RuntimeError("Passenger fill on the stand-in failed")
+        benchmark_page(bot.driver, "payment", args.repeats, results)
+    finally:
+        bot.close()
+        server.stop()
+
+    def fmt(ms):
+        return f"{ms:8.3f}" if ms is not None else "    miss"
+
+    print("\n" + "=" * 64)
+    print("🔎 LOCATOR LOOKUP COST (ms per find_element)")
+    print("=" * 64)
+    print(f"{'page':12} {'locator':18} {'css':>8} {'xpath':>8} {'saved':>8}")
+    for page, name, css_ms, xpath_ms in results:
+        saved = f"{xpath_ms - css_ms:8.3f}" if css_ms is not None and xpath_ms is not None else ""
+        print(f"{page:12} {name:18} {fmt(css_ms)} {fmt(xpath_ms)} {saved}")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Log Setup
+Moves log formatting and I/O off the booking path: callers only hand a
+record to a QueueHandler, and a QueueListener thread formats and writes it.
+Records carry the run id, phase (innermost open trace span) and booking
+attempt, and LOG_FORMAT = "json" writes them as one JSON object per line
+
+Usage: python log_setup.py [--calls 2000] [--gap-ms 1]   # per-call cost: synchronous handler vs queued text vs queued JSON
+"""
+
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_listener = None
+_context = None
+
+
+class LogContext(logging.Filter):
+    """Stamps run_id, phase and attempt on each record from the tracer's open spans
+
+    Runs on the logging thread, where the tracer's span stack lives; the
+    listener thread only sees the stamped values.
+    """
+
+    def __init__(self, tracer=None):
+        super().__init__()
+        self.tracer = tracer
+
+    def filter(self, record):
+        record.run_id = record.phase = record.attempt = None
+        if self.tracer is not None:
+            spans = self.tracer.open_spans()
+            record.run_id = self.tracer.run_id
+            if spans:
+                record.phase = spans[-1].name
+                for span in reversed(spans):
+                    if "attempt" in span.attributes:
+                        record.attempt = span.attributes["attempt"]
+                        break
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and the run context"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "phase": getattr(record, "phase", None),
+            "attempt": getattr(record, "attempt", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread
+
+    The stock prepare() runs the formatter and copies the record on the
+    caller's thread. Only the message arguments are resolved here, so a
+    mutable argument cannot change before the listener renders it.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class FlushableListener(logging.handlers.QueueListener):
+    """QueueListener that can signal when everything queued before a marker is written"""
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        super().handle(record)
+
+
+def make_formatter(log_format):
+    return JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def setup_logging(level=logging.INFO, log_format=None):
+    """Route the root logger through a queue and a background listener; safe to call again
+
+    Handlers already on the root logger (e.g. from a CLI's basicConfig) keep
+    their level and move behind the listener; with none, a stderr handler
+    at `level` is created.
+    """
+    global _listener, _context
+    if _listener is not None:
+        return _listener
+    if log_format is None:
+        import config
+        log_format = getattr(config, "LOG_FORMAT", "text")
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if not handlers:
+        handlers = [logging.StreamHandler()]
+        root.setLevel(level)
+    for handler in handlers:
+        root.removeHandler(handler)
+        if log_format == "json" or handler.formatter is None:
+            handler.setFormatter(make_formatter(log_format))
+
+    _context = LogContext()
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(_context)
+    root.addHandler(queue_handler)
+    _listener = FlushableListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def bind_tracer(tracer):
+    """Take run_id, phase and attempt for log records from `tracer`"""
+    if _context is not None:
+        _context.tracer = tracer
+
+
+def flush_logs(timeout=1.0):
+    """Wait until records logged so far are written, e.g. before prompting on the console"""
+    if _listener is not None:
+        written = threading.Event()
+        _listener.queue.put_nowait(written)
+        written.wait(timeout)
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def main():
+    import os
+    import time
+    import argparse
+    import tempfile
+    from tracing import Tracer
+
+    parser = argparse.ArgumentParser(description="Per-call logging cost on the calling thread")
+    parser.add_argument("--calls", type=int, default=2000, help="logger.info calls per setup")
+    parser.add_argument("--gap-ms", type=float, default=1.0,
+                        help="Idle time between calls, standing in for the driver round trips between log lines")
+    args = parser.parse_args()
+
+    tracer = Tracer()
+
+    def measure(handler, target):
+        logger = logging.getLogger(f"log_setup.benchmark.{target}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        samples, cpu = [], 0.0
+        with tracer.span("booking_attempt", attempt=1), tracer.span("fill_passenger_details"):
+            for i in range(args.calls):
+                start, start_cpu = time.perf_counter(), time.thread_time()
+                logger.info(f"Filled passenger {i % 6 + 1}: age {30 + i % 40}, berth preference LB")
+                cpu += time.thread_time() - start_cpu
+                samples.append((time.perf_counter() - start) * 1e6)
+                time.sleep(args.gap_ms / 1000)
+        logger.removeHandler(handler)
+        return sorted(samples), cpu * 1e6 / args.calls
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def file_handler(name, log_format):
+            handler = logging.FileHandler(os.path.join(tmp, name), encoding="utf-8")
+            handler.setFormatter(make_formatter(log_format))
+            return handler
+
+        rows = [("synchronous text", *measure(file_handler("sync.log", "text"), "sync"), 0.0)]
+        for label, log_format in (("queued text", "text"), ("queued JSON", "json")):
+            handler = DeferredQueueHandler(queue.SimpleQueue())
+            handler.addFilter(LogContext(tracer))
+            listener = logging.handlers.QueueListener(handler.queue, file_handler(f"{log_format}.log", log_format))
+            listener.start()
+            samples, cpu = measure(handler, log_format)
+            start = time.perf_counter()
+            listener.stop()
+            rows.append((label, samples, cpu, (time.perf_counter() - start) * 1000))
+
+    print("\n" + "=" * 70)
+    print(f"📝 LOG CALL COST on the calling thread ({args.calls} logger.info calls to a file, {args.gap_ms:g} ms apart)")
+    print("=" * 70)
+    print(f"{'setup':18} {'CPU µs':>8} {'p50 µs':>8} {'p99 µs':>8} {'max µs':>9} {'drain ms':>9}")
+    for label, samples, cpu, drain_ms in rows:
+        p50, p99 = samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{label:18} {cpu:8.2f} {p50:8.2f} {p99:8.2f} {samples[-1]:9.1f} {drain_ms:9.1f}")
+    print("=" * 70)
+    print("CPU µs: calling-thread CPU per call; p50/p99/max: wall time per call")
+    print("drain ms: time for the listener to write out what was still queued after the last call")
+
+
+if __name__ == "__main__":
+    main()
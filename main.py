@@ -15,8 +15,6 @@ IRCTC's terms of service and use this responsibly.
 """
 
 import sys
-import logging
-from irctc_bot import IRCTCBot
 import config
 
 def validate_config():
@@ -44,12 +42,19 @@ def validate_config():
         return False
     
     for i, passenger in enumerate(config.PASSENGERS):
+        if passenger.get('master') and getattr(config, 'USE_MASTER_LIST', False):
+            continue
         required_passenger_fields = ['name', 'age', 'gender', 'berth_preference', 'id_card_type', 'id_card_number']
         for field in required_passenger_fields:
             if field not in passenger or not passenger[field]:
                 print(f"❌ Configuration Error: Missing {field} for passenger {i+1}")
                 return False
     
+    for i, candidate in enumerate(getattr(config, "BOOKING_CANDIDATES", None) or []):
+        if not candidate.get("class"):
+            print(f"❌ Configuration Error: Missing class for booking candidate {i+1}")
+            return False
+    
     # Validate payment method
     if config.PAYMENT_METHOD == "UPI" and not config.UPI_ID:
         print("❌ Configuration Error: UPI_ID is required when using UPI payment")
@@ -103,7 +108,8 @@ def main():
         sys.exit(0)
     
     try:
-        # Initialize and run the bot
+        # Initialize and run the bot (selenium is only imported once the run is confirmed)
+        from irctc_bot import IRCTCBot
         bot = IRCTCBot()
         success = bot.run_booking_process()
         
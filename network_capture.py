@@ -0,0 +1,134 @@
+"""
+Network Capture
+Catches the train-list JSON response as the browser receives it, so the bot
+can choose a train and class before the list is rendered. Uses pushed
+Network events on the CDP backend, or Chrome's performance log (polled)
+over plain WebDriver
+"""
+
+import json
+import time
+import base64
+import logging
+from collections import deque
+import config
+
+logger = logging.getLogger(__name__)
+
+# Seconds between performance-log reads while waiting for the response
+LOG_POLL_INTERVAL = 0.02
+# Unread performance-log entries kept per reader
+LOG_READER_KEEP = 10000
+
+
+def decode_body(body):
+    """JSON payload of a Network.getResponseBody result, or None if it is not JSON"""
+    text = body.get("body", "")
+    if body.get("base64Encoded"):
+        text = base64.b64decode(text).decode("utf-8", "replace")
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+class CDPCapture:
+    """Train-list response from Network events pushed over the CDP backend"""
+
+    def __init__(self, cdp, pattern=None):
+        self.cdp = cdp
+        self.pattern = pattern or config.TRAIN_LIST_API
+        self.responses = cdp.subscribe("Network.responseReceived")
+        self.finished = cdp.subscribe("Network.loadingFinished")
+        cdp.send("Network.enable")
+
+    def arm(self):
+        """Forget earlier traffic; wait() returns the next matching response"""
+        self.cdp.drain(self.responses)
+        self.cdp.drain(self.finished)
+
+    def wait(self, timeout):
+        """Decoded JSON of the next train-list response, or None after `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        request_id = None
+        while request_id is None:
+            params = self.cdp.next_event(self.responses, max(0, deadline - time.monotonic()))
+            if params is None:
+                return None
+            if self.pattern in params.get("response", {}).get("url", ""):
+                request_id = params["requestId"]
+        # The body can only be read once the response has finished loading
+        while True:
+            params = self.cdp.next_event(self.finished, max(0, deadline - time.monotonic()))
+            if params is None:
+                return None
+            if params.get("requestId") == request_id:
+                return decode_body(self.cdp.send("Network.getResponseBody", requestId=request_id))
+
+
+class PerformanceLog:
+    """Chrome's performance log shared by every reader
+
+    get_log empties the log, so all reads go through one instance that hands
+    each entry to every reader's buffer; readers only ever see their own.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.buffers = []
+
+    def reader(self):
+        """A new reader's buffer, filled from the next read on"""
+        buffer = deque(maxlen=LOG_READER_KEEP)
+        self.buffers.append(buffer)
+        return buffer
+
+    def read(self, buffer):
+        """Fetch new entries from the browser and return everything pending for this reader"""
+        entries = self.driver.get_log("performance")
+        for pending in self.buffers:
+            pending.extend(entries)
+        unread = list(buffer)
+        buffer.clear()
+        return unread
+
+
+class PerformanceLogCapture:
+    """Train-list response from Chrome's performance log (needs goog:loggingPrefs performance)"""
+
+    def __init__(self, driver, pattern=None, log=None):
+        self.driver = driver
+        self.pattern = pattern or config.TRAIN_LIST_API
+        # Shared with other readers (e.g. a SessionRecorder) so none of them loses entries
+        self.log = log or PerformanceLog(driver)
+        self.pending = self.log.reader()
+
+    def _read_log(self):
+        return self.log.read(self.pending)
+
+    def arm(self):
+        self._read_log()
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        request_id, finished = None, set()
+        while time.monotonic() < deadline:
+            for entry in self._read_log():
+                message = json.loads(entry["message"]).get("message", {})
+                method, params = message.get("method"), message.get("params", {})
+                if (method == "Network.responseReceived" and request_id is None
+                        and self.pattern in params.get("response", {}).get("url", "")):
+                    request_id = params["requestId"]
+                elif method == "Network.loadingFinished":
+                    finished.add(params.get("requestId"))
+            if request_id is not None and request_id in finished:
+                return decode_body(self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id}))
+            time.sleep(LOG_POLL_INTERVAL)
+        return None
+
+
+def start_capture(driver, cdp=None, log=None):
+    """Pushed CDP events when the CDP backend is connected, else the (shared) performance log"""
+    if cdp:
+        return CDPCapture(cdp)
+    return PerformanceLogCapture(driver, log=log)
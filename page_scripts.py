@@ -0,0 +1,169 @@
+"""
+Page Scripts
+JavaScript run in the page through execute_script, so a whole form can be
+written or read back in one WebDriver round trip
+"""
+
+# Shared helpers: CSS-first lookup with XPath fallback, and value writes that Angular's value accessors
+# see (native setter + input/change/blur events, as a real keystroke would fire)
+HELPERS = """
+function byXPath(xpath) {
+  return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function locate(f) {
+  return (f.css && document.querySelector(f.css)) || byXPath(f.xpath);
+}
+function fire(el, type) {
+  el.dispatchEvent(new Event(type, {bubbles: true}));
+}
+function setValue(el, value) {
+  var proto = el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+            : el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : HTMLInputElement.prototype;
+  el.focus();
+  Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+  fire(el, 'input');
+  fire(el, 'change');
+  el.blur();
+  fire(el, 'blur');
+}
+function optionByText(select, text) {
+  for (var i = 0; i < select.options.length; i++) {
+    if (select.options[i].text.trim() === text.trim()) { return select.options[i]; }
+  }
+  return null;
+}
+function readField(f) {
+  var el = locate(f);
+  if (!el) { return null; }
+  if (f.kind === 'check' || f.kind === 'click') { return el.checked; }
+  if (f.kind === 'select_text') {
+    var opt = el.options[el.selectedIndex];
+    return opt ? opt.text.trim() : '';
+  }
+  return el.value;
+}
+function matchesField(f, actual) {
+  if (f.kind === 'check') { return actual === Boolean(f.value); }
+  if (f.kind === 'click') { return actual === true; }
+  if (f.kind === 'present') { return actual !== null && actual !== undefined && String(actual).trim() !== ''; }
+  return actual !== null && actual !== undefined && String(actual).trim() === String(f.value).trim();
+}
+"""
+
+# arguments[0]: list of {name, css, xpath, kind, value}; writes only the fields whose current value
+# differs (a re-render or partial failure keeps the rest) and returns {changed, failed} field names
+APPLY_FIELDS = HELPERS + """
+var fields = arguments[0], failed = [], changed = [];
+for (var i = 0; i < fields.length; i++) {
+  var f = fields[i], el = locate(f);
+  if (!el) { failed.push(f.name); continue; }
+  if (matchesField(f, readField(f))) { continue; }
+  if (f.kind === 'present') { failed.push(f.name); continue; }
+  changed.push(f.name);
+  if (f.kind === 'text' || f.kind === 'type') {
+    setValue(el, f.value);
+  } else if (f.kind === 'select_value') {
+    if (!el.querySelector('option[value="' + CSS.escape(f.value) + '"]')) { failed.push(f.name); continue; }
+    setValue(el, f.value);
+  } else if (f.kind === 'select_text') {
+    var opt = optionByText(el, f.value);
+    if (!opt) { failed.push(f.name); continue; }
+    setValue(el, opt.value);
+  } else if (f.kind === 'check') {
+    if (el.checked !== Boolean(f.value)) { el.click(); }
+  } else if (f.kind === 'click') {
+    el.click();
+  }
+}
+return {changed: changed, failed: failed};
+"""
+
+# arguments[0]: list of {name, css, xpath, kind, value}; returns current values in the same order
+READ_FIELDS = HELPERS + """
+return arguments[0].map(readField);
+"""
+
+# Async (execute_async_script). arguments[0]: {css, xpath} of a station input, arguments[1]: suggestion
+# label ("NEW DELHI - NDLS"), arguments[2]: ms the control must stay quiet, then the callback.
+# Writes the label only if it differs, then lets the (debounced, asynchronous) autocomplete settle and
+# calls back whether the control still holds the label with no suggestion list open
+SET_STATION = HELPERS + """
+var el = locate(arguments[0]), label = arguments[1], settleMs = arguments[2];
+var done = arguments[arguments.length - 1];
+if (!el) { done(false); return; }
+if (el.value !== label) { setValue(el, label); }
+var box = el.parentElement, observer = null, quiet = null, poll = null, cap = null;
+function accepted() { return el.value === label && !(box && box.querySelector('li')); }
+function finish() {
+  if (observer) { observer.disconnect(); }
+  clearTimeout(quiet);
+  clearTimeout(cap);
+  clearInterval(poll);
+  done(accepted());
+}
+function settle() {
+  clearTimeout(quiet);
+  quiet = setTimeout(finish, settleMs);
+}
+if (box) {
+  observer = new MutationObserver(settle);
+  observer.observe(box, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+// Value rewrites do not mutate the DOM: poll for them and give up at once
+poll = setInterval(function () { if (el.value !== label) { finish(); } }, 50);
+cap = setTimeout(finish, settleMs * 5);
+settle();
+"""
+
+# arguments[0]: search button, arguments[1]: From input ({css, xpath})
+# Marks the current train list stale so only the next one counts; returns False when the
+# filled search form is gone (nothing to re-search in place). A site that swaps the list element
+# drops the marker with it; one that updates the list in place clears it here once new rows arrive
+MARK_TRAIN_LIST_STALE = HELPERS + """
+var button = locate(arguments[0]), origin = locate(arguments[1]);
+if (!button || !origin || !origin.value) { return false; }
+var lists = document.querySelectorAll('div.train-list');
+Array.prototype.forEach.call(lists, function (list) {
+  list.setAttribute('data-stale', '1');
+  var observer = new MutationObserver(function (mutations) {
+    var added = mutations.some(function (m) { return m.type === 'childList' && m.addedNodes.length; });
+    if (added && list.querySelector('div.row')) {
+      observer.disconnect();
+      list.removeAttribute('data-stale');
+    }
+  });
+  observer.observe(list, {childList: true, subtree: true});
+});
+return true;
+"""
+
+# Returns every row of the train list with per-class availability and its BOOK NOW button
+EXTRACT_TRAINS = """
+var rows = document.querySelectorAll('div.train-list:not([data-stale]) div.row');
+return Array.prototype.map.call(rows, function (row, index) {
+  var number = row.querySelector('.train-number');
+  var name = row.querySelector('.train-name');
+  var cells = Array.prototype.map.call(row.querySelectorAll('td'), function (td) {
+    var button = null;
+    var buttons = td.querySelectorAll('button');
+    for (var i = 0; i < buttons.length; i++) {
+      if (buttons[i].textContent.indexOf('BOOK NOW') >= 0) { button = buttons[i]; break; }
+    }
+    var status = td.querySelector('.avl-status');
+    return {
+      code: td.getAttribute('data-class') || td.className.split(/\\s+/)[0],
+      class_attr: td.className,
+      status: (status || td).textContent.replace('BOOK NOW', '').trim(),
+      bookable: !!button && !button.disabled,
+      button: button
+    };
+  });
+  return {
+    index: index,
+    number: number ? number.textContent.trim() : '',
+    name: name ? name.textContent.trim() : '',
+    cells: cells
+  };
+});
+"""
@@ -0,0 +1,157 @@
+"""
+Booking Payloads
+Compiles the journey, passenger and payment details from config into ordered
+lists of form fields ahead of time, so nothing is left to compute once the
+Tatkal window opens
+"""
+
+from collections import namedtuple
+from locators import locator
+from station_lookup import get_station_index
+import config
+
+# kind is one of:
+#   "text"          clear the input, then type the value
+#   "type"          type the value without clearing first
+#   "select_value"  pick the <option> with this value
+#   "select_text"   pick the <option> with this visible text
+#   "check"         make sure a checkbox is ticked (value True) or not (False)
+#   "click"         click the element (radio buttons)
+#   "present"       nothing to write, the control must already hold a value (row filled from the master list)
+# locator is a locators.Locator (CSS selector with XPath fallback)
+Field = namedtuple("Field", ["name", "locator", "kind", "value"])
+
+# From/To autocomplete entry: code and label ("NEW DELHI - NDLS") are None when
+# the configured station is not in the station index
+StationChoice = namedtuple("StationChoice", ["name", "query", "code", "label"])
+
+# Passenger row (1-based) to fill by picking `name` from the user's IRCTC master passenger list;
+# locator is the row's name input
+MasterChoice = namedtuple("MasterChoice", ["row", "name", "locator"])
+
+BookingPayload = namedtuple("BookingPayload", ["stations", "search", "passengers", "payment", "masters"])
+
+# Details a master-list passenger may leave to the list but that must end up filled
+MASTER_REQUIRED = ("age", "gender")
+
+
+def station_choice(name, query):
+    """Resolve a configured station code or name to the suggestion label the site shows"""
+    station = get_station_index().lookup_exact(query)
+    if station is None:
+        return StationChoice(name, query, None, None)
+    return StationChoice(name, query, station.code, f"{station.name} - {station.code}")
+
+
+def station_choices():
+    return [station_choice("from_station", config.FROM_STATION), station_choice("to_station", config.TO_STATION)]
+
+
+def search_fields():
+    """Search form fields other than the From/To autocompletes"""
+    fields = [
+        Field("journey_date", locator("journey_date"), "text", config.JOURNEY_DATE),
+        Field("journey_class", locator("journey_class"), "select_value", config.JOURNEY_CLASS),
+    ]
+    if config.JOURNEY_QUOTA:
+        fields.append(Field("journey_quota", locator("journey_quota"), "select_value",
+                            config.JOURNEY_QUOTA))
+    return fields
+
+
+def passenger_fields(passengers=None):
+    """Fields of the passenger page, in on-screen order, for each passenger
+
+    A passenger with a "master" entry is named after it, and required details
+    it leaves to the master list only have to be present on the page.
+    """
+    passengers = config.PASSENGERS if passengers is None else passengers
+    fields = []
+    for i, passenger in enumerate(passengers, start=1):
+        candidates = [
+            Field(f"passenger{i}.name", locator("passenger_name", i=i), "text",
+                  passenger.get("name") or passenger.get("master")),
+            Field(f"passenger{i}.age", locator("passenger_age", i=i), "text", passenger.get("age")),
+            Field(f"passenger{i}.gender", locator("passenger_gender", i=i), "select_value",
+                  passenger.get("gender")),
+            Field(f"passenger{i}.berth", locator("berth_choice", i=i), "select_value",
+                  passenger.get("berth_preference")),
+            Field(f"passenger{i}.food", locator("food_choice", i=i), "select_value",
+                  passenger.get("food_choice")),
+            Field(f"passenger{i}.id_type", locator("id_type", i=i), "select_text",
+                  passenger.get("id_card_type")),
+            Field(f"passenger{i}.id_number", locator("id_number", i=i), "text",
+                  passenger.get("id_card_number")),
+        ]
+        fields.extend(f._replace(value=str(f.value)) for f in candidates if f.value not in (None, ""))
+        if passenger.get("master"):
+            fields.extend(f._replace(kind="present", value=None) for f in candidates
+                          if f.value in (None, "") and f.name.split(".")[1] in MASTER_REQUIRED)
+    return fields
+
+
+def master_choices(passengers=None):
+    """Passenger rows to pick from the master list, for passengers with a "master" entry"""
+    passengers = config.PASSENGERS if passengers is None else passengers
+    return [MasterChoice(i, passenger["master"], locator("passenger_name", i=i))
+            for i, passenger in enumerate(passengers, start=1) if passenger.get("master")]
+
+
+def passenger_page_fields(passengers=None):
+    """Everything filled on the passenger page: every passenger plus the terms checkbox"""
+    return passenger_fields(passengers) + [Field("terms_accepted", locator("terms_checkbox"), "check", True)]
+
+
+def payment_fields(method=None):
+    """Fields of the payment page for the configured payment method"""
+    method = method or config.PAYMENT_METHOD
+    if method == "UPI":
+        return [
+            Field("payment_mode", locator("payment_mode", method="UPI"), "click", None),
+            Field("upi_id", locator("upi_id"), "type", config.UPI_ID),
+        ]
+    if method == "DEBIT_CARD":
+        return [
+            Field("payment_mode", locator("payment_mode", method="DEBIT_CARD"), "click", None),
+            Field("card_number", locator("card_number"), "type", config.CARD_NUMBER),
+            Field("expiry_month", locator("expiry_month"), "select_value", config.CARD_EXPIRY_MONTH),
+            Field("expiry_year", locator("expiry_year"), "select_value", config.CARD_EXPIRY_YEAR),
+            Field("cvv", locator("cvv"), "type", config.CARD_CVV),
+            Field("card_holder", locator("card_holder"), "type", config.CARD_HOLDER_NAME),
+        ]
+    return []
+
+
+def build_booking_payload():
+    """Compile every form field the booking will need"""
+    return BookingPayload(station_choices(), search_fields(), passenger_page_fields(), payment_fields(),
+                          master_choices())
+
+
+def field_matches(field, actual):
+    """Whether a value read back from the page satisfies a field"""
+    if field.kind in ("check", "click"):
+        return actual is (field.value if field.kind == "check" else True)
+    if actual is None:
+        return False
+    if field.kind == "present":
+        return str(actual).strip() != ""
+    return str(actual).strip() == str(field.value).strip()
+
+
+def changed_fields(fields, values):
+    """Fields whose value read back from the page (same order, None if unknown) does not satisfy them yet"""
+    values = list(values or [])
+    values += [None] * (len(fields) - len(values))
+    return [field for field, actual in zip(fields, values) if not field_matches(field, actual)]
+
+
+def master_script_args(masters):
+    """Master-list choices as plain dicts for page_scripts.SELECT_MASTER_PASSENGERS"""
+    return [{"name": master.name, "css": master.locator.css, "xpath": master.locator.xpath} for master in masters]
+
+
+def to_script_args(fields):
+    """Fields as plain dicts for page_scripts.APPLY_FIELDS / READ_FIELDS"""
+    return [{"name": field.name, "css": field.locator.css, "xpath": field.locator.xpath,
+             "kind": field.kind, "value": field.value} for field in fields]
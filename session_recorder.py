@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Session Record and Replay
+Records what the bot saw in each booking phase - the DOM at the end of the
+phase and every network response with its timing - into one compact zip
+archive (bodies stored once, deflated). The replay server serves an archive
+back with each response's original latency, so a past Tatkal morning can be
+rerun locally against different bot versions
+
+Usage: python session_recorder.py show recordings/20250101-095958.zip     # phases and responses with timing
+       python session_recorder.py replay recordings/20250101-095958.zip [--port 8000] [--speed 1.0]
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import zipfile
+import argparse
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException
+from network_capture import PerformanceLog
+from snapshots import SNAPSHOT_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+
+# Spans recorded as phases (a phase nested in another one is part of the outer one)
+RECORDED_PHASES = {
+    "login", "prestage_booking", "search_trains", "submit_search", "select_train_and_book",
+    "fill_passenger_details", "make_payment", "retry_search",
+}
+
+NETWORK_EVENTS = ("Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFinished")
+
+
+class SessionRecorder:
+    """Collects per-phase DOM and network responses of one browser session and saves them as a zip
+
+    Network events come from subscribed CDP queues when the CDP backend is
+    connected, else from Chrome's performance log through `log`, a
+    network_capture.PerformanceLog shared with the train-list capture.
+    """
+
+    def __init__(self, directory, driver, scripts, tracer, cdp=None, start_url=None, log=None):
+        self.path = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + ".zip")
+        self.driver = driver
+        self.scripts = scripts
+        self.tracer = tracer
+        self.cdp = cdp
+        self.start_url = start_url
+        self.t0 = time.time()
+        self.requests = {}
+        self.unfetched = []
+        self.responses = []
+        self.bodies = {}
+        self.phases = []
+        self.queues = None
+        self.log = self.pending = None
+        if cdp:
+            self.queues = {method: cdp.subscribe(method) for method in NETWORK_EVENTS}
+            cdp.send("Network.enable")
+        else:
+            self.log = log or PerformanceLog(driver)
+            self.pending = self.log.reader()
+
+    def feed(self, entries):
+        """Take performance-log entries"""
+        for entry in entries:
+            message = json.loads(entry["message"]).get("message", {})
+            if message.get("method") in NETWORK_EVENTS:
+                self._event(message["method"], message.get("params", {}))
+
+    def _event(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params.get("request", {})
+            self.requests[request_id] = {
+                "t": round(params.get("wallTime", time.time()) - self.t0, 4),
+                "sent": params.get("timestamp"),
+                "method": request.get("method", "GET"),
+                "url": request.get("url", ""),
+                "post_data": request.get("postData"),
+                "type": params.get("type"),
+            }
+        elif request_id in self.requests:
+            record = self.requests[request_id]
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                headers = {name.lower(): value for name, value in response.get("headers", {}).items()}
+                record["status"] = response.get("status", 200)
+                record["content_type"] = headers.get("content-type") or response.get("mimeType")
+            elif "status" in record and params.get("timestamp") and record.get("sent"):
+                record["latency_ms"] = round((params["timestamp"] - record.pop("sent")) * 1000, 1)
+                self.unfetched.append(request_id)
+
+    def _poll(self):
+        if self.queues:
+            for method, queue in self.queues.items():
+                for params in self.cdp.drain(queue):
+                    self._event(method, params)
+        else:
+            self.feed(self.log.read(self.pending))
+
+    def _response_body(self, request_id):
+        try:
+            if self.cdp:
+                body = self.cdp.send("Network.getResponseBody", requestId=request_id)
+            else:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException as e:
+            logger.debug(f"Response body unavailable: {str(e)}")
+            return None
+        data = body.get("body", "")
+        return base64.b64decode(data) if body.get("base64Encoded") else data.encode("utf-8")
+
+    def _collect(self, phase):
+        """Move finished requests into the archive, reading their bodies while the browser still has them"""
+        self._poll()
+        for request_id in self.unfetched:
+            record = self.requests.pop(request_id, None)
+            if record is None:
+                continue
+            body = self._response_body(request_id)
+            if body is not None:
+                digest = hashlib.sha1(body).hexdigest()
+                self.bodies.setdefault(digest, body)
+                record["body"] = f"bodies/{digest}"
+            record["phase"] = phase
+            self.responses.append(record)
+        self.unfetched = []
+
+    def on_span(self, span):
+        """Tracer listener: record a phase when its span finishes"""
+        if span.name not in RECORDED_PHASES or any(open_span.name in RECORDED_PHASES
+                                                   for open_span in self.tracer.open_spans()):
+            return
+        try:
+            with self.tracer.span("record_phase", phase=span.name):
+                self._collect(span.name)
+                dom = url = title = None
+                try:
+                    dom, url, title = self.scripts.execute_script(SNAPSHOT_SCRIPT)
+                except (WebDriverException, TypeError, ValueError) as e:
+                    logger.debug(f"Phase DOM unavailable: {str(e)}")
+                self.phases.append({
+                    "name": span.name, "start": round(span.start - self.t0, 4), "end": round(span.end - self.t0, 4),
+                    "outcome": span.outcome, "run_id": span.run_id, "url": url, "title": title,
+                    "dom": f"dom/{len(self.phases) + 1:03d}_{span.name}.html" if dom is not None else None,
+                    "_html": dom,
+                })
+        except Exception as e:
+            logger.warning(f"Recording phase '{span.name}' failed: {str(e)}")
+
+    def save(self):
+        """Write the archive; returns its path, or None if nothing was recorded or the write failed"""
+        try:
+            self._collect(None)
+        except Exception as e:
+            logger.debug(f"Final network read failed: {str(e)}")
+        if not self.phases and not self.responses:
+            return None
+        phases = [{key: value for key, value in phase.items() if key != "_html"} for phase in self.phases]
+        manifest = {
+            "version": ARCHIVE_VERSION,
+            "recorded": datetime.fromtimestamp(self.t0).isoformat(timespec="seconds"),
+            "start_url": self.start_url,
+            "phases": phases,
+            "responses": self.responses,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+                archive.writestr("manifest.json", json.dumps(manifest, indent=1))
+                for phase in self.phases:
+                    if phase["dom"]:
+                        archive.writestr(phase["dom"], phase["_html"])
+                for digest, body in self.bodies.items():
+                    archive.writestr(f"bodies/{digest}", body)
+        except OSError as e:
+            logger.error(f"Saving session recording to {self.path} failed: {str(e)}")
+            return None
+        logger.info(f"Session recorded to {self.path}: {len(self.phases)} phases, "
+                    f"{len(self.responses)} responses, {os.path.getsize(self.path) / 1024:.0f} KB")
+        return self.path
+
+
+def load_archive(path):
+    """Manifest and {archive name: bytes} of a recording"""
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        files = {name: archive.read(name) for name in archive.namelist() if name != "manifest.json"}
+    if manifest.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"{path}: unsupported recording version {manifest.get('version')}")
+    return manifest, files
+
+
+def request_key(method, url):
+    parsed = urlparse(url)
+    return method, parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+
+class ReplayServer:
+    """Serves a recorded session, each response after its recorded latency / `speed`
+
+    A request gets the first not yet served response recorded for its method
+    and path with query, else for its path alone (the replayed journey may
+    differ); once all are served the last one repeats.
+    """
+
+    def __init__(self, archive_path, host="127.0.0.1", port=0, speed=1.0):
+        self.manifest, self.files = load_archive(archive_path)
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.served = 0
+        self.misses = []
+        self.by_key, self.by_path = {}, {}
+        for response in self.manifest["responses"]:
+            method, path = request_key(response["method"], response["url"])
+            self.by_key.setdefault((method, path), []).append(response)
+            self.by_path.setdefault((method, path.split("?")[0]), []).append(response)
+        self._served_ids = set()
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL of the recorded start page, usable as config.IRCTC_URL"""
+        path = urlparse(self.manifest.get("start_url") or "/").path or "/"
+        return f"http://{self.host}:{self.port}{path}"
+
+    def start(self):
+        handler = type("BoundReplayHandler", (ReplayHandler,), {"replay": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def next_response(self, method, path):
+        """Next recorded response for a request (the last one repeats), or None"""
+        responses = self.by_key.get((method, path)) or self.by_path.get((method, path.split("?")[0]))
+        with self._lock:
+            if not responses:
+                self.misses.append(f"{method} {path}")
+                return None
+            self.served += 1
+            for response in responses:
+                if id(response) not in self._served_ids:
+                    self._served_ids.add(id(response))
+                    return response
+            return responses[-1]
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Request handler; `replay` is bound to the owning ReplayServer"""
+
+    replay = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _replay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path.startswith("/__replay__/"):
+            self._send_recording(self.path[len("/__replay__/"):])
+            return
+        method = "GET" if self.command == "HEAD" else self.command
+        response = self.replay.next_response(method, self.path)
+        if response is None:
+            self._send(404, b'{"error": "not in recording"}', "application/json")
+            return
+        time.sleep(response.get("latency_ms", 0) / 1000 / self.replay.speed)
+        body = self.replay.files.get(response.get("body"), b"")
+        self._send(response.get("status", 200), body, response.get("content_type"))
+
+    def _send_recording(self, name):
+        """Recording itself: /__replay__/manifest.json and the phase DOMs under /__replay__/dom/"""
+        if name == "manifest.json":
+            self._send(200, json.dumps(self.replay.manifest, indent=1).encode("utf-8"), "application/json")
+        elif name.startswith("dom/") and name in self.replay.files:
+            self._send(200, self.replay.files[name], "text/plain; charset=utf-8")
+        else:
+            self._send(404, b'{"error": "not found"}', "application/json")
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_DELETE = _replay
+
+
+def show(path):
+    manifest, files = load_archive(path)
+    print(f"\n🎞️  Recording {path} ({manifest['recorded']}, start {manifest['start_url']})")
+    by_phase = {}
+    for response in manifest["responses"]:
+        by_phase.setdefault(response.get("phase"), []).append(response)
+    for phase in manifest["phases"] + [{"name": None}]:
+        responses = by_phase.get(phase["name"], [])
+        if phase["name"] is None and not responses:
+            break
+        if phase["name"]:
+            marker = "✅" if phase["outcome"] == "ok" else "❌"
+            print(f"{marker} {phase['name']:24} {phase['start']:9.3f}s -> {phase['end']:9.3f}s  {phase['url'] or ''}")
+        else:
+            print("   (after the last phase)")
+        for response in responses:
+            size = len(files.get(response.get("body"), b""))
+            print(f"     {response['t']:9.3f}s {response.get('latency_ms', 0):8.1f} ms {response.get('status', ''):>4} "
+                  f"{response['method']:5} {size / 1024:8.1f} KB  {request_key(response['method'], response['url'])[1]}")
+    print(f"\n{len(manifest['phases'])} phases, {len(manifest['responses'])} responses, "
+          f"{len([name for name in files if name.startswith('bodies/')])} distinct bodies, "
+          f"{os.path.getsize(path) / 1024:.0f} KB on disk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay a recorded booking session")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show_parser = commands.add_parser("show", help="List phases and responses with timing")
+    show_parser.add_argument("archive")
+    replay_parser = commands.add_parser("replay", help="Serve the recording with its original latencies")
+    replay_parser.add_argument("archive")
+    replay_parser.add_argument("--port", type=int, default=8000)
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Latency divisor (2 = twice as fast)")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        show(args.archive)
+        return
+
+    server = ReplayServer(args.archive, port=args.port, speed=args.speed).start()
+    print(f"🎞️  Replaying {args.archive} at {server.url}")
+    print("Set IRCTC_URL in config.py to this address (or run benchmark.py --replay). Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"Served {server.served} recorded responses, {len(server.misses)} requests not in the recording")
+
+
+if __name__ == "__main__":
+    main()
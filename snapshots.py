@@ -0,0 +1,124 @@
+"""
+Failure Snapshots
+Screenshot, DOM and URL of the page at a failed step or retry. The booking
+thread only fetches the raw data (one screenshot call, one script); decoding,
+gzip and disk writes run on a background writer behind a bounded queue that
+drops the oldest pending snapshot when full, and only the newest SNAPSHOT_KEEP
+snapshots are kept on disk
+"""
+
+import os
+import gzip
+import json
+import time
+import base64
+import shutil
+import logging
+import threading
+from collections import deque, namedtuple
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# DOM, URL and title in one round trip
+SNAPSHOT_SCRIPT = "return [document.documentElement.outerHTML, location.href, document.title];"
+
+# screenshot: base64 PNG exactly as the driver returned it (decoded on the writer thread)
+Snapshot = namedtuple("Snapshot", ["step", "taken", "run_id", "attempt", "reason", "url", "title", "dom", "screenshot"])
+
+
+def capture(driver, scripts, step, run_id=None, attempt=None, reason=None):
+    """Take a snapshot on the calling thread; parts the browser cannot provide are left None"""
+    screenshot = dom = url = title = None
+    try:
+        screenshot = driver.get_screenshot_as_base64()
+    except WebDriverException as e:
+        logger.debug(f"Snapshot screenshot unavailable: {str(e)}")
+    try:
+        dom, url, title = scripts.execute_script(SNAPSHOT_SCRIPT)
+    except (JavascriptException, WebDriverException, TypeError, ValueError) as e:
+        logger.debug(f"Snapshot DOM unavailable: {str(e)}")
+    return Snapshot(step, time.time(), run_id, attempt, reason, url, title, dom, screenshot)
+
+
+class SnapshotWriter:
+    """Writes snapshots under `directory`, on a background thread unless `background` is False"""
+
+    def __init__(self, directory, queue_size=4, keep=50, background=True):
+        self.directory = directory
+        self.queue_size = queue_size
+        self.keep = keep
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.written = 0
+        self.dropped = 0
+        self.closing = False
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self._write_loop, name="snapshot-writer", daemon=True)
+            self.thread.start()
+
+    def submit(self, snapshot):
+        """Queue a snapshot for writing; never blocks on disk"""
+        if self.thread is None:
+            self.write(snapshot)
+            return
+        with self.condition:
+            if len(self.pending) >= self.queue_size:
+                evicted = self.pending.popleft()
+                self.dropped += 1
+                logger.warning(f"Snapshot queue full, dropped the '{evicted.step}' snapshot")
+            self.pending.append(snapshot)
+            self.condition.notify()
+
+    def _write_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closing:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                snapshot = self.pending.popleft()
+            self.write(snapshot)
+
+    def write(self, snapshot):
+        """Write one snapshot directory and prune old ones; returns its path or None"""
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(snapshot.taken)) + f".{int(snapshot.taken * 1000) % 1000:03d}"
+        path = os.path.join(self.directory, f"{stamp}_{snapshot.step}")
+        try:
+            os.makedirs(path, exist_ok=True)
+            if snapshot.screenshot:
+                with open(os.path.join(path, "screenshot.png"), "wb") as f:
+                    f.write(base64.b64decode(snapshot.screenshot))
+            if snapshot.dom is not None:
+                with gzip.open(os.path.join(path, "dom.html.gz"), "wt", encoding="utf-8", compresslevel=6) as f:
+                    f.write(snapshot.dom)
+            meta = {field: getattr(snapshot, field) for field in ("step", "taken", "run_id", "attempt", "reason", "url", "title")}
+            with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+            self.written += 1
+            self._prune()
+            logger.info(f"Saved '{snapshot.step}' snapshot to {path}")
+            return path
+        except (OSError, ValueError) as e:
+            logger.error(f"Writing snapshot to {path} failed: {str(e)}")
+            return None
+
+    def _prune(self):
+        """Delete the oldest snapshot directories beyond `keep` (names sort by time)"""
+        entries = sorted(entry for entry in os.listdir(self.directory)
+                         if os.path.isdir(os.path.join(self.directory, entry)))
+        for entry in entries[:max(0, len(entries) - self.keep)]:
+            shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def close(self, timeout=10):
+        """Write out queued snapshots and stop the writer thread"""
+        if self.thread is None:
+            return
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        self.thread.join(timeout)
+        self.thread = None
+        if self.dropped:
+            logger.warning(f"{self.dropped} snapshots dropped because the write queue was full")
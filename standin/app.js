@@ -0,0 +1,483 @@
+/*
+ * Local IRCTC stand-in single-page app.
+ *
+ * Mirrors the markup and selectors irctc_bot.py relies on and keeps form
+ * state in a model that only updates on input/change events, the same way
+ * the Angular reactive forms on the real site do.
+ */
+(function () {
+  'use strict';
+
+  var settings = window.STANDIN_SETTINGS || {};
+  var MAX_PASSENGERS = settings.maxPassengers || 6;
+  // Passenger-name autocomplete debounce, like the real site's (PrimeNG's default delay)
+  var AUTOCOMPLETE_DELAY_MS = settings.autocompleteDelayMs !== undefined ? settings.autocompleteDelayMs : 300;
+  var LABEL_RE = /^(.+) - ([A-Z0-9]+)$/;
+
+  var CLASSES = [['', 'All Classes'], ['1A', 'AC First Class (1A)'], ['EC', 'Exec. Chair Car (EC)'],
+    ['2A', 'AC 2 Tier (2A)'], ['3A', 'AC 3 Tier (3A)'], ['3E', 'AC 3 Economy (3E)'],
+    ['CC', 'AC Chair car (CC)'], ['SL', 'Sleeper (SL)'], ['2S', 'Second Sitting (2S)']];
+  var QUOTAS = [['GN', 'GENERAL'], ['TQ', 'TATKAL'], ['PT', 'PREMIUM TATKAL'], ['LD', 'LADIES'],
+    ['SS', 'LOWER BERTH/SR.CITIZEN']];
+  var GENDERS = [['', 'Gender'], ['M', 'Male'], ['F', 'Female'], ['T', 'Transgender']];
+  var BERTHS = [['', 'Berth Preference'], ['NP', 'No Preference'], ['LB', 'Lower'], ['MB', 'Middle'],
+    ['UB', 'Upper'], ['SL', 'Side Lower'], ['SU', 'Side Upper']];
+  var FOODS = [['', 'Catering Service Option'], ['V', 'Veg'], ['N', 'Non Veg'], ['D', 'No Food']];
+  var ID_TYPES = [['', 'Select ID Type'], ['AADHAR', 'Aadhar'], ['PAN', 'PAN Card'], ['PASSPORT', 'Passport'],
+    ['VOTER', 'Voter ID'], ['DL', 'Driving License']];
+
+  var state = {
+    loggedIn: false,
+    user: null,
+    view: 'search',
+    search: { origin: null, destination: null, journeyDate: '', journeyClass: '', journeyQuota: 'GN' },
+    searchGeneration: 0,
+    trains: [],
+    selected: null,
+    passengers: [],
+    masterPassengers: [],
+    terms: false,
+    payment: {}
+  };
+
+  var app = document.getElementById('app');
+  var overlay = document.getElementById('overlay');
+  var headerMenu = document.getElementById('headerMenu');
+
+  function esc(value) {
+    return String(value).replace(/[&<>"']/g, function (c) {
+      return { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[c];
+    });
+  }
+
+  function options(pairs, selected) {
+    return pairs.map(function (p) {
+      return '<option value="' + esc(p[0]) + '"' + (p[0] === selected ? ' selected' : '') + '>' + esc(p[1]) + '</option>';
+    }).join('');
+  }
+
+  function api(method, path, body) {
+    var init = { method: method, headers: { 'Content-Type': 'application/json' } };
+    if (body !== undefined) {
+      init.body = JSON.stringify(body);
+    }
+    return fetch(path, init).then(function (resp) {
+      return resp.json().then(function (data) {
+        if (!resp.ok) {
+          throw new Error(data.error || ('HTTP ' + resp.status));
+        }
+        return data;
+      });
+    });
+  }
+
+  function later(fn) {
+    var delay = settings.renderDelayMs || 0;
+    if (delay > 0) {
+      setTimeout(fn, delay);
+    } else {
+      fn();
+    }
+  }
+
+  function navigate(path, view) {
+    state.view = view;
+    history.pushState({ view: view }, '', path);
+  }
+
+  /* ---------------------------------------------------------------- header */
+
+  function renderHeader() {
+    if (state.loggedIn) {
+      headerMenu.innerHTML = '<span class="user-greeting">Hi ' + esc(state.user) + '</span> ' +
+        '<a class="search_btn logoutText" id="logoutLink">LOGOUT</a>';
+      document.getElementById('logoutLink').onclick = function () {
+        state.loggedIn = false;
+        state.user = null;
+        renderHeader();
+      };
+    } else {
+      headerMenu.innerHTML = '<a class="search_btn loginText" id="loginLink">LOGIN</a>';
+      document.getElementById('loginLink').onclick = showLogin;
+    }
+  }
+
+  function showAdvisory() {
+    overlay.innerHTML = '<div class="modal-backdrop advisory"><div class="modal-body">' +
+      '<p>Advisory: Tatkal booking opens at 10:00 for AC and 11:00 for non-AC classes.</p>' +
+      '<a class="modalClose" id="advisoryClose">&times;</a></div></div>';
+    document.getElementById('advisoryClose').onclick = function () {
+      overlay.innerHTML = '';
+    };
+  }
+
+  function showLogin() {
+    var model = { userid: '', password: '', captcha: '' };
+    overlay.innerHTML = '<div class="modal-backdrop"><div class="modal-body login-modal">' +
+      '<input type="text" formcontrolname="userid" id="userid" placeholder="User Name">' +
+      '<input type="password" formcontrolname="password" id="password" placeholder="Password">' +
+      '<div class="captcha-img">X7K2P</div>' +
+      '<input type="text" formcontrolname="captcha" id="captcha" placeholder="Enter Captcha">' +
+      '<button type="submit" class="search_btn train_Search" id="signInBtn">SIGN IN</button>' +
+      '<div class="error-msg" id="loginError"></div></div></div>';
+    ['userid', 'password', 'captcha'].forEach(function (name) {
+      document.getElementById(name).addEventListener('input', function (e) {
+        model[name] = e.target.value;
+      });
+    });
+    document.getElementById('signInBtn').onclick = function () {
+      if (!model.userid || !model.password) {
+        document.getElementById('loginError').textContent = 'Please enter User Name and Password';
+        return;
+      }
+      api('POST', '/api/login', model).then(function (data) {
+        state.loggedIn = true;
+        state.user = data.user;
+        overlay.innerHTML = '';
+        renderHeader();
+        return api('GET', '/api/masterpassengers').then(function (list) {
+          state.masterPassengers = list.passengers;
+        });
+      }).catch(function (err) {
+        document.getElementById('loginError').textContent = err.message;
+      });
+    };
+  }
+
+  /* ----------------------------------------------------------- search form */
+
+  function renderSearchForm() {
+    var s = state.search;
+    app.innerHTML = '<form class="search-form" id="searchForm" autocomplete="off">' +
+      '<div class="autocomplete"><input type="text" formcontrolname="origin" id="origin" placeholder="From*">' +
+      '<ul class="ui-autocomplete-items" id="originItems"></ul></div>' +
+      '<div class="autocomplete"><input type="text" formcontrolname="destination" id="destination" placeholder="To*">' +
+      '<ul class="ui-autocomplete-items" id="destinationItems"></ul></div>' +
+      '<input type="text" formcontrolname="journeyDate" id="journeyDate" placeholder="Journey Date(DD/MM/YYYY)" value="' + esc(s.journeyDate) + '">' +
+      '<select formcontrolname="journeyClass" id="journeyClass">' + options(CLASSES, s.journeyClass) + '</select>' +
+      '<select formcontrolname="journeyQuota" id="journeyQuota">' + options(QUOTAS, s.journeyQuota) + '</select>' +
+      '<button type="submit" class="search_btn train_Search" id="searchBtn">Search</button>' +
+      '<div class="error-msg" id="searchError"></div>' +
+      '</form><div id="results"></div>';
+
+    bindStation('origin');
+    bindStation('destination');
+    document.getElementById('journeyDate').addEventListener('input', function (e) {
+      s.journeyDate = e.target.value;
+    });
+    document.getElementById('journeyClass').addEventListener('change', function (e) {
+      s.journeyClass = e.target.value;
+    });
+    document.getElementById('journeyQuota').addEventListener('change', function (e) {
+      s.journeyQuota = e.target.value;
+    });
+    document.getElementById('searchForm').addEventListener('submit', function (e) {
+      e.preventDefault();
+      submitSearch();
+    });
+  }
+
+  function bindStation(name) {
+    var input = document.getElementById(name);
+    var list = document.getElementById(name + 'Items');
+    var seq = 0;
+    if (state.search[name]) {
+      input.value = state.search[name].label;
+    }
+    input.addEventListener('input', function () {
+      var value = input.value;
+      var match = LABEL_RE.exec(value);
+      state.search[name] = null;
+      var mine = ++seq;
+      list.innerHTML = '';
+      if (!value) {
+        return;
+      }
+      // A typed "NAME - CODE" label is only taken once the server knows it, like the real
+      // control validating asynchronously; otherwise the suggestions for its code open
+      api('GET', '/api/stations?q=' + encodeURIComponent(match ? match[2] : value)).then(function (data) {
+        if (mine !== seq) {
+          return;
+        }
+        var known = match && data.stations.some(function (st) { return st.label === value; });
+        if (known) {
+          state.search[name] = { code: match[2], label: value };
+          return;
+        }
+        list.innerHTML = data.stations.map(function (st) {
+          return '<li data-code="' + esc(st.code) + '"><span class="ng-star-inserted">' + esc(st.label) + '</span></li>';
+        }).join('');
+      });
+    });
+    list.addEventListener('click', function (e) {
+      var li = e.target.closest('li');
+      if (!li) {
+        return;
+      }
+      input.value = li.textContent;
+      state.search[name] = { code: li.getAttribute('data-code'), label: li.textContent };
+      seq++;
+      list.innerHTML = '';
+    });
+  }
+
+  function submitSearch() {
+    var s = state.search;
+    var error = document.getElementById('searchError');
+    error.textContent = '';
+    if (!s.origin || !s.destination) {
+      error.textContent = 'Please select From and To stations from the list';
+      return;
+    }
+    if (!/^\d{2}\/\d{2}\/\d{4}$/.test(s.journeyDate)) {
+      error.textContent = 'Please enter a valid Journey Date';
+      return;
+    }
+    var generation = ++state.searchGeneration;
+    var results = document.getElementById('results');
+    results.innerHTML = '<div class="loader">Please wait...</div>';
+    var query = 'from=' + encodeURIComponent(s.origin.code) + '&to=' + encodeURIComponent(s.destination.code) +
+      '&date=' + encodeURIComponent(s.journeyDate) + '&class=' + encodeURIComponent(s.journeyClass) +
+      '&quota=' + encodeURIComponent(s.journeyQuota);
+    api('GET', '/api/trains?' + query).then(function (data) {
+      later(function () {
+        if (generation !== state.searchGeneration) {
+          return;
+        }
+        state.trains = data.trains;
+        if (state.view !== 'train-list') {
+          navigate('/nget/booking/train-list', 'train-list');
+        }
+        renderTrainList(generation);
+      });
+    }).catch(function (err) {
+      results.innerHTML = '<div class="error-msg">' + esc(err.message) + '</div>';
+    });
+  }
+
+  /* ------------------------------------------------------------ train list */
+
+  function renderTrainList(generation) {
+    var results = document.getElementById('results');
+    var rows = state.trains.map(function (train) {
+      var cells = train.classes.map(function (cls) {
+        return '<td class="' + esc(cls.code) + ' avl-cell" data-class="' + esc(cls.code) + '">' +
+          '<div class="avl-status">' + esc(cls.status) + '</div>' +
+          '<button type="button" class="btnDefault book-now" data-train="' + esc(train.number) + '" data-class="' +
+          esc(cls.code) + '"' + (cls.bookable ? '' : ' disabled') + '>BOOK NOW</button></td>';
+      }).join('');
+      return '<div class="row" data-train-number="' + esc(train.number) + '">' +
+        '<div class="train-heading"><div class="train-number">' + esc(train.number) + '</div>' +
+        '<strong class="train-name">' + esc(train.name) + '</strong>' +
+        '<span class="train-time">' + esc(train.departure) + ' - ' + esc(train.arrival) + '</span></div>' +
+        '<table class="avl-table"><tbody><tr>' + cells + '</tr></tbody></table></div>';
+    }).join('');
+    results.innerHTML = '<div class="train-list" data-generation="' + generation + '">' +
+      (rows || '<div class="no-trains">No trains available</div>') + '</div>';
+    results.querySelectorAll('button.book-now').forEach(function (btn) {
+      btn.onclick = function () {
+        bookNow(btn.getAttribute('data-train'), btn.getAttribute('data-class'));
+      };
+    });
+  }
+
+  function bookNow(number, cls) {
+    if (!state.loggedIn) {
+      showLogin();
+      return;
+    }
+    var train = state.trains.filter(function (t) { return t.number === number; })[0];
+    state.selected = { number: number, name: train.name, journeyClass: cls };
+    api('POST', '/api/booking/init', state.selected).then(function () {
+      later(function () {
+        navigate('/nget/booking/psgninput', 'passengers');
+        renderPassengers();
+      });
+    });
+  }
+
+  /* ------------------------------------------------------- passenger input */
+
+  function renderPassengers() {
+    var rows = '';
+    state.passengers = [];
+    state.terms = false;
+    for (var i = 1; i <= MAX_PASSENGERS; i++) {
+      state.passengers.push({ name: '', age: '', gender: '', berth: '', food: '', idType: '', idNumber: '' });
+      rows += '<div class="psgn-row" data-index="' + i + '">' +
+        '<div class="autocomplete"><input type="text" formcontrolname="passengerName' + i + '" data-field="name" ' +
+        'placeholder="Passenger Name ' + i + '"><ul class="ui-autocomplete-items"></ul></div>' +
+        '<input type="text" formcontrolname="passengerAge' + i + '" data-field="age" placeholder="Age ' + i + '">' +
+        '<select formcontrolname="passengerGender' + i + '" data-field="gender">' + options(GENDERS, '') + '</select>' +
+        '<select formcontrolname="berthChoice' + i + '" data-field="berth">' + options(BERTHS, '') + '</select>' +
+        '<select formcontrolname="foodChoice' + i + '" data-field="food">' + options(FOODS, '') + '</select>' +
+        '<select formcontrolname="idType' + i + '" data-field="idType">' + options(ID_TYPES, '') + '</select>' +
+        '<input type="text" formcontrolname="idNumber' + i + '" data-field="idNumber" placeholder="ID Number ' + i + '">' +
+        '</div>';
+    }
+    var sel = state.selected;
+    app.innerHTML = '<div class="psgn-form"><h3>Passenger Details - ' + esc(sel.number) + ' ' + esc(sel.name) +
+      ' (' + esc(sel.journeyClass) + ')</h3>' + rows +
+      '<label><input type="checkbox" formcontrolname="termsAccepted" id="termsAccepted"> ' +
+      'I agree to the terms and conditions</label>' +
+      '<button type="button" class="train_Search btnDefault" id="psgnContinue">Continue</button>' +
+      '<div class="error-msg" id="psgnError"></div></div>';
+
+    app.querySelectorAll('.psgn-row').forEach(function (row) {
+      var model = state.passengers[Number(row.getAttribute('data-index')) - 1];
+      row.querySelectorAll('[data-field]').forEach(function (el) {
+        var update = function () { model[el.getAttribute('data-field')] = el.value; };
+        el.addEventListener('input', update);
+        el.addEventListener('change', update);
+      });
+      bindMasterList(row, model);
+    });
+    document.getElementById('termsAccepted').addEventListener('change', function (e) {
+      state.terms = e.target.checked;
+    });
+    document.getElementById('psgnContinue').onclick = submitPassengers;
+  }
+
+  // Name autocomplete offering the user's master list; picking an entry fills the whole row
+  function bindMasterList(row, model) {
+    var input = row.querySelector('[data-field=name]');
+    var list = row.querySelector('.ui-autocomplete-items');
+    var matches = [];
+    var timer = null;
+    var show = function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var query = input.value.trim().toUpperCase();
+        matches = state.masterPassengers.filter(function (p) {
+          return p.name.toUpperCase().indexOf(query) >= 0;
+        });
+        list.innerHTML = matches.map(function (p, k) {
+          return '<li data-master="' + k + '"><span class="ng-star-inserted">' + esc(p.name) + '</span></li>';
+        }).join('');
+      }, AUTOCOMPLETE_DELAY_MS);
+    };
+    input.addEventListener('focus', show);
+    input.addEventListener('input', show);
+    input.addEventListener('blur', function () {
+      clearTimeout(timer);
+      setTimeout(function () { list.innerHTML = ''; }, 150);
+    });
+    list.addEventListener('click', function (e) {
+      var li = e.target.closest('li');
+      if (!li) {
+        return;
+      }
+      var entry = matches[Number(li.getAttribute('data-master'))];
+      row.querySelectorAll('[data-field]').forEach(function (el) {
+        var field = el.getAttribute('data-field');
+        el.value = entry[field] || '';
+        model[field] = el.value;
+      });
+      list.innerHTML = '';
+    });
+  }
+
+  function submitPassengers() {
+    var error = document.getElementById('psgnError');
+    var filled = state.passengers.filter(function (p) { return p.name; });
+    error.textContent = '';
+    if (!filled.length) {
+      error.textContent = 'Please enter at least one passenger';
+      return;
+    }
+    for (var i = 0; i < filled.length; i++) {
+      var p = filled[i];
+      var age = Number(p.age);
+      if (!(age >= 1 && age <= 125) || !p.gender || !p.idType || !p.idNumber) {
+        error.textContent = 'Please complete the details of passenger ' + p.name;
+        return;
+      }
+    }
+    if (!state.terms) {
+      error.textContent = 'Please accept the terms and conditions';
+      return;
+    }
+    later(function () {
+      navigate('/nget/payment/bkgPaymentOptions', 'payment');
+      renderPayment();
+    });
+  }
+
+  /* --------------------------------------------------------------- payment */
+
+  function renderPayment() {
+    var months = [['', 'Month']];
+    var years = [['', 'Year']];
+    var thisYear = new Date().getFullYear();
+    for (var m = 1; m <= 12; m++) {
+      var mm = (m < 10 ? '0' : '') + m;
+      months.push([mm, mm]);
+    }
+    for (var y = thisYear; y <= thisYear + 10; y++) {
+      years.push([String(y), String(y)]);
+    }
+    var pay = state.payment = {};
+    app.innerHTML = '<div class="payment-form">' +
+      '<label><input type="radio" name="paymentMode" value="UPI"> BHIM/UPI</label>' +
+      '<label><input type="radio" name="paymentMode" value="DEBIT_CARD"> Debit Card</label>' +
+      '<label><input type="radio" name="paymentMode" value="CREDIT_CARD"> Credit Card</label>' +
+      '<label><input type="radio" name="paymentMode" value="NET_BANKING"> Net Banking</label>' +
+      '<input type="text" formcontrolname="upiId" data-field="upiId" placeholder="Enter UPI ID">' +
+      '<input type="text" data-field="cardNumber" placeholder="Card Number">' +
+      '<select name="expiryMonth" data-field="expiryMonth">' + options(months, '') + '</select>' +
+      '<select name="expiryYear" data-field="expiryYear">' + options(years, '') + '</select>' +
+      '<input type="password" data-field="cvv" placeholder="CVV">' +
+      '<input type="text" data-field="cardHolder" placeholder="Cardholder Name">' +
+      '<button type="button" class="btnDefault pay-btn" id="payBtn">Make Payment</button>' +
+      '<div class="error-msg" id="payError"></div></div>';
+    app.querySelectorAll('input[name=paymentMode]').forEach(function (el) {
+      el.addEventListener('change', function () { pay.mode = el.value; });
+    });
+    app.querySelectorAll('.payment-form [data-field]').forEach(function (el) {
+      var update = function () { pay[el.getAttribute('data-field')] = el.value; };
+      el.addEventListener('input', update);
+      el.addEventListener('change', update);
+    });
+    document.getElementById('payBtn').onclick = submitPayment;
+  }
+
+  function submitPayment() {
+    var pay = state.payment;
+    var error = document.getElementById('payError');
+    error.textContent = '';
+    if (!pay.mode) {
+      error.textContent = 'Please select a payment mode';
+      return;
+    }
+    if (pay.mode === 'UPI' && !/@/.test(pay.upiId || '')) {
+      error.textContent = 'Please enter a valid UPI ID';
+      return;
+    }
+    var s = state.search;
+    api('POST', '/api/booking/confirm', {
+      train: state.selected.number,
+      journeyClass: state.selected.journeyClass,
+      quota: s.journeyQuota,
+      date: s.journeyDate,
+      from: s.origin.code,
+      to: s.destination.code,
+      passengers: state.passengers.filter(function (p) { return p.name; }),
+      paymentMode: pay.mode
+    }).then(function (data) {
+      navigate('/nget/booking/confirmation', 'confirmation');
+      app.innerHTML = '<div class="booking-confirmation">Booking Confirmed. PNR: <span class="pnr">' +
+        esc(data.pnr) + '</span></div>';
+    }).catch(function (err) {
+      error.textContent = err.message;
+    });
+  }
+
+  /* ------------------------------------------------------------------ boot */
+
+  history.replaceState({ view: 'search' }, '', '/nget/train-search');
+  renderHeader();
+  renderSearchForm();
+  if (settings.advisoryPopup !== false) {
+    showAdvisory();
+  }
+}());
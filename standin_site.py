@@ -0,0 +1,344 @@
+"""
+Local IRCTC Stand-in Site
+Serves a small single-page copy of the IRCTC train-search, login, train-list,
+passenger and payment pages using the same selectors as irctc_bot.py, so the
+bot can be benchmarked and regression-tested without touching the real site
+"""
+
+import os
+import json
+import random
+import hashlib
+import argparse
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from station_lookup import load_stations
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standin")
+
+# Stations known to the stand-in autocomplete (code, name): the bundled station
+# list, so the labels it shows are the ones the bot derives from station_lookup
+STATIONS = [(station.code, station.name) for station in load_stations()]
+
+CLASS_CODES = ["1A", "2A", "3A", "SL"]
+
+# Optional page weight like the real site's: a web font, banner images and a
+# third-party style analytics script (path under /standin/assets/ -> content type, bytes)
+PAGE_ASSETS = {
+    "fonts/standin-sans.woff2": ("font/woff2", 64 * 1024),
+    "images/banner-1.jpg": ("image/jpeg", 96 * 1024),
+    "images/banner-2.jpg": ("image/jpeg", 96 * 1024),
+    "images/banner-3.jpg": ("image/jpeg", 96 * 1024),
+    "analytics.js": ("application/javascript; charset=utf-8", 48 * 1024),
+}
+
+PAGE_ASSET_HEAD = """<style>@font-face { font-family: 'Stand-in Sans'; src: url('/standin/assets/fonts/standin-sans.woff2') format('woff2'); }
+  body { font-family: 'Stand-in Sans', sans-serif; }</style>
+  <script async src="/standin/assets/analytics.js"></script>
+"""
+
+PAGE_ASSET_BODY = """<footer class="banners">
+    <img src="/standin/assets/images/banner-1.jpg" alt="" width="240" height="60">
+    <img src="/standin/assets/images/banner-2.jpg" alt="" width="240" height="60">
+    <img src="/standin/assets/images/banner-3.jpg" alt="" width="240" height="60">
+  </footer>
+"""
+
+TRAIN_NAMES = [
+    "RAJDHANI EXP", "DURONTO EXP", "GARIB RATH", "SUPERFAST EXP", "MAIL",
+    "SAMPARK KRANTI", "HUMSAFAR EXP", "JAN SHATABDI", "AC SF EXP", "EXPRESS",
+]
+
+# Saved "master list" passengers of the logged-in user, offered by the name
+# autocomplete on the passenger page (includes benchmark.BENCHMARK_PASSENGERS)
+MASTER_PASSENGERS = [
+    {"name": "ASHA VERMA", "age": "34", "gender": "F", "berth": "LB", "food": "V",
+     "idType": "AADHAR", "idNumber": "123412341234"},
+    {"name": "RAVI VERMA", "age": "38", "gender": "M", "berth": "UB", "food": "N",
+     "idType": "PAN", "idNumber": "ABCDE1234F"},
+    {"name": "MEERA VERMA", "age": "62", "gender": "F", "berth": "LB", "food": "V",
+     "idType": "PASSPORT", "idNumber": "K1234567"},
+]
+
+
+def station_suggestions(query, limit=8):
+    """Return autocomplete suggestions the way the site orders them"""
+    q = query.strip().upper()
+    if not q:
+        return []
+    exact, prefix, contains = [], [], []
+    for code, name in STATIONS:
+        label = f"{name} - {code}"
+        if code == q:
+            exact.append((code, label))
+        elif code.startswith(q) or name.startswith(q):
+            prefix.append((code, label))
+        elif q in name:
+            contains.append((code, label))
+    return [{"code": code, "label": label} for code, label in (exact + prefix + contains)[:limit]]
+
+
+def generate_trains(origin, destination, date, journey_class, count=20, sold_out=False):
+    """Build a deterministic train list for a route and date"""
+    seed = hashlib.sha256(f"{origin}|{destination}|{date}".encode()).hexdigest()
+    rng = random.Random(seed)
+    trains = []
+    for i, number in enumerate(rng.sample(range(12001, 22999), count)):
+        classes = []
+        for code in CLASS_CODES:
+            roll = rng.random()
+            if sold_out:
+                status, bookable = "REGRET/WL", False
+            elif roll < 0.35:
+                status, bookable = f"AVAILABLE-{rng.randrange(1, 200):04d}", True
+            elif roll < 0.5:
+                status, bookable = f"RAC {rng.randrange(1, 40)}", True
+            elif roll < 0.8:
+                status, bookable = f"WL {rng.randrange(1, 150)}", True
+            else:
+                status, bookable = "REGRET/WL", False
+            classes.append({"code": code, "status": status, "bookable": bookable})
+        dep = rng.randrange(0, 24 * 60)
+        arr = (dep + rng.randrange(6 * 60, 20 * 60)) % (24 * 60)
+        trains.append({
+            "number": str(number),
+            "name": f"{origin}-{destination} {TRAIN_NAMES[i % len(TRAIN_NAMES)]}",
+            "departure": f"{dep // 60:02d}:{dep % 60:02d}",
+            "arrival": f"{arr // 60:02d}:{arr % 60:02d}",
+            "classes": classes,
+        })
+
+    # Guarantee that the requested class is bookable somewhere on the list
+    if journey_class and not sold_out:
+        last = trains[-1]
+        for cls in last["classes"]:
+            if cls["code"] == journey_class:
+                cls["status"], cls["bookable"] = "AVAILABLE-0004", True
+    return trains
+
+
+class StandInServer:
+    """Threaded HTTP server hosting the stand-in site"""
+
+    def __init__(self, host="127.0.0.1", port=0, api_latency_ms=0, render_delay_ms=0,
+                 advisory_popup=True, sold_out_searches=0, clock_skew_ms=0, page_assets=False,
+                 master_passengers=None, autocomplete_delay_ms=300):
+        self.host = host
+        self.port = port
+        self.api_latency = api_latency_ms / 1000.0
+        self.render_delay_ms = render_delay_ms
+        self.advisory_popup = advisory_popup
+        # Number of initial train searches that come back fully sold out
+        self.sold_out_searches = sold_out_searches
+        # Offset added to the HTTP Date header, to exercise clock-offset estimation
+        self.clock_skew = clock_skew_ms / 1000.0
+        # Serve fonts, banner images and an analytics script with every page (see PAGE_ASSETS)
+        self.page_assets = page_assets
+        self.master_passengers = MASTER_PASSENGERS if master_passengers is None else master_passengers
+        # Debounce before the passenger-name autocomplete renders its suggestions
+        self.autocomplete_delay_ms = autocomplete_delay_ms
+        self.searches = 0
+        self.bookings = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL of the train-search page, usable as config.IRCTC_URL"""
+        return f"http://{self.host}:{self.port}/nget/train-search"
+
+    def settings(self):
+        return {
+            "renderDelayMs": self.render_delay_ms,
+            "advisoryPopup": self.advisory_popup,
+            "autocompleteDelayMs": self.autocomplete_delay_ms,
+        }
+
+    def start(self):
+        handler = type("BoundStandInHandler", (StandInHandler,), {"site": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def search(self, params):
+        with self._lock:
+            self.searches += 1
+            sold_out = self.searches <= self.sold_out_searches
+        return generate_trains(params.get("from", ""), params.get("to", ""), params.get("date", ""),
+                               params.get("class", ""), sold_out=sold_out)
+
+    def confirm_booking(self, booking):
+        with self._lock:
+            pnr = f"{4000000000 + len(self.bookings) + 1}"
+            booking = dict(booking, pnr=pnr, booked_at=datetime.now().isoformat())
+            self.bookings.append(booking)
+        return pnr
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler; `site` is bound to the owning StandInServer"""
+
+    site = None
+    protocol_version = "HTTP/1.1"
+
+    CONTENT_TYPES = {
+        ".html": "text/html; charset=utf-8",
+        ".js": "application/javascript; charset=utf-8",
+        ".css": "text/css; charset=utf-8",
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def date_time_string(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time() + self.site.clock_skew
+        return super().date_time_string(timestamp)
+
+    def _send(self, status, body, content_type):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, payload, status=200):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _send_file(self, name):
+        path = os.path.normpath(os.path.join(STATIC_DIR, name))
+        if not path.startswith(STATIC_DIR) or not os.path.isfile(path):
+            self._send_json({"error": "not found"}, 404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = self.CONTENT_TYPES.get(os.path.splitext(path)[1], "application/octet-stream")
+        self._send(200, body, content_type)
+
+    def _send_index(self):
+        with open(os.path.join(STATIC_DIR, "index.html"), "r", encoding="utf-8") as f:
+            page = f.read()
+        if self.site.page_assets:
+            page = page.replace("</head>", PAGE_ASSET_HEAD + "</head>").replace("</body>", PAGE_ASSET_BODY + "</body>")
+        self._send(200, page, self.CONTENT_TYPES[".html"])
+
+    def _send_asset(self, name):
+        if not self.site.page_assets or name not in PAGE_ASSETS:
+            self._send_json({"error": "not found"}, 404)
+            return
+        content_type, size = PAGE_ASSETS[name]
+        if name.endswith(".js"):
+            body = ("window.standinAnalytics = true;\n" + "/* tracking payload */\n" * (size // 23)).encode("utf-8")
+        else:
+            body = bytes(size)
+        self._send(200, body[:size], content_type)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _api_delay(self):
+        if self.site.api_latency:
+            time.sleep(self.site.api_latency)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if path == "/" or path.startswith("/nget/"):
+            self._send_index()
+        elif path == "/standin/settings.js":
+            self._send(200, f"window.STANDIN_SETTINGS = {json.dumps(self.site.settings())};",
+                       self.CONTENT_TYPES[".js"])
+        elif path.startswith("/standin/assets/"):
+            self._send_asset(path[len("/standin/assets/"):])
+        elif path.startswith("/standin/"):
+            self._send_file(path[len("/standin/"):])
+        elif path == "/api/stations":
+            self._api_delay()
+            self._send_json({"stations": station_suggestions(params.get("q", ""))})
+        elif path == "/api/trains":
+            self._api_delay()
+            codes = {code for code, _ in STATIONS}
+            if params.get("from") not in codes or params.get("to") not in codes:
+                self._send_json({"error": "Invalid source or destination station"}, 400)
+            else:
+                self._send_json({"trains": self.site.search(params)})
+        elif path == "/api/masterpassengers":
+            self._api_delay()
+            self._send_json({"passengers": self.site.master_passengers})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_json()
+        self._api_delay()
+
+        if path == "/api/login":
+            self._send_json({"user": body.get("userid", "")})
+        elif path == "/api/booking/init":
+            self._send_json({"ok": True})
+        elif path == "/api/booking/confirm":
+            self._send_json({"pnr": self.site.confirm_booking(body)})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local IRCTC stand-in site")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--api-latency-ms", type=int, default=50, help="Artificial server latency per API call")
+    parser.add_argument("--render-delay-ms", type=int, default=100, help="Simulated Angular render delay")
+    parser.add_argument("--no-popup", action="store_true", help="Do not show the advisory popup on load")
+    parser.add_argument("--sold-out-searches", type=int, default=0,
+                        help="Number of initial searches that return no bookable seats")
+    parser.add_argument("--clock-skew-ms", type=int, default=0, help="Skew added to the server Date header")
+    parser.add_argument("--page-assets", action="store_true",
+                        help="Serve fonts, banner images and an analytics script with every page")
+    args = parser.parse_args()
+
+    server = StandInServer(port=args.port, api_latency_ms=args.api_latency_ms,
+                           render_delay_ms=args.render_delay_ms, advisory_popup=not args.no_popup,
+                           sold_out_searches=args.sold_out_searches, clock_skew_ms=args.clock_skew_ms,
+                           page_assets=args.page_assets).start()
+    print(f"🚉 IRCTC stand-in running at {server.url}")
+    print("Set IRCTC_URL in config.py to this address. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Startup Import Benchmark
+Runs each entry point's fast path under `python -X importtime` and checks the
+import cost it adds on top of a bare interpreter against a tracked budget, so
+config validation and station lookups stay near-instant
+
+Usage: python startup_benchmark.py [--runs 7] [--top 5]   # exits 1 if a budget is exceeded
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (entry point, code exercising its fast path, import budget in ms)
+SCENARIOS = [
+    ("main.py", "import main; main.validate_config()", 20),
+    ("station_lookup.py", "import station_lookup; station_lookup.search_station_code('pune')", 20),
+    ("quick_test.py", "import quick_test; quick_test.test_config_validation(); quick_test.test_date_validation()", 30),
+]
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def import_times(code):
+    """Top-level imports of one interpreter run as {module: cumulative microseconds}"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=HERE,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{code}' failed:\n{result.stderr.strip().splitlines()[-1]}")
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        # One space of indent is a top-level import; deeper ones are already in its cumulative time
+        if match and len(match.group(3)) == 1:
+            imports[match.group(4)] = int(match.group(2))
+    return imports
+
+
+def measure(code, baseline, runs):
+    """Median import cost in ms added by `code`, and its heaviest top-level imports"""
+    totals, heaviest = [], {}
+    for _ in range(runs):
+        added = {name: us for name, us in import_times(code).items() if name not in baseline}
+        totals.append(sum(added.values()) / 1000)
+        for name, us in added.items():
+            heaviest[name] = min(heaviest.get(name, us), us)
+    totals.sort()
+    return totals[len(totals) // 2], sorted(heaviest.items(), key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry-point import time against budgets")
+    parser.add_argument("--runs", type=int, default=7, help="Interpreter runs per entry point (median is used)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per entry point")
+    args = parser.parse_args()
+
+    # Modules every interpreter imports before running any code (site, encodings, ...)
+    baseline = set(import_times("pass"))
+
+    print("\n" + "=" * 60)
+    print("⏱️  ENTRY-POINT IMPORT TIME (on top of a bare interpreter)")
+    print("=" * 60)
+    over_budget = []
+    for name, code, budget in SCENARIOS:
+        median_ms, heaviest = measure(code, baseline, args.runs)
+        ok = median_ms <= budget
+        if not ok:
+            over_budget.append(name)
+        print(f"{'✅' if ok else '❌'} {name:20} {median_ms:7.1f} ms   (budget {budget} ms)")
+        for module, us in heaviest[:args.top]:
+            print(f"     {module:28} {us / 1000:7.1f} ms")
+    print("=" * 60)
+
+    if over_budget:
+        print(f"❌ Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("✅ All entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
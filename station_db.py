@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Binary Station Database
+Compiles data/stations.csv into a compact binary file that station_lookup
+opens with mmap and searches by binary search, so nothing is parsed and no
+per-station Python objects are built at startup
+
+Usage:
+    python station_db.py build       # data/stations.csv -> data/stations.bin
+    python station_db.py compare     # load time, RSS and query latency vs the in-memory index
+
+File layout (little endian, offsets from the start of the file):
+    header    magic "STDB", version, record counts and section offsets
+    strings   UTF-8 string table (codes, names, states, search keys)
+    stations  fixed 18-byte records (code, name, state as offset/length pairs), sorted by code
+    keys      fixed 12-byte records (key offset/length, station, rank, trigram count), sorted by key
+    grams     fixed 11-byte records (trigram, postings offset, postings count), sorted by trigram
+    postings  uint32 key numbers of the keys containing each trigram
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+from station_lookup import (STATIONS_FILE, FUZZY_THRESHOLD, RANK_CODE, RANK_NAME, RANK_ALIAS, RANK_WORD,
+                            Station, normalize, trigrams, load_stations)
+
+DB_FILE = os.path.splitext(STATIONS_FILE)[0] + ".bin"
+
+MAGIC = b"STDB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIIII")
+STATION = struct.Struct("<IHIHIH")
+KEY = struct.Struct("<IHIBB")
+GRAM = struct.Struct("<3sII")
+POSTING = struct.Struct("<I")
+
+# Keys scanned per prefix query before ranking; bounds one-letter prefixes on the full list
+PREFIX_SCAN = 256
+
+
+def build(csv_path=None, out_path=None):
+    """Compile the station CSV into the binary database; returns the output path"""
+    out_path = out_path or DB_FILE
+    stations = sorted(load_stations(csv_path), key=lambda s: s.code)
+
+    strings = bytearray()
+    offsets = {}
+
+    def intern(text):
+        data = text.encode("utf-8")
+        if data not in offsets:
+            offsets[data] = len(strings)
+            strings.extend(data)
+        return offsets[data], len(data)
+
+    station_records = []
+    keys = []
+    for sid, station in enumerate(stations):
+        station_records.append(STATION.pack(*intern(station.code), *intern(station.name), *intern(station.state)))
+        keys.append((station.code, RANK_CODE, sid, False))
+        for rank, text in [(RANK_NAME, station.name)] + [(RANK_ALIAS, alias) for alias in station.aliases]:
+            keys.append((text, rank, sid, True))
+            keys.extend((word, RANK_WORD, sid, False) for word in text.split(" ")[1:])
+    keys.sort(key=lambda key: (key[0].encode("utf-8"), key[1], key[2]))
+
+    key_records = []
+    postings_by_gram = {}
+    for number, (text, rank, sid, fuzzy) in enumerate(keys):
+        grams = trigrams(text) if fuzzy else ()
+        key_records.append(KEY.pack(*intern(text), sid, rank, min(len(grams), 255)))
+        for gram in grams:
+            postings_by_gram.setdefault(gram.encode("utf-8"), []).append(number)
+
+    gram_records = []
+    postings = []
+    for gram in sorted(postings_by_gram):
+        gram_records.append(GRAM.pack(gram, len(postings), len(postings_by_gram[gram])))
+        postings.extend(postings_by_gram[gram])
+
+    strings_off = HEADER.size
+    stations_off = strings_off + len(strings)
+    keys_off = stations_off + STATION.size * len(station_records)
+    grams_off = keys_off + KEY.size * len(key_records)
+    postings_off = grams_off + GRAM.size * len(gram_records)
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(station_records), len(key_records), len(gram_records),
+                            len(postings), strings_off, stations_off, keys_off, grams_off, postings_off))
+        f.write(strings)
+        f.write(b"".join(station_records))
+        f.write(b"".join(key_records))
+        f.write(b"".join(gram_records))
+        f.write(struct.pack(f"<{len(postings)}I", *postings))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def is_fresh(db_path=None, csv_path=None):
+    """Whether the binary database exists and is newer than the CSV it was built from"""
+    try:
+        return os.path.getmtime(db_path or DB_FILE) >= os.path.getmtime(csv_path or STATIONS_FILE)
+    except OSError:
+        return False
+
+
+class StationDB:
+    """Read-only station index over a memory-mapped binary database
+
+    Offers the same lookups as station_lookup.StationIndex (get, name_for,
+    lookup_exact, prefix, fuzzy, search); Station tuples are only built for
+    the results returned.
+    """
+
+    def __init__(self, path=None, limit=8):
+        self.path = path or DB_FILE
+        self.limit = limit
+        with open(self.path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.station_count, self.key_count, self.gram_count, self.posting_count,
+         self.strings_off, self.stations_off, self.keys_off, self.grams_off,
+         self.postings_off) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} station database")
+
+    def close(self):
+        self.mm.close()
+
+    # ------------------------------------------------------------- records
+
+    def _string(self, offset, length):
+        start = self.strings_off + offset
+        return self.mm[start:start + length].decode("utf-8")
+
+    def _station(self, sid):
+        code_off, code_len, name_off, name_len, state_off, state_len = STATION.unpack_from(
+            self.mm, self.stations_off + sid * STATION.size)
+        return Station(self._string(code_off, code_len), self._string(name_off, name_len),
+                       self._string(state_off, state_len), ())
+
+    def _station_code(self, sid):
+        code_off, code_len = struct.unpack_from("<IH", self.mm, self.stations_off + sid * STATION.size)
+        start = self.strings_off + code_off
+        return self.mm[start:start + code_len]
+
+    def _name_bytes(self, sid):
+        name_off, name_len = struct.unpack_from("<IH", self.mm, self.stations_off + sid * STATION.size + 6)
+        start = self.strings_off + name_off
+        return self.mm[start:start + name_len]
+
+    def _key(self, number):
+        return KEY.unpack_from(self.mm, self.keys_off + number * KEY.size)
+
+    def _key_bytes(self, number):
+        key_off, key_len = struct.unpack_from("<IH", self.mm, self.keys_off + number * KEY.size)
+        start = self.strings_off + key_off
+        return self.mm[start:start + key_len]
+
+    def _lower_bound(self, count, value_at, target):
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if value_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # ------------------------------------------------------------- lookups
+
+    def get(self, code):
+        """Reverse lookup: station for a code, or None"""
+        target = code.strip().upper().encode("utf-8")
+        sid = self._lower_bound(self.station_count, self._station_code, target)
+        if sid < self.station_count and self._station_code(sid) == target:
+            return self._station(sid)
+        return None
+
+    def name_for(self, code):
+        station = self.get(code)
+        return station.name if station else None
+
+    def lookup_exact(self, text):
+        """Station whose code, name or alias is exactly `text` (normalized), or None"""
+        target = normalize(text).encode("utf-8")
+        number = self._lower_bound(self.key_count, self._key_bytes, target)
+        best = None
+        while number < self.key_count and self._key_bytes(number) == target:
+            _, _, sid, rank, _ = self._key(number)
+            if rank != RANK_WORD and (best is None or rank < best[0]):
+                best = (rank, sid)
+            number += 1
+        return self._station(best[1]) if best else None
+
+    def prefix(self, query, limit=None):
+        """Stations whose code, name, alias or any name word starts with `query`"""
+        target = normalize(query).encode("utf-8")
+        if not target:
+            return []
+        number = self._lower_bound(self.key_count, self._key_bytes, target)
+        candidates = {}
+        scanned = 0
+        while number < self.key_count and scanned < PREFIX_SCAN:
+            if not self._key_bytes(number).startswith(target):
+                break
+            _, _, sid, rank, _ = self._key(number)
+            if rank < candidates.get(sid, RANK_WORD + 1):
+                candidates[sid] = rank
+            number += 1
+            scanned += 1
+        # Names are ASCII upper case, so byte order and length match the in-memory index's ranking
+        ranked = sorted((rank, len(name), name, sid)
+                        for name, rank, sid in ((self._name_bytes(sid), rank, sid) for sid, rank in candidates.items()))
+        return [self._station(entry[3]) for entry in ranked[:limit or self.limit]]
+
+    def _gram_postings(self, gram):
+        target = gram.encode("utf-8")
+
+        def gram_at(i):
+            return self.mm[self.grams_off + i * GRAM.size:self.grams_off + i * GRAM.size + 3]
+
+        i = self._lower_bound(self.gram_count, gram_at, target)
+        if i >= self.gram_count or gram_at(i) != target:
+            return ()
+        _, offset, count = GRAM.unpack_from(self.mm, self.grams_off + i * GRAM.size)
+        return struct.unpack_from(f"<{count}I", self.mm, self.postings_off + offset * POSTING.size)
+
+    def fuzzy(self, query, limit=None, threshold=FUZZY_THRESHOLD):
+        """Stations ranked by trigram similarity to `query` (typo tolerant)"""
+        grams = trigrams(normalize(query))
+        if not grams:
+            return []
+        shared = {}
+        for gram in grams:
+            for number in self._gram_postings(gram):
+                shared[number] = shared.get(number, 0) + 1
+        best = {}
+        for number, count in shared.items():
+            _, _, sid, _, size = self._key(number)
+            score = 2.0 * count / (len(grams) + size)
+            if score >= threshold and score > best.get(sid, 0):
+                best[sid] = score
+        ranked = sorted((-score, self._name_bytes(sid), sid) for sid, score in best.items())
+        return [self._station(entry[2]) for entry in ranked[:limit or self.limit]]
+
+    def search(self, query, limit=None):
+        """Exact code/name match first, then prefix matches, then fuzzy matches"""
+        limit = limit or self.limit
+        if not normalize(query):
+            return []
+        results = []
+        exact = self.lookup_exact(query)
+        if exact:
+            results.append(exact)
+        for station in self.prefix(query, limit):
+            if not results or station.code != results[0].code:
+                results.append(station)
+        if not results:
+            results = self.fuzzy(query, limit)
+        return results[:limit]
+
+
+def rss_kb():
+    """Resident set size of this process in KB"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def measure(mode):
+    """Run in a fresh interpreter: load one backend and print load ms, RSS delta KB, query us"""
+    before = rss_kb()
+    start = time.perf_counter()
+    if mode == "dict":
+        from station_lookup import StationIndex
+        index = StationIndex(load_stations())
+    else:
+        index = StationDB()
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_delta = rss_kb() - before
+
+    queries = ["new d", "secundrabad", "SC", "bengaluru", "howr", "m", "trivandram", "pune"]
+    start = time.perf_counter()
+    for _ in range(200):
+        for query in queries:
+            index.search(query)
+    query_us = (time.perf_counter() - start) * 1e6 / (200 * len(queries))
+    print(f"{load_ms:.3f} {rss_delta} {query_us:.1f}")
+
+
+def compare():
+    import subprocess
+    if not is_fresh():
+        build()
+    print("\n" + "=" * 60)
+    print("🗄️  STATION DATA: CSV -> dict index vs mmap binary database")
+    print("=" * 60)
+    print(f"{'backend':10} {'load ms':>9} {'RSS KB':>8} {'query us':>9}")
+    here = os.path.dirname(os.path.abspath(__file__))
+    for mode in ("dict", "mmap"):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "measure", mode], cwd=here,
+                                capture_output=True, text=True, check=True).stdout.split()
+        load_ms, rss_delta, query_us = float(output[0]), int(output[1]), float(output[2])
+        print(f"{mode:10} {load_ms:9.2f} {rss_delta:8d} {query_us:9.1f}")
+    print(f"Binary file: {os.path.getsize(DB_FILE)} bytes, CSV: {os.path.getsize(STATIONS_FILE)} bytes")
+    print("=" * 60)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build or benchmark the binary station database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="Compile the station CSV into the binary database")
+    build_cmd.add_argument("--csv", default=STATIONS_FILE)
+    build_cmd.add_argument("--out", default=DB_FILE)
+    commands.add_parser("compare", help="Compare load time, RSS and query latency with the dict index")
+    measure_cmd = commands.add_parser("measure")
+    measure_cmd.add_argument("mode", choices=["dict", "mmap"])
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        path = build(args.csv, args.out)
+        print(f"✅ Built {path} ({os.path.getsize(path)} bytes) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    elif args.command == "compare":
+        compare()
+    else:
+        measure(args.mode)
+
+
+if __name__ == "__main__":
+    main()
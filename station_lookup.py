@@ -1,121 +1,291 @@
 """
 Station Code Lookup Utility
 Helps find IRCTC station codes for your journey
+
+Stations are loaded from data/stations.csv (code,name,state,aliases) into an
+index with a prefix trie for as-you-type lookup, a trigram index for
+typo-tolerant search and a code -> station map for reverse lookup.
+
+Usage: python station_lookup.py              # interactive lookup
+       python station_lookup.py --benchmark  # query latency over a generated query log
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+import csv
+import sys
+import time
+from collections import namedtuple
+
+STATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "stations.csv")
+
+# Station codes listed by print_common_stations
+COMMON_STATION_CODES = [
+    "NDLS", "BCT", "CSMT", "SBC", "MAS", "HWH", "SC", "PUNE", "ADI", "JP", "LJN", "CNB",
+    "NGP", "BPL", "INDB", "GHY", "PNBE", "RNC", "BBS", "TVC", "ERS", "CBE", "MDU", "BZA",
+    "VSKP", "JAT", "DDN", "HW", "ASR", "CDG", "JU", "UDZ", "MAO", "MAJN", "MYS",
+]
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.35
+
+Station = namedtuple("Station", ["code", "name", "state", "aliases"])
+
+# Prefix match ranks: lower sorts first
+RANK_CODE, RANK_NAME, RANK_ALIAS, RANK_WORD = range(4)
+
+
+def normalize(text):
+    """Upper-case, punctuation to spaces, single-spaced"""
+    return " ".join(re.sub(r"[^A-Z0-9]+", " ", str(text).upper()).split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_stations(path=None):
+    """Read stations from the bundled CSV"""
+    stations = []
+    with open(path or STATIONS_FILE, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            aliases = tuple(normalize(a) for a in (row.get("aliases") or "").split("|") if a.strip())
+            stations.append(Station(row["code"].strip().upper(), normalize(row["name"]),
+                                    (row.get("state") or "").strip(), aliases))
+    return stations
+
+
+class StationIndex:
+    """Prefix trie, trigram index and reverse lookup over a list of stations"""
+
+    def __init__(self, stations, limit=8):
+        self.stations = list(stations)
+        self.limit = limit
+        self.by_code = {station.code: station for station in self.stations}
+        self.exact = {}
+        # Trie node: [children by character, best (rank, name length, name, station id) entries]
+        self.trie = [{}, []]
+        self.keys = []
+        self.postings = {}
+
+        exact = []
+        for sid, station in enumerate(self.stations):
+            exact.append((RANK_CODE, station.code, sid))
+            self._insert(station.code, RANK_CODE, sid)
+            for rank, text in [(RANK_NAME, station.name)] + [(RANK_ALIAS, alias) for alias in station.aliases]:
+                exact.append((rank, text, sid))
+                self._insert(text, rank, sid)
+                for word in text.split(" ")[1:]:
+                    self._insert(word, RANK_WORD, sid)
+                self._add_key(text, sid)
+        # A code beats a name, which beats another station's alias
+        for rank, text, sid in sorted(exact, key=lambda item: item[0]):
+            self.exact.setdefault(text, sid)
+        self._finish(self.trie)
+
+    def _insert(self, key, rank, sid):
+        entry = (rank, len(self.stations[sid].name), self.stations[sid].name, sid)
+        node = self.trie
+        for char in key:
+            node = node[0].setdefault(char, [{}, []])
+            node[1].append(entry)
+
+    def _finish(self, root):
+        # Keep only the best `limit` distinct stations per node
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            best, seen = [], set()
+            for entry in sorted(node[1]):
+                if entry[3] not in seen:
+                    seen.add(entry[3])
+                    best.append(entry[3])
+                    if len(best) == self.limit:
+                        break
+            node[1] = best
+            stack.extend(node[0].values())
+
+    def _add_key(self, text, sid):
+        grams = trigrams(text)
+        key_id = len(self.keys)
+        self.keys.append((sid, len(grams)))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(key_id)
+
+    def get(self, code):
+        """Reverse lookup: station for a code, or None"""
+        return self.by_code.get(code.strip().upper())
+
+    def name_for(self, code):
+        station = self.get(code)
+        return station.name if station else None
+
+    def lookup_exact(self, text):
+        """Station whose code, name or alias is exactly `text`, or None"""
+        sid = self.exact.get(normalize(text))
+        return self.stations[sid] if sid is not None else None
+
+    def prefix(self, query, limit=None):
+        """Stations whose code, name, alias or any name word starts with `query`"""
+        node = self.trie
+        for char in normalize(query):
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return [self.stations[sid] for sid in node[1][:limit or self.limit]]
+
+    def fuzzy(self, query, limit=None, threshold=FUZZY_THRESHOLD):
+        """Stations ranked by trigram similarity to `query` (typo tolerant)"""
+        grams = trigrams(normalize(query))
+        if not grams:
+            return []
+        shared = {}
+        for gram in grams:
+            for key_id in self.postings.get(gram, ()):
+                shared[key_id] = shared.get(key_id, 0) + 1
+        best = {}
+        for key_id, count in shared.items():
+            sid, size = self.keys[key_id]
+            score = 2.0 * count / (len(grams) + size)
+            if score >= threshold and score > best.get(sid, 0):
+                best[sid] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self.stations[item[0]].name))
+        return [self.stations[sid] for sid, _ in ranked[:limit or self.limit]]
+
+    def search(self, query, limit=None):
+        """Exact code/name match first, then prefix matches, then fuzzy matches"""
+        limit = limit or self.limit
+        text = normalize(query)
+        if not text:
+            return []
+        results = []
+        if text in self.exact:
+            results.append(self.stations[self.exact[text]])
+        for station in self.prefix(text, limit):
+            if station not in results:
+                results.append(station)
+        if not results:
+            results = self.fuzzy(text, limit)
+        return results[:limit]
+
+
+_index = None
+
+
+def get_station_index():
+    """Station index on first use: the mmap'd binary database, else one built from the CSV
+
+    The binary database (station_db.py) is rebuilt when the CSV is newer;
+    if it cannot be built or opened the CSV is indexed in memory instead.
+    """
+    global _index
+    if _index is None:
+        try:
+            import station_db
+            if not station_db.is_fresh():
+                station_db.build()
+            _index = station_db.StationDB()
+        except (OSError, ValueError):
+            _index = StationIndex(load_stations())
+    return _index
+
 
 def search_station_code(station_name):
     """Search for station code using station name"""
     try:
-        # This is a simplified lookup - in reality, you might want to use IRCTC's official API
-        # or maintain a local database of station codes
-        
-        common_stations = {
-            "new delhi": "NDLS",
-            "mumbai central": "BCT", 
-            "mumbai": "CSTM",
-            "bangalore": "SBC",
-            "chennai": "MAS",
-            "kolkata": "HWH",
-            "hyderabad": "SC",
-            "pune": "PUNE",
-            "ahmedabad": "ADI",
-            "jaipur": "JP",
-            "lucknow": "LJN",
-            "kanpur": "CNB",
-            "nagpur": "NGP",
-            "bhopal": "BPL",
-            "indore": "INDB",
-            "guwahati": "GHY",
-            "patna": "PNBE",
-            "ranchi": "RNC",
-            "bhubaneswar": "BBS",
-            "thiruvananthapuram": "TVC",
-            "kochi": "ERS",
-            "coimbatore": "CBE",
-            "madurai": "MDU",
-            "vijayawada": "BZA",
-            "visakhapatnam": "VSKP",
-            "jammu": "JAT",
-            "dehradun": "DDN",
-            "haridwar": "HW",
-            "amritsar": "ASR",
-            "chandigarh": "CDG",
-            "jodhpur": "JU",
-            "udaipur": "UDZ",
-            "goa": "MAO",
-            "mangalore": "MAJN",
-            "mysore": "MYS"
-        }
+        index = get_station_index()
         
-        station_lower = station_name.lower().strip()
+        # Direct match on code, name or a common alias
+        station = index.lookup_exact(station_name)
+        if station:
+            return station.code
         
-        # Direct match
-        if station_lower in common_stations:
-            return common_stations[station_lower]
+        # Prefix match, then typo-tolerant match
+        matches = index.search(station_name, limit=1)
+        if matches:
+            return f"{matches[0].code} (matched: {matches[0].name})"
         
-        # Partial match
-        for station, code in common_stations.items():
-            if station_lower in station or station in station_lower:
-                return f"{code} (matched: {station})"
-        
-        return "Station not found in common stations list"
+        return "Station not found in station list"
         
     except Exception as e:
         return f"Error searching for station: {str(e)}"
 
 def print_common_stations():
     """Print a list of common station codes"""
-    stations = {
-        "NDLS": "New Delhi",
-        "BCT": "Mumbai Central", 
-        "CSTM": "Mumbai CST",
-        "SBC": "Bangalore City",
-        "MAS": "Chennai Central",
-        "HWH": "Howrah (Kolkata)",
-        "SC": "Secunderabad",
-        "PUNE": "Pune Junction",
-        "ADI": "Ahmedabad",
-        "JP": "Jaipur",
-        "LJN": "Lucknow Junction",
-        "CNB": "Kanpur Central",
-        "NGP": "Nagpur",
-        "BPL": "Bhopal",
-        "INDB": "Indore",
-        "GHY": "Guwahati",
-        "PNBE": "Patna Junction",
-        "RNC": "Ranchi",
-        "BBS": "Bhubaneswar",
-        "TVC": "Thiruvananthapuram",
-        "ERS": "Ernakulam (Kochi)",
-        "CBE": "Coimbatore",
-        "MDU": "Madurai",
-        "BZA": "Vijayawada",
-        "VSKP": "Visakhapatnam",
-        "JAT": "Jammu Tawi",
-        "DDN": "Dehradun",
-        "HW": "Haridwar",
-        "ASR": "Amritsar",
-        "CDG": "Chandigarh",
-        "JU": "Jodhpur",
-        "UDZ": "Udaipur City",
-        "MAO": "Madgaon (Goa)",
-        "MAJN": "Mangalore Junction",
-        "MYS": "Mysore"
-    }
+    index = get_station_index()
     
     print("\n" + "="*50)
     print("COMMON IRCTC STATION CODES")
     print("="*50)
     
-    for code, name in sorted(stations.items()):
-        print(f"{code:6} - {name}")
+    for code in sorted(COMMON_STATION_CODES):
+        print(f"{code:6} - {index.name_for(code)}")
     
     print("="*50)
 
+def make_typo(word, rng):
+    """Drop, double or swap one letter, the way people mistype station names"""
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(("drop", "double", "swap"))
+    if kind == "drop":
+        return word[:i] + word[i + 1:]
+    if kind == "double":
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def build_query_log(index, seed=7):
+    """Realistic lookups: as-you-type name prefixes, station codes and typo'd names"""
+    import random
+    rng = random.Random(seed)
+    queries = []
+    for station in index.stations:
+        for n in range(1, min(len(station.name), 10) + 1):
+            queries.append(("prefix", station.name[:n].lower(), station.code))
+        queries.append(("code", station.code.lower(), station.code))
+        queries.append(("typo", make_typo(station.name.split(" ")[0].lower(), rng), station.code))
+    rng.shuffle(queries)
+    return queries
+
+
+def run_benchmark(repeats=3):
+    start = time.perf_counter()
+    index = StationIndex(load_stations())
+    build_ms = (time.perf_counter() - start) * 1000
+    queries = build_query_log(index)
+
+    timings = {}
+    typo_hits = typo_total = 0
+    for _ in range(repeats):
+        for kind, query, expected in queries:
+            start = time.perf_counter_ns()
+            results = index.search(query)
+            timings.setdefault(kind, []).append((time.perf_counter_ns() - start) / 1000)
+            if kind == "typo":
+                typo_total += 1
+                typo_hits += any(station.code == expected for station in results[:3])
+
+    print("\n" + "=" * 60)
+    print(f"🔎 STATION INDEX: {len(index.stations)} stations, built in {build_ms:.1f} ms")
+    print("=" * 60)
+    print(f"{'queries':10} {'count':>7} {'p50 us':>9} {'p99 us':>9} {'mean us':>9}")
+    for kind, samples in sorted(timings.items()):
+        samples.sort()
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{kind:10} {len(samples):7d} {samples[len(samples) // 2]:9.1f} {p99:9.1f} "
+              f"{sum(samples) / len(samples):9.1f}")
+    print(f"Typo queries with the right station in the top 3: {typo_hits / typo_total:.1%}")
+    print("=" * 60)
+
+
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        run_benchmark()
+        sys.exit(0)
+    
     print("🚂 IRCTC Station Code Lookup Tool")
     print_common_stations()
     
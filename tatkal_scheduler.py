@@ -0,0 +1,182 @@
+"""
+Tatkal Open Scheduler
+Estimates the offset between the local clock and the IRCTC server clock from
+repeated HTTP Date/RTT samples, then fires at the Tatkal opening with a coarse
+sleep on time.monotonic followed by a short final spin
+
+Usage: python tatkal_scheduler.py --skew-ms 350   # self-check against the local stand-in
+"""
+
+import time
+import logging
+import argparse
+import http.client
+import email.utils
+from collections import namedtuple
+from urllib.parse import urlparse
+import config
+
+logger = logging.getLogger(__name__)
+
+ClockSample = namedtuple("ClockSample", ["sent", "received", "server_second"])
+ClockOffset = namedtuple("ClockOffset", ["offset", "uncertainty", "rtt", "samples"])
+
+# Re-estimate the clock offset this many seconds before firing on long waits
+RESYNC_BEFORE = 20
+
+
+def estimate_offset(samples):
+    """Estimate server-minus-local clock offset from Date header samples
+
+    The Date header only has one-second resolution, so each sample bounds the
+    offset to [second - received, second + 1 - sent). Intersecting the bounds
+    of samples that straddle a second boundary narrows it to roughly the RTT.
+    """
+    if not samples:
+        raise ValueError("No clock samples")
+    lo = max(s.server_second - s.received for s in samples)
+    hi = min(s.server_second + 1 - s.sent for s in samples)
+    rtt = min(s.received - s.sent for s in samples)
+    if lo > hi:
+        # Inconsistent bounds (server clock stepped mid-sampling): fall back to midpoints
+        mids = sorted(s.server_second + 0.5 - (s.sent + s.received) / 2 for s in samples)
+        return ClockOffset(mids[len(mids) // 2], 0.5, rtt, len(samples))
+    return ClockOffset((lo + hi) / 2, (hi - lo) / 2, rtt, len(samples))
+
+
+class ClockProbe:
+    """Keep-alive HTTP connection used to sample the server's Date header"""
+
+    def __init__(self, url, timeout=5):
+        parsed = urlparse(url)
+        connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        self.conn = connection_class(parsed.netloc, timeout=timeout)
+        self.path = parsed.path or "/"
+
+    def sample(self):
+        sent = time.time()
+        self.conn.request("HEAD", self.path)
+        response = self.conn.getresponse()
+        response.read()
+        received = time.time()
+        date = response.getheader("Date")
+        if not date:
+            raise ValueError("Server response has no Date header")
+        return ClockSample(sent, received, email.utils.parsedate_to_datetime(date).timestamp())
+
+    def close(self):
+        self.conn.close()
+
+
+def measure_clock_offset(url, samples=None, spacing=0.11, refine=6):
+    """Sample the server clock and return a ClockOffset
+
+    A first pass spaced over more than a second guarantees a Date boundary is
+    crossed; refinement samples are then timed to land on the predicted
+    boundary, halving the uncertainty each time.
+    """
+    samples = samples or config.CLOCK_SYNC_SAMPLES
+    probe = ClockProbe(url)
+    collected = []
+    try:
+        for i in range(samples):
+            collected.append(probe.sample())
+            if i < samples - 1:
+                time.sleep(spacing)
+
+        for _ in range(refine):
+            estimate = estimate_offset(collected)
+            if estimate.uncertainty <= estimate.rtt / 2:
+                break
+            # Aim the request midpoint at the next predicted server second boundary
+            boundary = int(time.time() + estimate.offset) + 1
+            send_at = boundary - estimate.offset - estimate.rtt / 2
+            delay = send_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            collected.append(probe.sample())
+    finally:
+        probe.close()
+    return estimate_offset(collected)
+
+
+class TatkalScheduler:
+    """Fires at a target instant on the (estimated) server clock"""
+
+    def __init__(self, url=None, lead_ms=None, spin_window_ms=None):
+        self.url = url or config.CLOCK_SYNC_URL or config.IRCTC_URL
+        self.lead = (config.TATKAL_LEAD_MS if lead_ms is None else lead_ms) / 1000.0
+        self.spin_window = (config.SPIN_WINDOW_MS if spin_window_ms is None else spin_window_ms) / 1000.0
+        self.clock = ClockOffset(0.0, None, None, 0)
+
+    def sync(self):
+        """Refresh the clock offset estimate; keeps the previous one on failure"""
+        try:
+            self.clock = measure_clock_offset(self.url)
+            logger.info(f"Server clock offset {self.clock.offset * 1000:+.1f} ms "
+                        f"(±{self.clock.uncertainty * 1000:.1f} ms, rtt {self.clock.rtt * 1000:.1f} ms, "
+                        f"{self.clock.samples} samples)")
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            logger.warning(f"Clock sync with {self.url} failed, using local clock: {str(e)}")
+        return self.clock
+
+    def server_now(self):
+        """Current time on the server clock as an epoch timestamp"""
+        return time.time() + self.clock.offset
+
+    def fire_at(self, server_target):
+        """Block until `lead` before `server_target` (server epoch seconds)
+
+        Returns the firing error in seconds against the estimated server
+        clock: positive means late, negative means early.
+        """
+        target = server_target - self.lead
+        if target - self.server_now() > RESYNC_BEFORE + 5:
+            self._sleep_until(target - RESYNC_BEFORE)
+            self.sync()
+
+        self._sleep_until(target)
+        error = self.server_now() - target
+        logger.info(f"Fired at server time {error * 1000:+.2f} ms from target")
+        return error
+
+    def _sleep_until(self, server_deadline):
+        # Map the deadline onto the monotonic clock once so wall-clock steps cannot move it
+        mono_deadline = time.monotonic() + (server_deadline - self.server_now())
+        while True:
+            remaining = mono_deadline - time.monotonic()
+            if remaining <= self.spin_window:
+                break
+            time.sleep(min(remaining - self.spin_window, 30))
+        while time.monotonic() < mono_deadline:
+            pass
+
+
+def main():
+    from standin_site import StandInServer
+
+    parser = argparse.ArgumentParser(description="Check clock-offset estimation and firing accuracy on the stand-in")
+    parser.add_argument("--skew-ms", type=int, default=350, help="Clock skew the stand-in adds to its Date header")
+    parser.add_argument("--fires", type=int, default=5, help="Number of scheduled firings to measure")
+    parser.add_argument("--lead-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    from log_setup import setup_logging
+    setup_logging(logging.INFO)
+    with StandInServer(clock_skew_ms=args.skew_ms) as server:
+        scheduler = TatkalScheduler(server.url, lead_ms=args.lead_ms)
+        clock = scheduler.sync()
+        print(f"Estimated offset {clock.offset * 1000:+.1f} ms ± {clock.uncertainty * 1000:.1f} ms "
+              f"(true {args.skew_ms:+d} ms, error {clock.offset * 1000 - args.skew_ms:+.1f} ms)")
+
+        errors = []
+        for _ in range(args.fires):
+            target = int(scheduler.server_now()) + 1.5
+            errors.append(scheduler.fire_at(target + scheduler.lead))
+        errors_ms = sorted(abs(e) * 1000 for e in errors)
+        print(f"Firing error over {len(errors)} fires: median {errors_ms[len(errors_ms) // 2]:.3f} ms, "
+              f"max {errors_ms[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
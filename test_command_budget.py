@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Command Budget Test
+Books once on the local stand-in, along the pre-staged path the bot takes by
+default, and fails when a phase in COMMAND_BUDGETS (search form, Search
+click, train selection, passenger fill) makes more browser round trips than
+its budget allows. Skipped when Chrome cannot be started
+"""
+
+import pytest
+import config
+from benchmark import configure_for_standin
+from standin_site import StandInServer
+
+BUDGETED_PHASES = ["fill_search_form", "submit_search", "select_train_and_book", "fill_passenger_details"]
+
+
+@pytest.fixture
+def bot():
+    saved = dict(vars(config))
+    server = StandInServer().start()
+    configure_for_standin(server)
+    config.TRACE_FILE = None
+    from irctc_bot import IRCTCBot
+    bot = None
+    try:
+        bot = IRCTCBot()
+    except Exception as e:
+        pytest.skip(f"Chrome unavailable: {str(e)}")
+    finally:
+        if bot is None:
+            server.stop()
+            vars(config).update(saved)
+    yield bot
+    bot.close()
+    server.stop()
+    vars(config).update(saved)
+
+
+def test_phase_command_budgets(bot):
+    """Each budgeted phase stays within its round-trip budget"""
+    assert bot.login()
+    for phase in BUDGETED_PHASES:
+        assert getattr(bot, phase)(), f"Phase '{phase}' failed"
+
+    assert set(BUDGETED_PHASES) == set(config.COMMAND_BUDGETS)
+    for phase in BUDGETED_PHASES:
+        used, budget = bot.command_stats.last[phase], config.COMMAND_BUDGETS[phase]
+        assert used <= budget, f"{phase}: {used} round trips > budget {budget} ({bot.command_stats.describe_last(phase)})"
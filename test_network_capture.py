@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Network Capture Tests
+Drives the performance-log train-list capture and the session recorder off
+one mocked Chrome performance log, without a browser
+"""
+
+import json
+from unittest.mock import MagicMock
+from network_capture import PerformanceLog, PerformanceLogCapture
+from session_recorder import SessionRecorder
+from tracing import Tracer
+
+TRAIN_LIST_URL = "http://127.0.0.1:8000/api/trains?from=NDLS&to=BCT"
+TRAIN_LIST = {"trains": [{"number": "12951"}]}
+
+
+def log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def train_list_entries():
+    return [
+        log_entry("Network.requestWillBeSent", requestId="7", timestamp=1.0, wallTime=1700000000.0,
+                  request={"method": "GET", "url": TRAIN_LIST_URL}),
+        log_entry("Network.responseReceived", requestId="7", timestamp=1.05,
+                  response={"url": TRAIN_LIST_URL, "status": 200, "headers": {"Content-Type": "application/json"}}),
+        log_entry("Network.loadingFinished", requestId="7", timestamp=1.06),
+    ]
+
+
+def mock_driver(batches):
+    """Driver whose performance log yields `batches` one read at a time, then nothing (get_log empties it)"""
+    driver = MagicMock()
+    driver.get_log.side_effect = lambda name: batches.pop(0) if batches else []
+    driver.execute_cdp_cmd.return_value = {"body": json.dumps(TRAIN_LIST), "base64Encoded": False}
+    return driver
+
+
+def test_recorder_read_leaves_entries_for_capture(tmp_path):
+    """The recorder reading the log while a search is armed does not hide the train list from the capture"""
+    driver = mock_driver([[], train_list_entries()])
+    log = PerformanceLog(driver)
+    capture = PerformanceLogCapture(driver, pattern="/api/trains", log=log)
+    recorder = SessionRecorder(str(tmp_path), driver, driver, Tracer(), log=log)
+
+    capture.arm()
+    recorder._collect("search_trains")
+    assert capture.wait(0.5) == TRAIN_LIST
+    assert [response["url"] for response in recorder.responses] == [TRAIN_LIST_URL]
+
+
+def test_capture_read_leaves_entries_for_recorder(tmp_path):
+    """Entries the capture consumed while waiting still reach the recording"""
+    driver = mock_driver([train_list_entries()])
+    log = PerformanceLog(driver)
+    capture = PerformanceLogCapture(driver, pattern="/api/trains", log=log)
+    recorder = SessionRecorder(str(tmp_path), driver, driver, Tracer(), log=log)
+
+    assert capture.wait(0.5) == TRAIN_LIST
+    recorder._collect("search_trains")
+    assert [(response["url"], response["phase"]) for response in recorder.responses] == [
+        (TRAIN_LIST_URL, "search_trains")]
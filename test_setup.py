@@ -11,9 +11,7 @@ def test_imports():
     """Test if all required packages can be imported"""
     required_packages = [
         'selenium',
-        'webdriver_manager',
-        'requests',
-        'bs4'
+        'webdriver_manager'
     ]
     
     print("🔍 Testing package imports...")
@@ -93,14 +91,16 @@ def test_irctc_connectivity():
     print("\n🔍 Testing IRCTC website connectivity...")
     
     try:
-        import requests
+        from urllib.request import Request, urlopen
         
-        response = requests.get("https://www.irctc.co.in", timeout=10)
-        if response.status_code == 200:
+        request = Request("https://www.irctc.co.in", headers={"User-Agent": "Mozilla/5.0"})
+        with urlopen(request, timeout=10) as response:
+            status = response.status
+        if status == 200:
             print("✅ IRCTC website is accessible")
             return True
         else:
-            print(f"❌ IRCTC website returned status code: {response.status_code}")
+            print(f"❌ IRCTC website returned status code: {status}")
             return False
             
     except Exception as e:
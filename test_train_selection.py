@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Train Selection Tests
+Parses a recorded train-list API response (fixtures/train_list_response.json)
+and checks the booking decisions made from it, without a browser
+"""
+
+import os
+import json
+from locators import Locator
+from train_selection import (Candidate, TIER_AVAILABLE, TIER_RAC, TIER_UNKNOWN, TIER_WAITLIST, choose_candidate,
+                             choose_train, class_matches, parse_status, parse_train_list)
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "train_list_response.json")
+
+
+def load_fixture():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_train_list():
+    """Every train and class of the response becomes a snapshot row with a BOOK NOW locator"""
+    trains = parse_train_list(load_fixture())
+    assert [train["number"] for train in trains] == ["14226", "22355", "15963", "16359"]
+    assert [train["index"] for train in trains] == [0, 1, 2, 3]
+    cell = trains[1]["cells"][2]
+    assert (cell["code"], cell["status"], cell["bookable"]) == ("3A", "WL 22", True)
+    assert isinstance(cell["button"], Locator)
+    assert "22355" in cell["button"].xpath and "3A" in cell["button"].xpath
+
+
+def test_choose_train_from_response():
+    """Unbookable and missing classes are passed over; a train preference narrows the choice"""
+    trains = parse_train_list(load_fixture())
+    train, cell = choose_train(trains, "3A")
+    assert (train["number"], cell["status"]) == ("16359", "AVAILABLE-0004")
+
+    train, cell = choose_train(trains, "3A", train_preference="16359")
+    assert (train["number"], cell["status"]) == ("16359", "AVAILABLE-0004")
+
+    train, cell = choose_train(trains, "1A")
+    assert (train["number"], cell["status"]) == ("15963", "AVAILABLE-0052")
+
+    assert choose_train(trains, "3A", train_preference="15963") is None
+    assert choose_train(trains, "CC") is None
+
+
+def test_parse_rejects_other_payloads():
+    """Responses that are not a train list leave the bot to read the page"""
+    assert parse_train_list(None) is None
+    assert parse_train_list({"error": "Invalid source or destination station"}) is None
+    assert parse_train_list({"trains": "none"}) is None
+    assert parse_train_list({"trains": []}) == []
+
+
+def test_candidates_ranked_in_one_pass():
+    """The first listed candidate with a bookable seat wins; the others are rejected with a reason"""
+    trains = parse_train_list(load_fixture())
+    candidates = [
+        Candidate("14226", "3A", None, None),
+        Candidate("", "3A", None, 10),
+        Candidate("", "SL", None, None),
+    ]
+    (train, cell, candidate), rejected = choose_candidate(trains, candidates, "TQ")
+    assert (train["number"], cell["code"], candidate) == ("16359", "3A", candidates[1])
+    assert rejected == [
+        "#1 14226 3A: 14226 3A not bookable (REGRET/WL)",
+        "#3 any train SL: 22355 AVAILABLE-0013 outranked by #2 any train 3A",
+    ]
+
+
+def test_candidate_rejection_reasons():
+    """Missing trains and classes, waitlist limits and unsearched quotas are all explained"""
+    trains = parse_train_list(load_fixture())
+    candidates = [
+        Candidate("99999", "3A", None, None),
+        Candidate("15963", "3A", None, None),
+        Candidate("22355", "3A", None, 5),
+        Candidate("", "2A", "PT", None),
+    ]
+    choice, rejected = choose_candidate(trains, candidates, "TQ")
+    assert choice is None
+    assert rejected == [
+        "#1 99999 3A: train not in the list",
+        "#2 15963 3A: 3A not offered on 15963",
+        "#3 22355 3A: 22355 3A waitlist 22 over max 5",
+        "#4 any train 2A: quota PT not searched (search used TQ)",
+    ]
+
+
+def test_class_matched_exactly():
+    """A class code only matches its own cell, never one that merely contains it"""
+    trains = parse_train_list(load_fixture())
+    for journey_class in ("A", "3", ""):
+        choice, rejected = choose_candidate(trains, [Candidate("16359", journey_class, None, None)])
+        assert choice is None
+        assert rejected == [f"#1 16359 {journey_class}: {journey_class} not offered on 16359"]
+    cell = {"code": "", "class_attr": "pre-avl 3A ng-star-inserted"}
+    assert class_matches(cell, "3A") and not class_matches(cell, "A")
+
+
+def test_parse_status():
+    assert parse_status("AVAILABLE-0012") == (TIER_AVAILABLE, -12)
+    assert parse_status("RAC 14") == (TIER_RAC, 14)
+    assert parse_status("GNWL 40/WL 22") == (TIER_WAITLIST, 22)
+    assert parse_status("REGRET/WL") is None
+    assert parse_status("NOT AVAILABLE") is None
+    assert parse_status("") == (TIER_UNKNOWN, 0)
+    assert parse_status("CHART PREPARED") == (TIER_UNKNOWN, 0)
+
+
+def test_unknown_status_booked_last():
+    """An enabled BOOK NOW with status text the parser does not know is booked, but only as a last resort"""
+    def train(number, status):
+        return {"index": 0, "number": number, "name": "", "cells": [
+            {"code": "3A", "class_attr": "3A", "status": status, "bookable": True, "button": object()}]}
+    candidate = Candidate("", "3A", None, 5)
+    (chosen, _, _), _ = choose_candidate([train("11111", "")], [candidate])
+    assert chosen["number"] == "11111"
+    (chosen, _, _), _ = choose_candidate([train("11111", "SEE DETAILS"), train("22222", "WL 3")], [candidate])
+    assert chosen["number"] == "22222"
@@ -0,0 +1,223 @@
+"""
+Booking Trace Spans
+Nested per-phase spans (start, end, outcome, attributes) for every booking
+run, streamed to a JSON-lines file by a background writer thread so the
+booking path never waits on disk I/O
+
+Usage: python tracing.py booking_trace.jsonl   # print the span tree of each run
+"""
+
+import sys
+import json
+import time
+import uuid
+import queue
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed unit of work inside a booking run"""
+
+    __slots__ = ("run_id", "span_id", "parent_id", "name", "attributes", "start", "end",
+                 "duration", "outcome", "error", "_t0")
+
+    def __init__(self, run_id, name, parent_id=None, attributes=None):
+        self.run_id = run_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start = time.time()
+        self.end = None
+        self.duration = None
+        self.outcome = "ok"
+        self.error = None
+        self._t0 = time.perf_counter()
+
+    def set(self, **attributes):
+        """Attach or update attributes"""
+        self.attributes.update(attributes)
+
+    def set_outcome(self, outcome, error=None):
+        self.outcome = outcome
+        if error is not None:
+            self.error = error
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._t0
+        self.end = self.start + self.duration
+
+    def to_dict(self):
+        return {
+            "run_id": self.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration * 1000, 3),
+            "outcome": self.outcome,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Creates nested spans and exports finished ones to a JSON-lines file"""
+
+    def __init__(self, path=None, run_id=None, keep=10000):
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        # Most recent finished spans, kept in memory for reports
+        self.finished = deque(maxlen=keep)
+        # Called with every finished span on the thread that finished it
+        self.listeners = []
+        self._local = threading.local()
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        if path:
+            self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+            self._writer.start()
+
+    def new_run(self, run_id=None):
+        """Start a new run id for subsequent spans (e.g. the next benchmark run)"""
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        return self.run_id
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self):
+        """Innermost open span on this thread, or None"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def open_spans(self):
+        """Open spans on this thread, outermost first"""
+        return tuple(self._stack())
+
+    def annotate(self, **attributes):
+        """Set attributes on the innermost open span, if any"""
+        span = self.current()
+        if span is not None:
+            span.set(**attributes)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Open a child span of the current one for the duration of the block"""
+        parent = self.current()
+        span = Span(self.run_id, name, parent.span_id if parent else None, attributes)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_outcome("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            stack.pop()
+            span.finish()
+            self._emit(span)
+
+    def record(self, name, duration, outcome="ok", **attributes):
+        """Record an already-timed child span of the current one"""
+        parent = self.current()
+        span = Span(self.run_id, name, parent.span_id if parent else None, attributes)
+        span.start -= duration
+        span.duration = duration
+        span.end = span.start + duration
+        span.outcome = outcome
+        self._emit(span)
+
+    def _emit(self, span):
+        self.finished.append(span)
+        for listener in self.listeners:
+            listener(span)
+        if self._writer:
+            # Serialisation and the file write happen on the writer thread
+            self._queue.put(span)
+
+    def _write_loop(self):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                while True:
+                    span = self._queue.get()
+                    if span is None:
+                        break
+                    f.write(json.dumps(span.to_dict()) + "\n")
+                    if self._queue.empty():
+                        f.flush()
+        except OSError as e:
+            logger.error(f"Trace export to {self.path} failed: {str(e)}")
+
+    def close(self):
+        """Flush pending spans and stop the writer thread"""
+        if self._writer:
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+            self._writer = None
+
+
+def traced(name, **static_attributes):
+    """Decorator wrapping an IRCTCBot method in a span on `self.tracer`
+
+    Methods that report failure by returning False get outcome "failed".
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(name, **static_attributes) as span:
+                result = func(self, *args, **kwargs)
+                if result is False:
+                    span.set_outcome("failed")
+                return result
+        return wrapper
+    return decorator
+
+
+def load_trace(path):
+    """Read spans from a JSON-lines trace file grouped by run id"""
+    runs = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                span = json.loads(line)
+                runs.setdefault(span["run_id"], []).append(span)
+    return runs
+
+
+def print_trace(spans):
+    """Print one run's spans as an indented tree in start order"""
+    children = {}
+    for span in sorted(spans, key=lambda s: s["start"]):
+        children.setdefault(span["parent_id"], []).append(span)
+
+    def walk(parent_id, depth):
+        for span in children.get(parent_id, []):
+            attrs = " ".join(f"{k}={v}" for k, v in span["attributes"].items())
+            marker = "✅" if span["outcome"] == "ok" else "❌"
+            print(f"{'  ' * depth}{marker} {span['name']:28} {span['duration_ms']:10.1f} ms  {attrs}")
+            if span["error"]:
+                print(f"{'  ' * depth}   {span['error']}")
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python tracing.py <trace.jsonl>")
+        sys.exit(1)
+    for run_id, spans in load_trace(sys.argv[1]).items():
+        print(f"\n🧭 Run {run_id}")
+        print_trace(spans)
@@ -0,0 +1,143 @@
+"""
+Train Selection
+Pure-Python booking decisions over a train-list snapshot, so the browser is
+only asked for the list once and for a single click afterwards
+
+A snapshot is a list of trains shaped like page_scripts.EXTRACT_TRAINS output:
+    {"index", "number", "name", "cells": [{"code", "class_attr", "status", "bookable", "button"}]}
+or built by parse_train_list from the train-list API response, where "button"
+is the book_now Locator of a button that may not be rendered yet
+"""
+
+import re
+from collections import namedtuple
+from locators import locator
+import config
+
+# One acceptable itinerary; train "" matches any train, quota None the searched
+# quota, max_waitlist None any waitlist position
+Candidate = namedtuple("Candidate", ["train", "journey_class", "quota", "max_waitlist"])
+
+# Availability tiers, best first; an enabled BOOK NOW whose status is not understood ranks last
+TIER_AVAILABLE, TIER_RAC, TIER_WAITLIST, TIER_UNKNOWN = range(4)
+TIER_NAMES = {TIER_AVAILABLE: "available", TIER_RAC: "RAC", TIER_WAITLIST: "waitlist", TIER_UNKNOWN: "unknown"}
+
+NUMBER = re.compile(r"(\d+)")
+
+
+def parse_train_list(payload):
+    """Snapshot from the train-list API JSON ({"trains": [{"number", "name", "classes": [...]}]})
+
+    Returns None when the payload is not a train list.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("trains"), list):
+        return None
+    trains = []
+    for index, train in enumerate(payload["trains"]):
+        number = str(train.get("number", "")).strip()
+        cells = []
+        for cls in train.get("classes") or []:
+            code = str(cls.get("code", "")).strip()
+            cells.append({"code": code, "class_attr": code, "status": str(cls.get("status", "")).strip(),
+                          "bookable": bool(cls.get("bookable")), "button": locator("book_now", train=number, cls=code)})
+        trains.append({"index": index, "number": number, "name": str(train.get("name", "")).strip(), "cells": cells})
+    return trains
+
+
+def class_matches(cell, journey_class):
+    """Whether a cell is for `journey_class`: its code, or one of its class attribute tokens, exactly"""
+    return bool(journey_class) and (cell["code"] == journey_class or journey_class in cell["class_attr"].split())
+
+
+def choose_train(trains, journey_class, train_preference=""):
+    """Return (train, cell) for the best bookable seat in one class, or None
+
+    Single-candidate form of choose_candidate: trains not matching the
+    preferred number are skipped, and among the rest an available seat beats
+    RAC, which beats the shortest waitlist.
+    """
+    choice, _ = choose_candidate(trains, [Candidate(train_preference or "", journey_class, None, None)])
+    return choice[:2] if choice else None
+
+
+def parse_status(status):
+    """(tier, position) for an availability status, or None when it cannot be booked
+
+    AVAILABLE-0012 -> (available, -12): more seats sort first; RAC 14 -> (RAC, 14);
+    WL 22, GNWL 40/WL 22, TQWL 5 -> (waitlist, last number). REGRET, NOT AVAILABLE,
+    TRAIN DEPARTED and CANCELLED are not bookable; any other (or empty) status is
+    (unknown, 0), so an enabled button is still booked when nothing better is offered.
+    """
+    text = (status or "").upper().replace(" ", "")
+    numbers = NUMBER.findall(text)
+    position = int(numbers[-1]) if numbers else 0
+    if "REGRET" in text or "NOTAVAILABLE" in text or "DEPARTED" in text or "CANCELLED" in text:
+        return None
+    if text.startswith("AVAILABLE") or text.startswith("CURR_AVBL") or text.startswith("AVBL"):
+        return TIER_AVAILABLE, -position
+    if text.startswith("RAC"):
+        return TIER_RAC, position
+    if "WL" in text:
+        return TIER_WAITLIST, position
+    return TIER_UNKNOWN, 0
+
+
+def candidates_from_config():
+    """BOOKING_CANDIDATES as Candidates, or the single TRAIN_PREFERENCE/JOURNEY_CLASS pair"""
+    entries = getattr(config, "BOOKING_CANDIDATES", None) or [
+        {"train": config.TRAIN_PREFERENCE, "class": config.JOURNEY_CLASS}
+    ]
+    return [Candidate(str(entry.get("train") or "").strip(), str(entry.get("class") or "").strip(),
+                      entry.get("quota") or None, entry.get("max_waitlist"))
+            for entry in entries]
+
+
+def score_option(rank, tier, position):
+    """Lower is better: listed candidate order first, then available > RAC > waitlist, then position"""
+    return rank, tier, position
+
+
+def choose_candidate(trains, candidates, searched_quota=None):
+    """Best bookable (train, cell, candidate) over one snapshot, plus why the others were rejected
+
+    Every candidate is checked against the same snapshot, so a miss on the
+    first choice never costs another search.
+    """
+    best, rejected = None, []
+    for rank, candidate in enumerate(candidates):
+        label = f"#{rank + 1} {candidate.train or 'any train'} {candidate.journey_class}"
+        if candidate.quota and searched_quota and candidate.quota != searched_quota:
+            rejected.append(f"{label}: quota {candidate.quota} not searched (search used {searched_quota})")
+            continue
+        matches = [train for train in trains if not candidate.train or candidate.train in train["number"]]
+        if not matches:
+            rejected.append(f"{label}: train not in the list")
+            continue
+        reasons, found = [], None
+        for train in matches:
+            cell = next((cell for cell in train["cells"] if class_matches(cell, candidate.journey_class)), None)
+            if cell is None or cell["button"] is None:
+                reasons.append(f"{candidate.journey_class} not offered on {train['number']}")
+                continue
+            parsed = parse_status(cell["status"]) if cell["bookable"] else None
+            if parsed is None:
+                reasons.append(f"{train['number']} {candidate.journey_class} not bookable ({cell['status']})")
+                continue
+            tier, position = parsed
+            if (tier == TIER_WAITLIST and candidate.max_waitlist is not None
+                    and position > candidate.max_waitlist):
+                reasons.append(f"{train['number']} {candidate.journey_class} waitlist {position} "
+                               f"over max {candidate.max_waitlist}")
+                continue
+            score = score_option(rank, tier, position)
+            if found is None or score < found[0]:
+                found = (score, train, cell, candidate, label)
+        if found is None:
+            rejected.append(f"{label}: " + "; ".join(reasons))
+        elif best is None or found[0] < best[0]:
+            best = found
+        else:
+            rejected.append(f"{label}: {found[1]['number']} {found[2]['status']} outranked by {best[4]}")
+    if best is None:
+        return None, rejected
+    return best[1:4], rejected
@@ -0,0 +1,191 @@
+"""
+Readiness Wait Engine
+Replaces fixed time.sleep pauses with event-driven waits: a MutationObserver
+injected through execute_async_script resolves the moment a page condition
+holds, instead of WebDriverWait's 0.5 second polling
+"""
+
+import json
+import time
+import logging
+from collections import namedtuple
+from selenium.common.exceptions import TimeoutException, JavascriptException
+from locators import Locator
+import config
+
+logger = logging.getLogger(__name__)
+
+# Extra seconds the WebDriver script timeout allows beyond a step budget;
+# the injected script always resolves itself when its own budget runs out
+SCRIPT_TIMEOUT_SLACK = 5
+
+# Script errors that mean the document went away mid-wait (navigation, refresh), not a broken condition
+NAVIGATION_ERRORS = ("document unloaded", "execution context was destroyed", "inspected target navigated",
+                     "cannot find context", "target closed")
+# Pause before watching the new document, so a burst of unload errors cannot spin
+NAVIGATION_RETRY_PAUSE = 0.05
+
+# arguments: [condition function body, timeout in ms, callback]
+WAIT_SCRIPT = """
+var condition = new Function(arguments[0]);
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var finished = false, observer = null, timer = null, poll = null;
+function finish(result) {
+  if (finished) { return; }
+  finished = true;
+  if (observer) { observer.disconnect(); }
+  clearTimeout(timer);
+  clearInterval(poll);
+  document.removeEventListener('readystatechange', check);
+  done(result);
+}
+function check() {
+  var result = null;
+  try { result = condition(); } catch (e) { result = null; }
+  if (result) { finish(result); }
+}
+check();
+if (!finished) {
+  observer = new MutationObserver(check);
+  observer.observe(document.documentElement || document,
+                   {childList: true, subtree: true, attributes: true, characterData: true});
+  document.addEventListener('readystatechange', check);
+  // Safety net for readiness changes that do not mutate the DOM (layout, focus)
+  poll = setInterval(check, 100);
+  timer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+# Shared JS helpers prepended to every condition
+CONDITION_PRELUDE = """
+function byXPath(xpath) {
+  return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function locate(css, xpath) {
+  return (css && document.querySelector(css)) || byXPath(xpath);
+}
+function isClickable(el) {
+  if (!el || el.disabled) { return false; }
+  if (!el.getClientRects().length) { return false; }
+  var rect = el.getBoundingClientRect();
+  var hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+  return !hit || hit === el || el.contains(hit) || hit.contains(el);
+}
+"""
+
+WaitRecord = namedtuple("WaitRecord", ["step", "seconds", "ready"])
+
+
+def target_expression(target):
+    """JS expression finding `target`: an XPath string, or a Locator (CSS first, XPath fallback)"""
+    if isinstance(target, Locator):
+        return f"locate({json.dumps(target.css)}, {json.dumps(target.xpath)})"
+    return f"byXPath({json.dumps(target)})"
+
+
+def xpath_condition(target, clickable=False):
+    """JS condition returning the element at `target` once present (or clickable)"""
+    check = "isClickable(el)" if clickable else "true"
+    return f"var el = {target_expression(target)}; return el && {check} ? el : null;"
+
+
+def absent_condition(target):
+    """JS condition that holds once nothing matches `target` or it is hidden"""
+    return f"var el = {target_expression(target)}; return !el || !el.getClientRects().length;"
+
+
+def any_condition(named_targets, clickable=True):
+    """JS condition returning the name of the first target that is ready"""
+    checks = []
+    for name, target in named_targets.items():
+        check = "isClickable(el)" if clickable else "el"
+        checks.append(f"el = {target_expression(target)}; if (el && {check}) {{ return {json.dumps(name)}; }}")
+    return "var el; " + " ".join(checks) + " return null;"
+
+
+class WaitEngine:
+    """Event-driven waits with per-step timeout budgets and timing records"""
+
+    def __init__(self, driver, budgets=None, default_timeout=None, tracer=None):
+        self.driver = driver
+        self.tracer = tracer
+        self.budgets = dict(config.WAIT_BUDGETS if budgets is None else budgets)
+        self.default_timeout = default_timeout if default_timeout is not None else config.IMPLICIT_WAIT
+        self.records = []
+        longest = max(list(self.budgets.values()) + [self.default_timeout])
+        self.driver.set_script_timeout(longest + SCRIPT_TIMEOUT_SLACK)
+
+    def budget(self, step):
+        """Timeout budget in seconds for a named step"""
+        return self.budgets.get(step, self.default_timeout)
+
+    def until(self, step, condition, timeout=None, required=True):
+        """Wait until a JS condition body returns a truthy value
+
+        Returns that value (a WebElement, a name, or True). When the budget
+        runs out, raises TimeoutException, or returns None if not required.
+        """
+        timeout = self.budget(step) if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        result = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = self.driver.execute_async_script(WAIT_SCRIPT, CONDITION_PRELUDE + condition,
+                                                          int(remaining * 1000))
+                break
+            except JavascriptException as e:
+                if not any(marker in str(e).lower() for marker in NAVIGATION_ERRORS):
+                    logger.error(f"Wait '{step}' condition script failed: {str(e).splitlines()[0]}")
+                    raise
+                # The document was replaced mid-wait (navigation/refresh); watch the new one
+                time.sleep(min(NAVIGATION_RETRY_PAUSE, max(0, deadline - time.monotonic())))
+            except TimeoutException:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.records.append(WaitRecord(step, elapsed, bool(result)))
+        if self.tracer:
+            self.tracer.record(f"wait:{step}", elapsed, "ok" if result else "timeout")
+        if result:
+            logger.debug(f"Wait '{step}' ready after {elapsed * 1000:.0f} ms")
+            return result
+
+        message = f"Wait '{step}' not ready within {timeout:.1f}s"
+        if required:
+            raise TimeoutException(message)
+        logger.debug(message)
+        return None
+
+    def element(self, step, target, clickable=True, timeout=None, required=True):
+        """Wait for `target` (XPath or Locator) to be present (and clickable) and return it"""
+        return self.until(step, xpath_condition(target, clickable), timeout, required)
+
+    def gone(self, step, target, timeout=None, required=True):
+        """Wait for `target` (XPath or Locator) to disappear"""
+        return self.until(step, absent_condition(target), timeout, required)
+
+    def first_of(self, step, named_targets, clickable=True, timeout=None, required=True):
+        """Wait for any of several named targets and return the name that matched first"""
+        return self.until(step, any_condition(named_targets, clickable), timeout, required)
+
+    def summary(self):
+        """Per-step wait statistics: count, total, max seconds and misses"""
+        stats = {}
+        for record in self.records:
+            entry = stats.setdefault(record.step, {"count": 0, "total": 0.0, "max": 0.0, "missed": 0})
+            entry["count"] += 1
+            entry["total"] += record.seconds
+            entry["max"] = max(entry["max"], record.seconds)
+            if not record.ready:
+                entry["missed"] += 1
+        return stats
+
+    def log_summary(self):
+        for step, entry in self.summary().items():
+            logger.info(f"Wait '{step}': {entry['count']}x, avg {entry['total'] / entry['count'] * 1000:.0f} ms, "
+                        f"max {entry['max'] * 1000:.0f} ms, missed {entry['missed']}")